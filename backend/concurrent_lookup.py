@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+
+def iterate_lookups_in_order(lookup: Callable[[Any], Any], items: Iterable[Any], max_workers: int) -> Iterator[Any]:
+    """
+    Calls lookup() for every item (E.g., a MediaRecord or a season number), max_workers at a time on a thread pool,
+    and yields the results in the same order as items. A result is yielded as soon as it and every result before it
+    are ready.
+
+    Lookups are network bound, so they overlap their round-trips instead of waiting for one another. Each provider's
+    quota is still respected by the rate limiters the requests go through (See PROVIDER_RATE_LIMITS).
+
+    The first exception raised by a lookup (In input order) is raised here, e.g., MatchCancelled. Lookups that
+    haven't started yet are then dropped, and so are they if the caller stops iterating early.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield lookup(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="lookup")
+    try:
+        futures = [executor.submit(lookup, item) for item in items]
+
+        for future in futures:
+            yield future.result()
+    finally:
+        # Lookups already sending a request finish it in the background. They raise MatchCancelled before their next
+        # request once their database is cancelled.
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,23 @@
 import os
+import string
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
 
+from backend.concurrent_lookup import iterate_lookups_in_order
 from backend.formats_backend import retrieve_series_format_from_formats_file, retrieve_movies_format_from_formats_file
 from backend.media_record import MediaRecord
-from databases.database import Database
+from databases.database import Database, DatabaseMatch
+
+
+@dataclass
+class MatchedFileNames:
+    """
+    Formatted file names for the output box, in the same order as the input files.
+    has_missing_fields[i] is True if a field used by the format (Title, year, etc.) wasn't found for file_names[i].
+    """
+    file_names: list[str] = field(default_factory=list)
+    has_missing_fields: list[bool] = field(default_factory=list)
 
 
 def create_formatted_title(format_template: str, context: dict) -> str:
@@ -19,14 +34,41 @@ def create_formatted_title(format_template: str, context: dict) -> str:
     return format_template.format(**normalized_context)
 
 
-def match_titles_using_db_and_format(database: Database) -> list[str]:
-    """Match each MediaRecord in the database with a correctly formatted file name using the database."""
+def create_formatted_file_name(format_template: str, context: dict) -> tuple[str, bool]:
+    """
+    Same as create_formatted_title(), but missing values are left out of the title instead of marked with {None}.
+    Returns (Formatted title, whether a value used by the format_template was missing).
+    """
+    formatted_title = format_template.format(**{key: "" if value is None else value for key, value in context.items()})
+    is_missing_fields = any(context.get(field_name) is None for field_name in _retrieve_field_names(format_template))
+
+    return formatted_title, is_missing_fields
+
+
+@lru_cache(maxsize=8)
+def _retrieve_field_names(format_template: str) -> frozenset[str]:
+    """E.g., '{series_name} - S{season_number}' -> {'series_name', 'season_number'}."""
+    return frozenset(field_name.split(".")[0].split("[")[0]
+                     for _, field_name, _, _ in string.Formatter().parse(format_template) if field_name)
+
+
+# pylint: disable=too-many-locals
+def match_titles_using_db_and_format(database: Database) -> MatchedFileNames:
+    """
+    Match each MediaRecord in the database with a correctly formatted file name using the database.
+    Meant to run off the GUI thread: the result is ready to be shown in the output box as is.
 
-    formatted_titles = []
+    Each MediaRecord is looked up once (See Database.retrieve_matches_from_db()).
+    """
+
+    matched_file_names = MatchedFileNames()
     media_records: list[MediaRecord] = database.media_records
 
-    matched_titles = database.retrieve_media_titles_from_db()
-    matched_years = database.retrieve_media_years_from_db()
+    database_matches: list[DatabaseMatch] = database.retrieve_matches_from_db()
+
+    # Read once for every file, instead of once per file.
+    series_format = retrieve_series_format_from_formats_file()
+    movie_format = retrieve_movies_format_from_formats_file()
 
     for i, media_record in enumerate(media_records):
         if database.is_tv_series:
@@ -44,28 +86,45 @@ def match_titles_using_db_and_format(database: Database) -> list[str]:
 
             series_context: dict = {
                 "series_name": media_record.title,
-                "year": matched_years[i],
+                "year": database_matches[i].year,
                 "season_number": f"{int(raw_season_number):02d}" if raw_season_number is not None else None,
                 "episode_number": f"{int(raw_episode_number):02d}" if raw_episode_number is not None else None,
-                "episode_title": matched_titles[i]
+                "episode_title": database_matches[i].episode_title
             }
 
-            series_format = retrieve_series_format_from_formats_file()
-
-            formatted_title = create_formatted_title(series_format, series_context)
-            formatted_titles.append(f"{formatted_title}.{media_record.container}")
+            formatted_title, has_missing_fields = create_formatted_file_name(series_format, series_context)
         else:
             movie_context: dict = {
-                "movie_name": matched_titles[i],
-                "year": matched_years[i]
+                "movie_name": database_matches[i].title,
+                "year": database_matches[i].year
             }
 
-            movie_format = retrieve_movies_format_from_formats_file()
+            formatted_title, has_missing_fields = create_formatted_file_name(movie_format, movie_context)
+
+        matched_file_names.file_names.append(f"{formatted_title}.{media_record.container}")
+        matched_file_names.has_missing_fields.append(has_missing_fields)
+
+    return matched_file_names
+
+
+def iterate_matched_file_names(database: Database) -> Iterator[MatchedFileNames]:
+    """
+    Same as match_titles_using_db_and_format(), but yields the file names in order, in chunks, as soon as they're
+    matched. Databases that look up each movie with its own requests yield a chunk per movie, and look up to
+    database.max_concurrent_lookups movies at the same time. Otherwise, the batch shares its requests (E.g., one
+    series search and its seasons), so it's matched and yielded as one chunk.
+
+    Raises MatchCancelled once the database is cancelled.
+    """
+    if database.is_tv_series or not database.looks_up_movies_one_at_a_time:
+        yield match_titles_using_db_and_format(database)
+        return
 
-            formatted_title = create_formatted_title(movie_format, movie_context)
-            formatted_titles.append(f"{formatted_title}.{media_record.container}")
+    def _match_movie(media_record: MediaRecord) -> MatchedFileNames:
+        database.raise_if_cancelled()
+        return match_titles_using_db_and_format(database.for_media_records([media_record]))
 
-    return formatted_titles
+    yield from iterate_lookups_in_order(_match_movie, database.media_records, database.max_concurrent_lookups)
 
 
 def get_invalid_file_names_and_fixes(file_names: list[str]) -> dict[str, str]:
@@ -2,14 +2,21 @@ import sys
 
 from PySide6.QtCore import Signal, Slot, QRunnable, QObject
 
-from backend.core_backend import match_titles_using_db_and_format
-from databases.database import Database
+from backend.core_backend import iterate_matched_file_names
+from databases.database import Database, MatchCancelled
 
 
 # pylint: disable=broad-exception-caught
 class DatabaseWorker(QObject, QRunnable):
-    """Used to perform a database match in a thread... so the UI won't stall during slow database calls."""
-    finished = Signal(list)
+    """
+    Used to perform a database match in a thread... so the UI won't stall during slow database calls.
+    The matched file names are formatted here too, and emitted as MatchedFileNames chunks, in the same order as the
+    database's MediaRecords, as soon as they're matched.
+    """
+    chunk_ready = Signal(object)
+    # (Matched MediaRecords, total MediaRecords).
+    progress = Signal(int, int)
+    finished = Signal()
     error = Signal()
 
     def __init__(self, database: Database):
@@ -17,11 +24,31 @@ class DatabaseWorker(QObject, QRunnable):
         QRunnable.__init__(self)
         self.database = database
 
+    def cancel(self):
+        """Thread-safe. The database stops before its next request. No more chunks are emitted, but finished is."""
+        self.database.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.database.is_cancelled()
+
     @Slot()
     def run(self):
         try:
-            titles = match_titles_using_db_and_format(self.database)
-            self.finished.emit(titles)
+            total = len(self.database.media_records)
+            done = 0
+            self.progress.emit(done, total)
+
+            for matched_file_names in iterate_matched_file_names(self.database):
+                if self.database.is_cancelled():
+                    break
+
+                self.chunk_ready.emit(matched_file_names)
+                done += len(matched_file_names.file_names)
+                self.progress.emit(done, total)
+
+            self.finished.emit()
+        except MatchCancelled:
+            self.finished.emit()
         # Broad exception is caught here as database implementations throw different exceptions.
         # This is for the general case. Ideally, we should analyze and group all types of exceptions
         # into a DatabaseError. However, this should be fine for now.
@@ -0,0 +1,157 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+from backend.file_prefilter import FilePrefilter
+from backend.scan_index import DirectoryScanIndex
+
+# A batch is emitted once it has this many files or once BATCH_INTERVAL_SECONDS have passed since the last one,
+# whichever comes first. The interval keeps the first rows quick no matter how big (Or slow) the folder is.
+BATCH_SIZE = 256
+BATCH_INTERVAL_SECONDS = 0.05
+
+
+# Not a NamedTuple, since Qt turns tuples sent through a Signal(list) into lists.
+@dataclass(frozen=True)
+class ScannedFile:
+    """
+    A file found by DirectoryScannerWorker. metadata is its cached metadata, or None if it still needs parsing.
+    file_stat is its stat from the scanner's thread (See stat_entry()), so the GUI thread doesn't stat it again.
+    """
+    path: str
+    metadata: dict | None = None
+    file_stat: os.stat_result | None = None
+
+
+def scan_directory(directory: str, cancel_event: threading.Event | None = None,
+                   file_prefilter: FilePrefilter | None = None) -> Iterator[str]:
+    """Yields the path of every file in a directory and its subdirectories. See scan_directory_entries()."""
+    for entry in scan_directory_entries(directory, cancel_event, file_prefilter):
+        yield entry.path
+
+
+def scan_directory_entries(directory: str, cancel_event: threading.Event | None = None,
+                           file_prefilter: FilePrefilter | None = None,
+                           files_by_directory: dict[str, set[str]] | None = None) -> Iterator[os.DirEntry]:
+    """
+    Yields the os.DirEntry of every file in a directory and its subdirectories, like Path.rglob("*") + is_file().
+    If a FilePrefilter is given, only the files (And folders) it accepts are yielded (And scanned).
+    If files_by_directory is given, it's filled with the files directly inside every folder that was scanned (Empty
+    ones included), e.g., for a FolderWatcher.
+
+    os.scandir() entries remember the file type the OS returned while listing the directory, so most entries
+    don't need their own stat call, which is what makes network drives slow. Symlinked folders aren't followed.
+    """
+    directories = [directory]
+
+    while directories:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+
+        current_directory = directories.pop()
+        subdirectories = []
+        try:
+            with os.scandir(current_directory) as entries:
+                if files_by_directory is not None:
+                    files_by_directory[current_directory] = set()
+
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if file_prefilter is None or not file_prefilter.is_ignored_folder(entry.name):
+                                subdirectories.append(entry.path)
+                        elif entry.is_file() and (file_prefilter is None or file_prefilter.accepts_entry(entry)):
+                            if files_by_directory is not None:
+                                files_by_directory[current_directory].add(entry.path)
+                            yield entry
+                    # The entry was deleted mid-scan or can't be read. Skip it.
+                    except OSError:
+                        continue
+        # Unreadable directories are skipped, the same as rglob does.
+        except OSError:
+            continue
+
+        # Reversed, so subdirectories are scanned in the order they were listed.
+        directories.extend(reversed(subdirectories))
+
+
+def stat_entry(entry: os.DirEntry) -> os.stat_result | None:
+    """Returns the stat of a file found by os.scandir(), or None if it was deleted mid-scan."""
+    try:
+        # DirEntry.stat() is free on Windows, but its st_dev and st_ino are always 0 there.
+        return os.stat(entry.path) if os.name == "nt" else entry.stat()
+    except OSError:
+        return None
+
+
+# pylint: disable=broad-exception-caught
+class DirectoryScannerWorker(QObject, QRunnable):
+    """
+    Scans a directory tree in a thread and emits the files (ScannedFiles) in batches as they're found.
+    With a DirectoryScanIndex, files that haven't changed since they were last parsed come with their metadata,
+    and a ScanReport of how many files were reused, need parsing, or were removed is emitted before finished.
+    With collects_tree, the files of every folder ({Folder: Its files}) are emitted with tree_scanned before finished,
+    so a FolderWatcher can start watching the tree without scanning it again.
+    """
+    batch_ready = Signal(list)
+    scan_report_ready = Signal(object)
+    tree_scanned = Signal(object)
+    finished = Signal()
+    error = Signal()
+
+    def __init__(self, directory: str, file_prefilter: FilePrefilter | None = None,
+                 scan_index: DirectoryScanIndex | None = None, collects_tree: bool = False):
+        QObject.__init__(self)
+        QRunnable.__init__(self)
+        self.directory = directory
+        self.file_prefilter = file_prefilter
+        self.scan_index = scan_index
+        self.collects_tree = collects_tree
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Thread-safe. Stops the scan at the next file. finished is still emitted."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @Slot()
+    def run(self):
+        try:
+            batch: list[ScannedFile] = []
+            last_batch_time = time.perf_counter()
+            files_by_directory: dict[str, set[str]] | None = {} if self.collects_tree else None
+
+            for entry in scan_directory_entries(self.directory, self._cancel_event, self.file_prefilter,
+                                                files_by_directory):
+                if self._cancel_event.is_set():
+                    break
+
+                file_stat = stat_entry(entry)
+                batch.append(ScannedFile(entry.path, self.scan_index.lookup(entry, file_stat) if self.scan_index
+                                         else None, file_stat))
+                if len(batch) >= BATCH_SIZE or time.perf_counter() - last_batch_time >= BATCH_INTERVAL_SECONDS:
+                    self.batch_ready.emit(batch)
+                    batch = []
+                    last_batch_time = time.perf_counter()
+
+            if batch and not self._cancel_event.is_set():
+                self.batch_ready.emit(batch)
+
+            # A cancelled scan didn't see every file, so it can't tell which ones are gone.
+            if self.scan_index is not None and not self._cancel_event.is_set():
+                self.scan_report_ready.emit(self.scan_index.finish())
+            if files_by_directory is not None and not self._cancel_event.is_set():
+                self.tree_scanned.emit(files_by_directory)
+
+            self.finished.emit()
+        # Network drives can fail in many ways mid-scan, which all surface differently.
+        except Exception as e:
+            print(e, file=sys.stderr)
+            self.error.emit()
@@ -0,0 +1,59 @@
+import os
+
+
+class FileIndex:
+    """
+    The files in the input list, so adding the same file twice can be caught in constant time before it's parsed.
+    Two paths are the same file if they normalize to the same path, or if they're hardlinks (Same device and inode).
+    """
+
+    def __init__(self):
+        # Normalized path -> (st_dev, st_ino), or None if the file couldn't be stat'd.
+        self._file_ids_by_path: dict[str, tuple[int, int] | None] = {}
+        # (st_dev, st_ino) -> Normalized path of the first file added with it.
+        self._paths_by_file_id: dict[tuple[int, int], str] = {}
+
+    @staticmethod
+    def normalize_path(file_path: str) -> str:
+        """E.g., 'C:/TV/./Show.mkv' and 'c:\\tv\\show.mkv' are the same path on Windows."""
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def add(self, file_path: str, file_stat: os.stat_result | None = None) -> bool:
+        """Adds a file. Returns False, and adds nothing, if the file (Or a hardlink to it) was already added."""
+        path_key = self.normalize_path(file_path)
+        if path_key in self._file_ids_by_path:
+            return False
+
+        if file_stat is None:
+            try:
+                file_stat = os.stat(file_path)
+            except (OSError, ValueError):
+                file_stat = None
+
+        # Some file systems (And os.DirEntry.stat() on Windows) don't have inodes, i.e., st_ino is always 0.
+        file_id = (file_stat.st_dev, file_stat.st_ino) if file_stat is not None and file_stat.st_ino else None
+        if file_id is not None and file_id in self._paths_by_file_id:
+            return False
+
+        self._file_ids_by_path[path_key] = file_id
+        if file_id is not None:
+            self._paths_by_file_id[file_id] = path_key
+
+        return True
+
+    def remove(self, file_path: str):
+        path_key = self.normalize_path(file_path)
+        file_id = self._file_ids_by_path.pop(path_key, None)
+
+        if file_id is not None and self._paths_by_file_id.get(file_id) == path_key:
+            del self._paths_by_file_id[file_id]
+
+    def clear(self):
+        self._file_ids_by_path.clear()
+        self._paths_by_file_id.clear()
+
+    def __contains__(self, file_path: str) -> bool:
+        return self.normalize_path(file_path) in self._file_ids_by_path
+
+    def __len__(self):
+        return len(self._file_ids_by_path)
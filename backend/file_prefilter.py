@@ -0,0 +1,81 @@
+import fnmatch
+import os
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from backend.settings_backend import SettingsSnapshot
+
+
+class FilePrefilter:
+    """
+    Decides which dropped files, and files found in dropped folders, are worth parsing, e.g., skip .nfo, .jpg, and
+    sample files.
+    Built once from the settings, so checking a file is a set lookup plus at most two regex matches.
+
+    Ignore patterns are case-insensitive globs. A pattern ending with '/' matches folder names, e.g., 'Extras/', and
+    everything inside a matching folder is skipped. Every other pattern matches file names, e.g., '*sample*'.
+    """
+
+    def __init__(self, media_extensions: Iterable[str], ignore_patterns: Iterable[str], minimum_file_size: int):
+        # Extensions are stored without the dot, e.g., 'mkv'. An empty allow-list allows every extension.
+        self.media_extensions = frozenset(extension.strip().lstrip(".").casefold() for extension in media_extensions
+                                          if extension.strip().lstrip("."))
+        self.minimum_file_size = max(minimum_file_size, 0)
+
+        folder_patterns = [pattern.strip().rstrip("/\\") for pattern in ignore_patterns
+                           if pattern.strip().endswith(("/", "\\"))]
+        file_patterns = [pattern.strip() for pattern in ignore_patterns
+                         if pattern.strip() and not pattern.strip().endswith(("/", "\\"))]
+
+        self._ignored_folder_pattern = self._compile_globs(folder_patterns)
+        self._ignored_file_pattern = self._compile_globs(file_patterns)
+
+    @staticmethod
+    def _compile_globs(patterns: list[str]) -> re.Pattern | None:
+        """Combine every glob into one case-insensitive regex, so a name is checked against all of them at once."""
+        if not patterns:
+            return None
+
+        return re.compile("|".join(fnmatch.translate(pattern.casefold()) for pattern in patterns))
+
+    def is_ignored_folder(self, folder_name: str) -> bool:
+        return self._ignored_folder_pattern is not None and \
+            self._ignored_folder_pattern.match(folder_name.casefold()) is not None
+
+    def accepts_file_name(self, file_name: str) -> bool:
+        """Checks the extension and the ignore patterns. Doesn't touch the disk."""
+        file_name = file_name.casefold()
+
+        if self.media_extensions and os.path.splitext(file_name)[1].lstrip(".") not in self.media_extensions:
+            return False
+
+        return self._ignored_file_pattern is None or self._ignored_file_pattern.match(file_name) is None
+
+    def accepts_entry(self, entry: os.DirEntry) -> bool:
+        """Checks a file found by os.scandir(). Its size (Which may cost a stat) is only read if all else passes."""
+        if not self.accepts_file_name(entry.name):
+            return False
+
+        return self.minimum_file_size == 0 or entry.stat().st_size >= self.minimum_file_size
+
+    def accepts_file(self, file_path: str) -> bool:
+        """Checks a file that was dropped by itself. Folder patterns only apply to the folders that are scanned."""
+        if not self.accepts_file_name(os.path.basename(file_path)):
+            return False
+
+        try:
+            return self.minimum_file_size == 0 or os.stat(file_path).st_size >= self.minimum_file_size
+        except OSError:
+            return False
+
+
+@lru_cache(maxsize=8)
+def compile_file_prefilter(media_extensions: tuple[str, ...], ignore_patterns: tuple[str, ...],
+                           minimum_file_size: int) -> FilePrefilter:
+    """Returns the prefilter for a set of settings. It's only rebuilt when those settings change."""
+    return FilePrefilter(media_extensions, ignore_patterns, minimum_file_size)
+
+
+def retrieve_file_prefilter(settings: SettingsSnapshot) -> FilePrefilter:
+    return compile_file_prefilter(settings.media_extensions, settings.ignore_patterns, settings.minimum_file_size)
@@ -0,0 +1,176 @@
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal, Slot
+
+from backend.file_prefilter import FilePrefilter
+
+# Changes are only processed once a folder has been quiet for this long, so a torrent landing 200 files at once
+# (Which is hundreds of change events) becomes one batch.
+DEBOUNCE_MILLISECONDS = 500
+
+
+class FolderWatcher(QObject):
+    """
+    Keeps track of the files in a directory tree and emits the ones that were added or removed (A rename is both).
+
+    QFileSystemWatcher (inotify on Linux) only says which folder changed, and every folder needs its own watch.
+    Changed folders are collected until DEBOUNCE_MILLISECONDS pass without another change. Then only those folders
+    are listed again and compared against the files they had, so the rest of the tree is never scanned again.
+    """
+    files_added = Signal(list)
+    files_removed = Signal(list)
+
+    def __init__(self, directory: str, file_prefilter: FilePrefilter | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.directory = directory
+        self.file_prefilter = file_prefilter
+
+        # The files directly inside every watched folder, by folder.
+        self._files_by_directory: dict[str, set[str]] = {}
+        self._changed_directories: set[str] = set()
+
+        self._file_system_watcher = QFileSystemWatcher(self)
+        self._file_system_watcher.directoryChanged.connect(self.queue_directory_change)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(DEBOUNCE_MILLISECONDS)
+        self._debounce_timer.timeout.connect(self.process_directory_changes)
+
+    def start(self) -> list[str]:
+        """Starts watching the directory tree. Returns the files that are in it now, which aren't emitted."""
+        return self._watch_tree(self.directory)
+
+    def start_from_scan(self, files_by_directory: dict[str, set[str]]):
+        """
+        Starts watching a directory tree that was already scanned with the same FilePrefilter, e.g., by a
+        DirectoryScannerWorker with collects_tree, instead of listing every folder again like start() does.
+        files_by_directory has the files directly inside every folder of the tree, empty ones included.
+
+        Changes made to a folder after it was scanned, but before this is called, show up with its next change.
+        """
+        self._files_by_directory.update(files_by_directory)
+        if files_by_directory:
+            self._file_system_watcher.addPaths(list(files_by_directory))
+
+    def stop(self):
+        self._debounce_timer.stop()
+        if self._file_system_watcher.directories():
+            self._file_system_watcher.removePaths(self._file_system_watcher.directories())
+
+        self._files_by_directory.clear()
+        self._changed_directories.clear()
+
+    def watched_directories(self) -> list[str]:
+        return list(self._files_by_directory)
+
+    @Slot(str)
+    def queue_directory_change(self, directory: str):
+        # Every change restarts the timer, so a burst of changes is processed once, after the last one.
+        self._changed_directories.add(directory)
+        self._debounce_timer.start()
+
+    @Slot()
+    def process_directory_changes(self):
+        added_file_paths: list[str] = []
+        removed_file_paths: list[str] = []
+
+        # Sorted, so parent folders are handled before their subfolders.
+        for directory in sorted(self._changed_directories):
+            # Already handled, e.g., it was inside a folder that was deleted.
+            if directory not in self._files_by_directory:
+                continue
+
+            listing = self._list_directory(directory)
+            if listing is None:
+                removed_file_paths.extend(self._unwatch_tree(directory))
+                continue
+
+            file_paths, subdirectories = listing
+            known_file_paths = self._files_by_directory[directory]
+            added_file_paths.extend(sorted(file_paths - known_file_paths))
+            removed_file_paths.extend(sorted(known_file_paths - file_paths))
+            self._files_by_directory[directory] = file_paths
+
+            for subdirectory in subdirectories:
+                if subdirectory not in self._files_by_directory:
+                    added_file_paths.extend(self._watch_tree(subdirectory))
+
+            # Subfolders that were deleted or moved away. Their own watches don't always say so.
+            for watched_directory in [watched_directory for watched_directory in self._files_by_directory
+                                      if os.path.dirname(watched_directory) == directory
+                                      and watched_directory not in subdirectories]:
+                removed_file_paths.extend(self._unwatch_tree(watched_directory))
+
+        self._changed_directories.clear()
+
+        # Removed first, so a renamed file is never in the list twice.
+        if removed_file_paths:
+            self.files_removed.emit(removed_file_paths)
+        if added_file_paths:
+            self.files_added.emit(added_file_paths)
+
+    def _list_directory(self, directory: str) -> tuple[set[str], list[str]] | None:
+        """Returns the files and subfolders (Not ignored by the prefilter) in a folder, or None if it's gone."""
+        file_paths: set[str] = set()
+        subdirectories: list[str] = []
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.file_prefilter is None or not self.file_prefilter.is_ignored_folder(entry.name):
+                                subdirectories.append(entry.path)
+                        elif entry.is_file() and (self.file_prefilter is None or
+                                                  self.file_prefilter.accepts_entry(entry)):
+                            file_paths.add(entry.path)
+                    # The entry was deleted mid-scan or can't be read. Skip it.
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        return file_paths, subdirectories
+
+    def _watch_tree(self, directory: str) -> list[str]:
+        """Starts watching a folder and its subfolders. Returns the files in them."""
+        found_file_paths: list[str] = []
+        new_directories: list[str] = []
+        directories = [directory]
+
+        while directories:
+            current_directory = directories.pop()
+            listing = self._list_directory(current_directory)
+            if listing is None:
+                continue
+
+            file_paths, subdirectories = listing
+            self._files_by_directory[current_directory] = file_paths
+            new_directories.append(current_directory)
+            found_file_paths.extend(sorted(file_paths))
+            directories.extend(reversed(subdirectories))
+
+        if new_directories:
+            self._file_system_watcher.addPaths(new_directories)
+
+        return found_file_paths
+
+    def _unwatch_tree(self, directory: str) -> list[str]:
+        """Stops watching a folder and its subfolders. Returns the files they had."""
+        prefix = os.path.join(directory, "")
+        removed_directories = [watched_directory for watched_directory in self._files_by_directory
+                               if watched_directory == directory or watched_directory.startswith(prefix)]
+
+        removed_file_paths: list[str] = []
+        for removed_directory in removed_directories:
+            removed_file_paths.extend(sorted(self._files_by_directory.pop(removed_directory)))
+
+        # Qt stops watching deleted folders on its own. Only the ones that still exist need to be removed.
+        watched_directories = set(self._file_system_watcher.directories())
+        still_watched_directories = [removed_directory for removed_directory in removed_directories
+                                     if removed_directory in watched_directories]
+        if still_watched_directories:
+            self._file_system_watcher.removePaths(still_watched_directories)
+
+        return removed_file_paths
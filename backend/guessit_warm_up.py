@@ -0,0 +1,80 @@
+import sys
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from backend.media_record import guessit
+
+# Both a movie and an episode are parsed, so the rules for either type are built before the first real file.
+WARM_UP_FILE_NAMES = ("Show.Name.S01E02.Episode.Title.1080p.WEB-DL.x264-GROUP.mkv",
+                      "Movie Name (2014)/Movie.Name.2014.1080p.BluRay.x264-GROUP.mkv")
+
+
+# pylint: disable=broad-exception-caught
+class GuessitWarmUpWorker(QObject, QRunnable):
+    """
+    guessit is imported and builds its rule tree on the first call. Used to pay for that in a thread instead of on
+    the UI.
+    """
+    finished = Signal()
+
+    def __init__(self):
+        QObject.__init__(self)
+        QRunnable.__init__(self)
+
+    @Slot()
+    def run(self):
+        try:
+            for file_name in WARM_UP_FILE_NAMES:
+                guessit(file_name)
+        # A failed warm-up only means the first real file is slower, so it should never stop files being added.
+        except Exception as e:
+            print(e, file=sys.stderr)
+
+        self.finished.emit()
+
+
+class GuessitWarmUp(QObject):
+    """
+    Tracks the application-wide warm-up. Lives on the UI thread, so is_finished and finished can be checked and
+    connected to from widgets without racing the worker thread.
+    """
+    finished = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.is_started = False
+        self.is_finished = False
+
+    def start(self):
+        """Non-blocking. Starting more than once does nothing."""
+        if self.is_started:
+            return
+
+        self.is_started = True
+        guessit_warm_up_worker = GuessitWarmUpWorker()
+        guessit_warm_up_worker.finished.connect(self.finish)
+        QThreadPool.globalInstance().start(guessit_warm_up_worker)
+
+    @Slot()
+    def finish(self):
+        self.is_finished = True
+        self.finished.emit()
+
+    def is_running(self) -> bool:
+        """Files added while this is True should wait for finished, so guessit isn't built twice at once."""
+        return self.is_started and not self.is_finished
+
+
+# Lazy created so simply importing this module doesn't create any Qt objects.
+_guessit_warm_up: GuessitWarmUp | None = None
+
+
+# pylint: disable=global-statement
+def retrieve_guessit_warm_up() -> GuessitWarmUp:
+    """Ensure the application-wide warm-up tracker is built and return it."""
+    global _guessit_warm_up
+
+    if _guessit_warm_up is None:
+        _guessit_warm_up = GuessitWarmUp()
+
+    return _guessit_warm_up
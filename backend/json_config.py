@@ -17,6 +17,12 @@ class JSONConfig:
 
         return self._read_from_json().get(key, default_value)
 
+    def get_all(self) -> dict:
+        """Returns every key/value pair in the JSON file using a single read."""
+        self._ensure_exists()
+
+        return self._read_from_json()
+
     def set(self, key: str, value):
         self._ensure_exists()
 
@@ -1,38 +1,72 @@
 import os
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
 import unicodedata
-from guessit import guessit
 
-from backend.settings_backend import retrieve_excluded_folders, retrieve_filename_analysis_only_flag
+from backend.parse_cache import retrieve_parse_cache
+from backend.settings_backend import SettingsSnapshot, retrieve_excluded_folders, retrieve_settings_snapshot
 
 
-def retrieve_all_parent_prefixes(folder_path: str) -> set[str]:
+def guessit(string: str) -> dict:
     """
-    Return the path itself plus every parent directory, all normalized.
-    Example: C:/Stuff/Movies  ➜  {'C:\\Stuff\\Movies', 'C:\\Stuff'}
+    guessit.guessit(), imported on the first call. Importing guessit loads all of its rule modules (~70 ms), so it's
+    kept out of startup. GuessitWarmUp calls this in the background right after the main window is shown.
     """
-    prefixes: set[str] = set()
-    current_folder = os.path.normpath(folder_path).rstrip(os.sep)
-    while current_folder and current_folder not in prefixes:
-        prefixes.add(current_folder)
-        parent = os.path.dirname(current_folder)
+    from guessit import guessit as guessit_api  # pylint: disable=import-outside-toplevel
 
-        # Reached the drive root. Break out of while loop. No need to add the drive root to prefixes.
-        if parent == current_folder:
-            break
+    return guessit_api(string)
 
-        current_folder = parent
 
-    return prefixes
+class ExcludedFolderMatcher:
+    """
+    Case-insensitive trie of path components, built once from a set of excluded folders.
+
+    Every excluded folder and all of its parent folders count as excluded prefixes, so stripping a path only needs
+    to walk the trie as deep as the path's components allow, i.e., O(path depth) per file.
+    """
+
+    def __init__(self, excluded_folders: Iterable[str]):
+        self._root: dict[str, dict] = {}
+
+        for folder in excluded_folders:
+            node = self._root
+            for component in os.path.normpath(folder).rstrip(os.sep).split(os.sep):
+                node = node.setdefault(component.casefold(), {})
+
+    def remove_excluded_prefix(self, file_path: str) -> str:
+        """Strip the longest excluded prefix from a file path, or return the original path if there isn't one."""
+        # Normalize OS specific syntax.
+        components = os.path.normpath(file_path).split(os.sep)
+
+        node = self._root
+        matched_depth = 0
+        for component in components:
+            node = node.get(component.casefold())
+            if node is None:
+                break
+            matched_depth += 1
+
+        if matched_depth == 0:
+            return file_path
 
+        # Return the cleaned path joined with forward slashes for an OS-agnostic result.
+        return "/".join(components[matched_depth:])
 
-def remove_excluded_folders_from_file_path(file_path: str) -> str:
+
+@lru_cache(maxsize=8)
+def compile_excluded_folder_matcher(excluded_folders: tuple[str, ...]) -> ExcludedFolderMatcher:
+    """Returns the matcher for a set of excluded folders. It's only rebuilt when the excluded folders change."""
+    return ExcludedFolderMatcher(excluded_folders)
+
+
+def remove_excluded_folders_from_file_path(file_path: str, excluded_folders: Iterable[str] | None = None) -> str:
     """
-    Strip all excluded folder(s) [strs returned by get_excluded_folders()] from a file path.
-    If no match is found the original path is returned.
+    Strip all excluded folder(s) [strs returned by get_excluded_folders()] and their parent folders from a file path.
+    The longest matching prefix is removed. If no match is found the original path is returned.
 
     Example
     -------
@@ -40,50 +74,408 @@ def remove_excluded_folders_from_file_path(file_path: str) -> str:
     file_path = "C:/Stuff/Show Name/Season 1/E01.mkv"
     → "Show Name/Season 1/E01.mkv"
     """
-    excluded_folders: list[str] = retrieve_excluded_folders()
+    if excluded_folders is None:
+        excluded_folders = retrieve_excluded_folders()
 
     # Return the file_path if there are no excluded folders.
-    if len(excluded_folders) == 0:
+    if not excluded_folders:
         return file_path
 
-    prefixes: set[str] = set()
-    for folder in excluded_folders:
-        # Add all parent folder prefixes to prefixes.
-        prefixes.update(retrieve_all_parent_prefixes(folder))
+    return compile_excluded_folder_matcher(tuple(excluded_folders)).remove_excluded_prefix(file_path)
+
+
+# The only metadata fields that are read after a file is parsed (core_backend and the databases).
+# Everything else guessit finds is dropped from MediaRecords, and only re-parsed for the 'Show metadata' dialog.
+COMPACT_METADATA_FIELDS = ("type", "title", "year", "season", "episode", "episode_title")
+
+
+def compact_metadata(metadata: dict) -> dict:
+    """Returns a small plain dict with only the COMPACT_METADATA_FIELDS that exist in the metadata."""
+    compacted = {}
+
+    for field in COMPACT_METADATA_FIELDS:
+        value = metadata.get(field)
+        if value is None:
+            continue
+
+        # Many records share the same type and series title, so they can share one string object too.
+        compacted[field] = sys.intern(value) if isinstance(value, str) and field != "episode_title" else value
+
+    return compacted
+
+
+# Release tags that can follow the screen size without changing any COMPACT_METADATA_FIELDS.
+_FAST_PATH_RELEASE_TAG = (r"(?:UHD|HDR|HDR10|BluRay|BDRip|BRRip|WEB-DL|WEBRip|WEB|HDTV|"
+                          r"DVDRip|AMZN|NF|DSNP|HMAX|ATVP|x264|x265|H\.?264|H\.?265|HEVC|10bit|"
+                          r"(?:DDP|DD|AAC|AC3|EAC3|DTS)(?:[ .]?[257]\.[01])?|TrueHD|Atmos|REPACK|PROPER)")
+
+# Only these containers are taken by the fast path, every other extension is left to guessit.
+_FAST_PATH_CONTAINERS = r"(?P<container>mkv|mp4|m4v|avi|mov|wmv|webm)"
+
+# Title words are letters only. Digits (Cars 2, Blade Runner 2049) blur the line between titles, years and episodes.
+_FAST_PATH_TITLE = r"(?P<title>[A-Za-z]+(?:[._ ][A-Za-z]+)*?)"
+# Release info has to start with the screen size. Otherwise, guessit may read the first tag as an episode title.
+_FAST_PATH_TAIL = (rf"(?:[._ ](?:2160p|1080p|720p|576p|480p)(?:[._ ]{_FAST_PATH_RELEASE_TAG})*(?:-[A-Za-z0-9]+)?)?"
+                   rf"\.{_FAST_PATH_CONTAINERS}")
+
+# Show.Name.S01E02.1080p.WEB-DL.x264-GROUP.mkv
+_FAST_PATH_SXXEYY_PATTERN = re.compile(
+    rf"{_FAST_PATH_TITLE}[._ ]S(?P<season>\d{{1,2}})E(?P<episode>\d{{1,3}}){_FAST_PATH_TAIL}", re.IGNORECASE)
+
+# Show Name - 1x02.mkv
+_FAST_PATH_NXNN_PATTERN = re.compile(
+    rf"{_FAST_PATH_TITLE}(?: - | )(?P<season>\d{{1,2}})x(?P<episode>\d{{2,3}}){_FAST_PATH_TAIL}", re.IGNORECASE)
+
+# Movie.Name.2014.mkv or Movie Name (2014).mkv
+_FAST_PATH_MOVIE_PATTERN = re.compile(
+    rf"{_FAST_PATH_TITLE}[._ ](?P<year>\d{{4}}|\(\d{{4}}\)){_FAST_PATH_TAIL}", re.IGNORECASE)
+
+_FAST_PATH_SEASON_FOLDER_PATTERN = re.compile(r"Season (?P<season>\d{1,2})", re.IGNORECASE)
+_FAST_PATH_DRIVE_PATTERN = re.compile(r"[A-Za-z]:")
+_FAST_PATH_FOLDER_PATTERN = re.compile(r"[A-Za-z]+(?: [A-Za-z]+)*")
+
+
+def fast_guess_metadata(string: str) -> dict | None:
+    """
+    Parse the most common file name shapes with precompiled regexes instead of guessit, which takes milliseconds.
+    Returns the same COMPACT_METADATA_FIELDS guessit would, or None if the string isn't clearly one of these shapes.
+
+    Only plain folder names, e.g., 'TV Shows/The Wire/Season 1', are allowed in front of the file name.
+    """
+    *folder_names, file_name = re.split(r"[/\\]", string)
+
+    metadata = _fast_guess_file_name_metadata(file_name)
+    if metadata is None:
+        return None
+
+    for index, folder_name in enumerate(folder_names):
+        # Leading separators (/mnt/...) and Windows drives (C:) are allowed.
+        if not folder_name or (index == 0 and _FAST_PATH_DRIVE_PATTERN.fullmatch(folder_name)):
+            continue
+
+        season_folder_match = _FAST_PATH_SEASON_FOLDER_PATTERN.fullmatch(folder_name)
+        if season_folder_match is not None:
+            if int(season_folder_match.group("season")) != metadata.get("season"):
+                return None
+            continue
+
+        # Short all caps words are fine here, e.g., 'TV Shows'. The file name decides the title.
+        if not _FAST_PATH_FOLDER_PATTERN.fullmatch(folder_name) \
+                or not _are_unambiguous_words(folder_name, allow_short_all_caps_words=True):
+            return None
+
+    return metadata
+
+
+def _fast_guess_file_name_metadata(file_name: str) -> dict | None:
+    for pattern in (_FAST_PATH_SXXEYY_PATTERN, _FAST_PATH_NXNN_PATTERN):
+        match = pattern.fullmatch(file_name)
+        if match is not None and _are_unambiguous_words(match.group("title")):
+            return {"type": "episode", "title": re.sub(r"[._ ]", " ", match.group("title")),
+                    "season": int(match.group("season")), "episode": int(match.group("episode"))}
+
+    match = _FAST_PATH_MOVIE_PATTERN.fullmatch(file_name)
+    if match is not None and _are_unambiguous_words(match.group("title")):
+        year = int(match.group("year").strip("()"))
+
+        # guessit only treats 1920-2029 as a year. Anything else could be read as a season and episode, e.g., 1x19.
+        if 1920 <= year < 2030:
+            return {"type": "movie", "title": re.sub(r"[._ ]", " ", match.group("title")), "year": year}
+
+    return None
+
+
+@lru_cache(maxsize=1)
+def _retrieve_guessit_vocabulary() -> tuple[frozenset[str], frozenset[str], tuple[re.Pattern, ...]]:
+    """
+    The words and patterns guessit reads as something other than a title, taken from its own rules and config, so
+    they follow its version: (Case-insensitive words casefolded, case-sensitive words, regex patterns).
+
+    That's every single-word string pattern (Sources, editions, streaming services, etc.), the season, episode, part
+    and website words, and the language words (See _retrieve_guessit_language_words()).
+    Built (With guessit's rules) on the first call.
+    """
+    # pylint: disable=import-outside-toplevel
+    from guessit.api import default_api
+    from rebulk.pattern import RePattern, StringPattern
+
+    default_api.configure({})
+    casefolded_words: set[str] = set()
+    words: set[str] = set()
+    regex_patterns: list[re.Pattern] = []
+
+    for pattern in default_api.rebulk.effective_patterns():
+        if isinstance(pattern, StringPattern):
+            ignore_case = pattern.match_options.get("ignore_case", False)
+            for string in pattern.patterns:
+                if isinstance(string, str) and string.isalpha():
+                    (casefolded_words if ignore_case else words).add(string.casefold() if ignore_case else string)
+        elif isinstance(pattern, RePattern):
+            regex_patterns.extend(pattern.patterns)
+
+    advanced_config = default_api.advanced_config
+    casefolded_words.update(advanced_config["episodes"]["season_words"] + advanced_config["episodes"]["episode_words"]
+                            + advanced_config["part"]["prefixes"] + advanced_config["website"]["safe_tlds"]
+                            + advanced_config["website"]["safe_subdomains"])
+    casefolded_words.update(_retrieve_guessit_language_words(default_api.config, advanced_config))
+
+    return frozenset(casefolded_words), frozenset(words), tuple(regex_patterns)
+
+
+def _retrieve_guessit_language_words(config: dict, advanced_config: dict) -> set[str]:
+    """
+    The codes, names and synonyms (Casefolded) of the languages and countries guessit is configured to detect, alone
+    and glued to subtitle and dub tags, e.g., 'vostfr', 'truefrench', or 'korsub'.
+    """
+    import babelfish  # pylint: disable=import-outside-toplevel
+
+    language_names: set[str] = set()
+    for language_code in config["allowed_languages"]:
+        language = babelfish.Language.fromietf(language_code)
+        language_names.update([language.alpha3, language.name])
+        for converter_name in ("alpha2", "alpha3b", "opensubtitles"):
+            try:
+                language_names.add(getattr(language, converter_name))
+            except babelfish.LanguageConvertError:
+                continue
+    for country_code in config["allowed_countries"]:
+        country = babelfish.Country(country_code.upper())
+        language_names.update([country.alpha2, country.name])
+    for synonyms in (advanced_config["language"]["synonyms"] | advanced_config["country"]["synonyms"]).values():
+        language_names.update(synonyms)
+
+    # guessit never reads these as languages, e.g., 'it' or 'no'.
+    language_words = {word.casefold() for language_name in language_names for word in language_name.split()} \
+        - set(advanced_config["common_words"])
+
+    language_config = advanced_config["language"]
+    prefixes = language_config["subtitle_prefixes"] + language_config["language_prefixes"]
+    suffixes = language_config["subtitle_affixes"] + language_config["subtitle_suffixes"] \
+        + language_config["language_affixes"] + language_config["language_suffixes"]
+
+    return language_words | {prefix + language_word for prefix in prefixes for language_word in language_words} \
+        | {language_word + suffix for suffix in suffixes for language_word in language_words}
+
+
+@lru_cache(maxsize=4096)
+def _is_guessit_word(word: str) -> bool:
+    """True if guessit could read the word as something other than (Part of) a title. See above."""
+    casefolded_words, words, regex_patterns = _retrieve_guessit_vocabulary()
+
+    return word.casefold() in casefolded_words or word in words \
+        or any(regex_pattern.fullmatch(word) for regex_pattern in regex_patterns)
+
+
+def _are_unambiguous_words(words: str, allow_short_all_caps_words: bool = False) -> bool:
+    split_words = re.split(r"[._ ]", words)
+
+    # Titles ending with a lone letter aren't reliable, e.g., guessit lowercases 'X - 1x02.mkv' to 'x'.
+    if len(split_words[-1]) == 1:
+        return False
+
+    for word in split_words:
+        if _is_guessit_word(word):
+            return False
+
+        # Short all caps words are usually country or language codes, e.g., 'The.Office.US'.
+        if not allow_short_all_caps_words and 1 < len(word) <= 3 and word.isupper():
+            return False
 
-    # Normalize OS specific syntax.
-    normalized_file_path = os.path.normpath(file_path)
+    return True
 
-    # Sort the prefixes from longest to shortest so the most-specific prefix is tried first.
-    for prefix in sorted(prefixes, key=len, reverse=True):
-        if normalized_file_path.lower().startswith(prefix.lower()):
-            # Remove the prefix and any leading separator that follows it.
-            cleaned_path = normalized_file_path[len(prefix):].lstrip(os.sep)
-            # Return the cleaned path after changing to forward slashes for an OS-agnostic result.
-            return cleaned_path.replace(os.sep, "/") if cleaned_path else ""
 
-    return file_path
+def guess_metadata(file_path: str, settings: SettingsSnapshot, allow_fast_path: bool = True) -> dict:
+    """
+    Use guessit to analyze a file path (Or only its file name) and return the metadata as a plain dict.
+    Doesn't read settings.json or any caches, so it's safe to call from worker processes.
+
+    Common file name shapes are parsed by fast_guess_metadata() instead, and files in the same folder share one
+    parse of that folder. Both only return the COMPACT_METADATA_FIELDS. Use allow_fast_path=False when every field
+    guessit can find is needed.
+    """
+    file_name = os.path.basename(file_path)
+    # Remove excluded folders from guessit matching consideration, i.e., clean the file_path.
+    analyzed_string = file_name if settings.use_only_filename_for_analysis \
+        else remove_excluded_folders_from_file_path(file_path, settings.excluded_folders)
+
+    if allow_fast_path:
+        # Fast path results always include both a season and an episode for episodes, so there's nothing to enrich.
+        metadata = fast_guess_metadata(analyzed_string)
+        if metadata is not None:
+            return metadata
+
+    if settings.use_only_filename_for_analysis:
+        # The file name was already analyzed on its own, so there's nothing left to enrich.
+        return dict(guessit(file_name))
+
+    if allow_fast_path and analyzed_string != file_name and analyzed_string.endswith(file_name):
+        metadata = _guess_metadata_via_directory_context(analyzed_string[:-len(file_name)], file_name)
+        if metadata is not None:
+            return metadata
+
+    metadata = dict(guessit(analyzed_string))
+
+    # Attempt to fill in 'season' or 'episode' if missing (This should not affect movies).
+    _enrich_metadata_via_file_name(metadata, file_name)
+
+    return metadata
+
+
+class DirectoryContext:
+    """
+    Metadata guessit finds in a folder path alone, e.g., 'The Wire (2002)/Season 1/' -> title, year, and season.
+    Shared by every file in that folder.
+    """
+    __slots__ = ("metadata", "is_shareable")
+
+    def __init__(self, metadata: dict):
+        self.metadata = metadata
+
+        # Set to False once a file in this folder can't be merged with the folder's metadata. The rest of the folder
+        # is then parsed as full paths right away, instead of paying for a file name parse that gets thrown away.
+        self.is_shareable = True
+
+
+@lru_cache(maxsize=1024)
+def _retrieve_directory_context(directory: str) -> DirectoryContext:
+    return DirectoryContext(compact_metadata(dict(guessit(directory))))
+
+
+def _guess_metadata_via_directory_context(directory: str, file_name: str) -> dict | None:
+    """
+    Parse a file's folders once per folder and only its file name per file, then merge the two results.
+    Returns None if the results can't be merged safely, i.e., when guessit on the full path could disagree.
+    """
+    directory_context = _retrieve_directory_context(directory)
+    if not directory_context.is_shareable:
+        return None
+
+    metadata = _merge_directory_metadata(directory_context.metadata, _guess_file_name_metadata(file_name))
+    if metadata is None:
+        directory_context.is_shareable = False
+
+    return metadata
+
+
+def _merge_directory_metadata(directory_metadata: dict, file_name_metadata: dict) -> dict | None:
+    """
+    The file name decides the title, episode, and episode title. The folders may only fill in a missing year or
+    season, e.g., 'Season 2/Show - 05 - Title.mkv'. Any disagreement between the two returns None.
+    """
+    if not _is_title_decided_by_file_name(directory_metadata, file_name_metadata):
+        return None
+
+    if directory_metadata.get("type", file_name_metadata.get("type")) != file_name_metadata.get("type"):
+        return None
+
+    metadata = {field: _copy_if_list(value) for field, value in file_name_metadata.items()}
+    for field in ("year", "season"):
+        directory_value = directory_metadata.get(field)
+        if directory_value is None:
+            continue
+
+        if metadata.get(field) is None:
+            metadata[field] = _copy_if_list(directory_value)
+        elif metadata[field] != directory_value:
+            return None
+
+    return metadata
+
+
+def _is_title_decided_by_file_name(directory_metadata: dict, file_name_metadata: dict) -> bool:
+    """False if guessit on the full path could find another title (Or episode title) than in the file name alone."""
+    title = file_name_metadata.get("title")
+    # guessit on the full path could read the folder's episode number together with the file name's,
+    # e.g., 'The 100/The 100 - 06.mkv'.
+    if not isinstance(title, str) or directory_metadata.get("episode") is not None:
+        return False
+
+    # A folder with another title means guessit could treat the file name as an episode title instead,
+    # e.g., 'The West Wing/Season 2/S02E02 - Episode Name.mkv'.
+    directory_title = directory_metadata.get("title")
+    if directory_title is not None and (not isinstance(directory_title, str)
+                                        or MediaRecord.normalize_title(directory_title)
+                                        != MediaRecord.normalize_title(title)):
+        return False
+
+    # Without a title from the folders, guessit on the full path could still find one in them (E.g., a word the folder
+    # alone parses as something else) and make the file name's title the episode title instead,
+    # e.g., 'Us Season 3/Us - S03E01 - Pilot.mkv'.
+    if directory_title is None:
+        return file_name_metadata.get("type") != "episode" or file_name_metadata.get("episode_title") is not None
+
+    # Or read the folder's words together with the file name's, e.g., 'TV/Pilot/Pilot (2010).mkv'.
+    return not any(_is_guessit_word(word) for word in re.split(r"[._ ]", directory_title))
+
+
+def _enrich_metadata_via_file_name(metadata: dict, file_name: str):
+    """
+    There are edge cases where the name of the folder (Which is used in guessing metadata) stops the
+    episode number or season number of a series episode from being parsed correctly.
+
+    This function attempts to analyze the metadata for a series episode using only the file name if
+    'season' or 'episode' is missing from the metadata and fills them in."""
+    # Most episodes already have both, so the file name only needs to be parsed for the rest.
+    if metadata.get("season") is not None and metadata.get("episode") is not None:
+        return
+
+    file_name_metadata = _guess_file_name_metadata(file_name)
+
+    if metadata.get("season") is None:
+        if file_name_metadata.get("season") is not None:
+            metadata["season"] = _copy_if_list(file_name_metadata.get("season"))
+
+    if metadata.get("episode") is None:
+        if file_name_metadata.get("episode") is not None:
+            metadata["episode"] = _copy_if_list(file_name_metadata.get("episode"))
+
+
+@lru_cache(maxsize=4096)
+def _guess_file_name_metadata(file_name: str) -> dict:
+    """
+    Returns the compact metadata guessit finds in a file name alone. Don't modify the returned dict.
+    Cached by file name, since the same names show up again in other folders, e.g., 'S01E01.mkv'.
+    """
+    return compact_metadata(dict(guessit(file_name)))
+
+
+def _copy_if_list(value):
+    """Multi-episode values are lists. Copy them so records never share a list with the cache above."""
+    return list(value) if isinstance(value, list) else value
 
 
 # pylint: disable=too-many-instance-attributes
-# Elements of this class should definitely be refactored into some list[MediaRecord] object, so it can hold
-# instance variables and methods that really should be in a helper list instead of a singular class.
+# The static helpers below scan a whole list of records on every call. The input box keeps its records in a
+# MediaRecordCollection instead, which keeps the same answers up to date as records are added or removed.
 class MediaRecord:
-    """Object that contains metadata about a file... more specifically, information about the filename."""
+    """
+    Object that contains metadata about a file... more specifically, information about the filename.
+
+    Input lists can hold 100k+ records, so records are kept compact: __slots__, no copies of the path, and only the
+    COMPACT_METADATA_FIELDS of guessit's output. The full output is re-parsed on demand by retrieve_full_metadata().
+    """
+    __slots__ = ("full_file_path", "metadata", "media_type", "title", "year", "container", "is_absolute_order")
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, metadata: dict | None = None, settings: SettingsSnapshot | None = None):
         self.full_file_path = file_path
-        # Only include the filename, not the full path, e.g., C:/Folder/File.mp4 -> File.mp4.
-        # Here, os is used as it handles different os' path conventions well.
-        self.file_name = os.path.basename(file_path)
 
-        # Settings flag for whether we should use parent folders or just the filename for metadata analysis.
-        use_only_filename_for_analysis = retrieve_filename_analysis_only_flag()
+        # Metadata can be handed in when it was already parsed elsewhere, e.g., by a worker process.
+        if metadata is None:
+            # Settings, e.g., whether we should use parent folders or just the filename for metadata analysis.
+            # Batches of files should pass in one snapshot instead of having each record look up the settings.
+            if settings is None:
+                settings = retrieve_settings_snapshot()
+
+            # Reuse the metadata from a previous parse if the file and settings haven't changed since then.
+            parse_cache = retrieve_parse_cache()
+            parse_cache_key = parse_cache.create_key(file_path, settings)
+            metadata = parse_cache.get(parse_cache_key)
 
-        # Remove excluded folders from guessit matching consideration, i.e., clean the file_path.
-        self.metadata: dict = (guessit(remove_excluded_folders_from_file_path(file_path))
-                               if not use_only_filename_for_analysis
-                               else guessit(self.file_name))
+            if metadata is None:
+                metadata = compact_metadata(guess_metadata(file_path, settings))
+                parse_cache.put(parse_cache_key, metadata)
+
+        self.metadata: dict = compact_metadata(metadata)
 
         # Setting commonly used values, otherwise, get from metadata.
         self.media_type: str | None = self.metadata.get("type")
@@ -99,31 +491,23 @@ class MediaRecord:
 
         self.year: int | None = self.metadata.get("year")
 
-        # Attempt to fill in 'season' or 'episode' if missing (This should not affect movies).
-        self._enrich_metadata_via_file_name()
-
-        # Store the container from the original filename.
-        self.container: str = Path(file_path).suffix.lstrip(".")
+        # Store the container from the original filename. Only a handful of containers exist, so share the strings.
+        self.container: str = sys.intern(Path(file_path).suffix.lstrip("."))
 
         # Whether an episode is in absolute order or not.
         self.is_absolute_order: bool = False
 
-    def _enrich_metadata_via_file_name(self):
+    @property
+    def file_name(self) -> str:
         """
-        There are edge cases where the name of the folder (Which is used in guessing metadata) stops the
-        episode number or season number of a series episode from being parsed correctly.
-
-        This method attempts to analyze the metadata for a series episode using only the file name if
-        'season' or 'episode' is missing from the MediaRecord and fills them in."""
-        file_name_metadata: dict = guessit(self.file_name)
-
-        if self.metadata.get("season") is None:
-            if file_name_metadata.get("season") is not None:
-                self.metadata["season"] = file_name_metadata.get("season")
+        Only include the filename, not the full path, e.g., C:/Folder/File.mp4 -> File.mp4.
+        Here, os is used as it handles different os' path conventions well.
+        """
+        return os.path.basename(self.full_file_path)
 
-        if self.metadata.get("episode") is None:
-            if file_name_metadata.get("episode") is not None:
-                self.metadata["episode"] = file_name_metadata.get("episode")
+    def retrieve_full_metadata(self) -> dict:
+        """Re-parses the file with the current settings and returns everything guessit found, e.g., for display."""
+        return guess_metadata(self.full_file_path, retrieve_settings_snapshot(), allow_fast_path=False)
 
     def __str__(self):
         return self.file_name
@@ -144,7 +528,12 @@ class MediaRecord:
         return MediaRecord.has_episodes(media_record_list) and not MediaRecord.has_movies(media_record_list)
 
     @staticmethod
-    def _normalize_title(title: str):
+    @lru_cache(maxsize=1024)
+    def normalize_title(title: str) -> str:
+        """
+        Key used to compare titles, e.g., 'The  Wire ' and 'the wire' are the same title.
+        Cached, since every episode of a series has the same title.
+        """
         # Normalizes weird Unicode characters w/ Normalize Form Compatibility (K) Composition (C).
         title = unicodedata.normalize("NFKC", title).strip()
         title = re.sub(r"\s+", " ", title)
@@ -166,7 +555,7 @@ class MediaRecord:
             if record.title is None:
                 continue
 
-            key = MediaRecord._normalize_title(record.title)
+            key = MediaRecord.normalize_title(record.title)
             # Dictionary.setdefault sets the value once for each key, and that value never changes.
             # This allows us to return the first record's title with its unique capitalization.
             titles.setdefault(key, record.title.strip())
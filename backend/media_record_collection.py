@@ -0,0 +1,141 @@
+from collections import Counter
+from typing import Iterable, Iterator
+
+from backend.media_record import MediaRecord
+
+
+class MediaRecordCollection:
+    """
+    Ordered list of MediaRecords that keeps the aggregates used at match time (Type counts, unique titles, and season
+    numbers) up to date as records are added or removed, so checks like has_movies() or get_unique_titles() don't
+    need to scan every record.
+
+    There are no per-field columns: match time only asks these aggregate questions, and columns would copy fields that
+    the records change in place (E.g., title and year through the match options), so they'd need rebuilding anyway.
+    """
+
+    def __init__(self, media_records: Iterable[MediaRecord] = ()):
+        self._media_records: list[MediaRecord] = []
+        # The title key each record was added with, at the same index. Titles can be changed in place (E.g., by the
+        # match options on a snapshot of this collection), so it can't be worked out again once a record is removed.
+        self._title_keys: list[str | None] = []
+
+        # Aggregates.
+        self._media_type_counts: Counter[str | None] = Counter()
+        self._title_key_counts: Counter[str] = Counter()
+        # Title key -> title of the first record with that key (With its original capitalization).
+        self._titles: dict[str, str] = {}
+        self._season_counts: Counter[int] = Counter()
+
+        self.extend(media_records)
+
+    def __len__(self) -> int:
+        return len(self._media_records)
+
+    def __iter__(self) -> Iterator[MediaRecord]:
+        return iter(self._media_records)
+
+    def __getitem__(self, index: int) -> MediaRecord:
+        return self._media_records[index]
+
+    def append(self, media_record: MediaRecord):
+        self.extend([media_record])
+
+    def extend(self, media_records: Iterable[MediaRecord]):
+        """Add records at the end, in one pass for big batches."""
+        media_records = list(media_records)
+        title_keys = [MediaRecord.normalize_title(media_record.title) if media_record.title is not None else None
+                      for media_record in media_records]
+
+        self._media_records.extend(media_records)
+        self._title_keys.extend(title_keys)
+
+        self._media_type_counts.update(media_record.media_type for media_record in media_records)
+        for title_key, media_record in zip(title_keys, media_records):
+            self._add_title(title_key, media_record.title)
+        self._season_counts.update(season_number for media_record in media_records
+                                   for season_number in self._retrieve_season_numbers(media_record))
+
+    def pop(self, index: int = -1) -> MediaRecord:
+        """Remove and return the record at index."""
+        media_record = self._media_records.pop(index)
+        title_key = self._title_keys.pop(index)
+
+        self._remove_count(self._media_type_counts, media_record.media_type)
+        self._remove_title(title_key, media_record.title)
+        for season_number in self._retrieve_season_numbers(media_record):
+            self._remove_count(self._season_counts, season_number)
+
+        return media_record
+
+    def clear(self):
+        self._media_records.clear()
+        self._title_keys.clear()
+
+        self._media_type_counts.clear()
+        self._title_key_counts.clear()
+        self._titles.clear()
+        self._season_counts.clear()
+
+    def has_movies(self) -> bool:
+        return self._media_type_counts["movie"] > 0
+
+    def has_episodes(self) -> bool:
+        return self._media_type_counts["episode"] > 0
+
+    def is_tv_series(self) -> bool:
+        return self.has_episodes() and not self.has_movies()
+
+    def get_unique_titles(self) -> set[str]:
+        """Same as MediaRecord.get_unique_titles(), without scanning every record."""
+        return set(self._titles.values())
+
+    def get_all_season_numbers(self) -> set[int]:
+        """Same as MediaRecord.get_all_season_numbers(), without scanning every record."""
+        season_numbers = {season_number for season_number in self._season_counts if season_number is not None}
+
+        # If no season numbers are found, default to season 1.
+        return season_numbers or {1}
+
+    def update_title_for_all_records(self, title: str):
+        MediaRecord.update_title_for_all_records(title, self._media_records)
+
+        title_key = MediaRecord.normalize_title(title)
+        self._title_keys = [title_key] * len(self._media_records)
+        self._title_key_counts = Counter({title_key: len(self._media_records)}) if self._media_records else Counter()
+        self._titles = {title_key: title.strip()} if self._media_records else {}
+
+    def update_year_for_all_records(self, year: str):
+        MediaRecord.update_year_for_all_records(year, self._media_records)
+
+    @staticmethod
+    def _retrieve_season_numbers(media_record: MediaRecord) -> list:
+        # guessit returns a list of seasons for multi-season files, e.g., S01-S02.
+        season = media_record.metadata.get("season")
+        return season if isinstance(season, list) else [season]
+
+    def _add_title(self, title_key: str | None, title: str | None):
+        # Ignore records without a title.
+        if title_key is None:
+            return
+
+        self._title_key_counts[title_key] += 1
+        self._titles.setdefault(title_key, title.strip())
+
+    def _remove_title(self, title_key: str | None, title: str | None):
+        if title_key is None:
+            return
+
+        self._remove_count(self._title_key_counts, title_key)
+        if title_key not in self._title_key_counts:
+            del self._titles[title_key]
+        # The removed record may have been the one the title was shown like. The first one left with it is now.
+        elif title is not None and title.strip() == self._titles[title_key]:
+            self._titles[title_key] = self._media_records[self._title_keys.index(title_key)].title.strip()
+
+    @staticmethod
+    def _remove_count(counter: Counter, key):
+        """Decrement a key's count, deleting the key once it reaches zero."""
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
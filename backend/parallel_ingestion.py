@@ -0,0 +1,144 @@
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Iterator
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+from backend.media_record import MediaRecord, guess_metadata, compact_metadata
+from backend.parse_cache import retrieve_parse_cache
+from backend.settings_backend import SettingsSnapshot, retrieve_settings_snapshot
+
+# Folders with fewer files than this are parsed on the GUI thread since handing them off isn't worth it.
+PARALLEL_INGESTION_THRESHOLD = 200
+
+# Number of files sent to a worker process at once. This is also how many rows are streamed to the UI at once.
+CHUNK_SIZE = 64
+
+# Lazy created since starting worker processes is slow. Once started, they're reused for every bulk drop.
+_process_pool: ProcessPoolExecutor | None = None
+
+
+# pylint: disable=global-statement
+def retrieve_process_pool() -> ProcessPoolExecutor:
+    """Ensure the shared process pool (One worker per CPU core) is built and return it."""
+    global _process_pool
+
+    if _process_pool is None:
+        # 'spawn' is the only start method on Windows. Using it everywhere also avoids forking a running Qt app.
+        _process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+    return _process_pool
+
+
+def _guess_metadata_for_chunk(file_paths: list[str], settings: SettingsSnapshot) -> list[dict]:
+    """Runs in a worker process. Returns compact (Picklable) metadata dicts in the same order as file_paths."""
+    return [compact_metadata(guess_metadata(file_path, settings)) for file_path in file_paths]
+
+
+def parse_file_paths_in_parallel(file_paths: list[str], settings: SettingsSnapshot, executor: Executor,
+                                 max_chunks_in_flight: int | None = None) -> Iterator[list[dict]]:
+    """
+    Fan guessit parsing of file_paths out across an executor's workers, CHUNK_SIZE files at a time.
+    Yields the metadata one chunk at a time, in the same order as file_paths.
+
+    Only max_chunks_in_flight chunks are submitted at a time (By default, two per CPU core, so every worker has its
+    next chunk queued). Chunks that are still waiting are cancelled once the caller stops iterating, e.g., when a
+    drop is cancelled, so they don't keep the pool busy.
+    """
+    if max_chunks_in_flight is None:
+        max_chunks_in_flight = (os.cpu_count() or 1) * 2
+
+    futures: deque[Future] = deque()
+    try:
+        for i in range(0, len(file_paths), CHUNK_SIZE):
+            futures.append(executor.submit(_guess_metadata_for_chunk, file_paths[i:i + CHUNK_SIZE], settings))
+            if len(futures) >= max_chunks_in_flight:
+                yield futures.popleft().result()
+
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+# pylint: disable=broad-exception-caught
+class ParallelIngestionWorker(QObject, QRunnable):
+    """
+    Builds MediaRecords for a large list of files without stalling the UI. Cached files are reused and the
+    rest are parsed by the shared process pool. MediaRecords are emitted in chunks, in the same order as file_paths.
+    """
+    chunk_ready = Signal(list)
+    finished = Signal()
+    error = Signal()
+
+    def __init__(self, file_paths: list[str], settings: SettingsSnapshot | None = None,
+                 cached_metadata: list[dict | None] | None = None):
+        QObject.__init__(self)
+        QRunnable.__init__(self)
+        self.file_paths = file_paths
+        # Metadata already looked up by the caller, e.g., by a DirectoryScanIndex. None for files that need parsing.
+        self.cached_metadata = cached_metadata
+
+        # Settings are captured here, on the GUI thread, and shared by every file in this batch.
+        self.settings = settings if settings is not None else retrieve_settings_snapshot()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Thread-safe. No more chunks are emitted after this. finished is still emitted."""
+        self._cancel_event.set()
+
+    @Slot()
+    def run(self):
+        try:
+            parse_cache = retrieve_parse_cache()
+            if self.cached_metadata is not None:
+                cached_metadata = self.cached_metadata
+                # Keys are only needed to store the files that get parsed.
+                parse_cache_keys = [parse_cache.create_key(file_path, self.settings) if metadata is None else None
+                                    for file_path, metadata in zip(self.file_paths, cached_metadata)]
+            else:
+                parse_cache_keys = [parse_cache.create_key(file_path, self.settings) for file_path in self.file_paths]
+                cached_metadata = [parse_cache.get(parse_cache_key) for parse_cache_key in parse_cache_keys]
+
+            # Only the files that weren't in the parse cache are sent to the worker processes.
+            uncached_file_paths = [file_path for file_path, metadata in zip(self.file_paths, cached_metadata)
+                                   if metadata is None]
+            parsed_metadata_chunks = parse_file_paths_in_parallel(uncached_file_paths, self.settings,
+                                                                  retrieve_process_pool())
+            parsed_metadata = itertools.chain.from_iterable(parsed_metadata_chunks)
+
+            media_records: list[MediaRecord] = []
+            try:
+                for file_path, parse_cache_key, metadata in zip(self.file_paths, parse_cache_keys, cached_metadata):
+                    if self._cancel_event.is_set():
+                        break
+
+                    if metadata is None:
+                        # Blocks until the worker process handling this file's chunk is done.
+                        metadata = next(parsed_metadata)
+                        parse_cache.put(parse_cache_key, metadata)
+
+                    media_records.append(MediaRecord(file_path, metadata))
+
+                    if len(media_records) == CHUNK_SIZE:
+                        self.chunk_ready.emit(media_records)
+                        media_records = []
+            finally:
+                # Cancels the chunks that weren't parsed yet, if it was cancelled (Or failed).
+                parsed_metadata_chunks.close()
+                parse_cache.flush_last_used()
+
+            if media_records and not self._cancel_event.is_set():
+                self.chunk_ready.emit(media_records)
+
+            self.finished.emit()
+        # Worker processes can fail in many ways (Killed, out of memory, etc.), which all surface differently.
+        except Exception as e:
+            print(e, file=sys.stderr)
+            self.error.emit()
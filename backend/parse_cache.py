@@ -0,0 +1,264 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from platformdirs import user_data_dir
+
+from backend.settings_backend import SettingsSnapshot
+from backend.sqlite_cache import open_cache_database, prepare_cache_connection
+
+# Bump this whenever the shape of the cached metadata changes, so rows written by older versions become misses.
+PARSE_CACHE_FORMAT_VERSION = 2
+
+# Bump this whenever the table's columns change. Tables with an older schema are dropped and recreated.
+PARSE_CACHE_SCHEMA_VERSION = 2
+
+# How many writes can happen between checks of the table size (Counting rows on every write is wasteful).
+EVICTION_CHECK_INTERVAL = 1000
+
+# How many hits can be waiting for their last_used to be written before they're written in one commit.
+LAST_USED_BATCH_SIZE = 1000
+
+# (path, dev, inode, size, mtime_ns, use_only_filename_for_analysis, excluded_folders, parser_version)
+ParseCacheKey = tuple[str, int, int, int, int, int, str, str]
+
+
+@lru_cache(maxsize=1)
+def retrieve_parser_version() -> str:
+    """The last part of a ParseCacheKey. guessit is imported on first use, since it's slow to import at startup."""
+    from guessit import __version__ as guessit_version  # pylint: disable=import-outside-toplevel
+
+    return f"{guessit_version}/{PARSE_CACHE_FORMAT_VERSION}"
+
+
+# pylint: disable=too-many-instance-attributes
+class ParseCache:
+    """
+    Persistent SQLite cache of guessit results so unchanged files don't need to be parsed again.
+
+    A cached result is only reused if the file's device, inode, size, and modification time, the analysis settings,
+    and the guessit version all match what they were when the file was parsed. Each path only keeps its latest
+    result, and the least recently used rows are evicted once the cache grows past max_entries.
+
+    It doubles as the scan index of every folder the user has added: see DirectoryScanIndex.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+
+        # Hit/miss counters for the lifetime of this object. Lookups for files that can't be stat'd aren't counted.
+        self.hits = 0
+        self.misses = 0
+
+        self._writes_since_eviction_check = 0
+        # Paths of the rows that were hit since their last_used was last written. See flush_last_used().
+        self._used_file_paths: set[str] = set()
+        # Worker threads share this connection, so every statement is serialized through the lock.
+        self._lock = threading.Lock()
+        self._connection = self._open_connection()
+        self._evict_least_recently_used()
+
+    @staticmethod
+    def create_key(file_path: str, settings: SettingsSnapshot,
+                   file_stat: os.stat_result | None = None) -> ParseCacheKey | None:
+        """
+        Returns the cache key for a file, or None if the file can't be stat'd, e.g., it doesn't exist.
+        Pass file_stat if the file was already stat'd, e.g., by os.scandir().
+        """
+        if file_stat is None:
+            try:
+                file_stat = os.stat(file_path)
+            except (OSError, ValueError):
+                return None
+
+        return (file_path, file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns,
+                int(settings.use_only_filename_for_analysis), "\n".join(sorted(settings.excluded_folders)),
+                retrieve_parser_version())
+
+    def get(self, key: ParseCacheKey | None) -> dict | None:
+        """
+        Returns the cached metadata for a key, or None on a miss. A hit's last_used isn't written right away, but with
+        the next put(), or in batches of LAST_USED_BATCH_SIZE. Call flush_last_used() once a batch of files is done.
+        """
+        if key is None:
+            return None
+
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT metadata FROM parse_cache WHERE path = ? AND dev = ? AND inode = ? AND size = ? "
+                    "AND mtime_ns = ? AND analysis_only = ? AND excluded_folders = ? AND parser_version = ?",
+                    key).fetchone()
+
+                if row is not None:
+                    self._used_file_paths.add(key[0])
+                    if len(self._used_file_paths) >= LAST_USED_BATCH_SIZE:
+                        self._write_last_used()
+                        self._connection.commit()
+            except sqlite3.Error:
+                # A locked or broken cache should never stop files from being parsed. Treat it as a miss.
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return pickle.loads(row[0])
+
+    def put(self, key: ParseCacheKey | None, metadata: dict):
+        """Stores the metadata for a key, replacing any older result for the same path."""
+        if key is None:
+            return
+
+        with self._lock:
+            try:
+                # The hits since the last write share its commit.
+                self._write_last_used()
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL), time.time()))
+                self._connection.commit()
+            except sqlite3.Error:
+                return
+
+        self._writes_since_eviction_check += 1
+        if self._writes_since_eviction_check >= EVICTION_CHECK_INTERVAL:
+            self._evict_least_recently_used()
+
+    def get_directory(self, directory: str) -> dict[str, tuple[ParseCacheKey, bytes]]:
+        """
+        Returns the key and pickled metadata of every cached file in a directory and its subdirectories, by path.
+        One query for the whole tree, instead of one per file. Doesn't count as hits or misses.
+        """
+        lower_bound, upper_bound = _directory_path_range(directory)
+
+        with self._lock:
+            try:
+                rows = self._connection.execute(
+                    "SELECT path, dev, inode, size, mtime_ns, analysis_only, excluded_folders, parser_version, "
+                    "metadata FROM parse_cache WHERE path >= ? AND path < ?", (lower_bound, upper_bound)).fetchall()
+            except sqlite3.Error:
+                return {}
+
+        return {row[0]: (row[:8], row[8]) for row in rows}
+
+    def touch(self, file_paths: list[str]):
+        """Marks the rows of file_paths as just used, so eviction keeps them. One commit for all of them."""
+        with self._lock:
+            self._used_file_paths.update(file_paths)
+            try:
+                self._write_last_used()
+                self._connection.commit()
+            except sqlite3.Error:
+                return
+
+    def flush_last_used(self):
+        """Writes the last_used of every hit that wasn't written yet, in one commit."""
+        self.touch([])
+
+    def _write_last_used(self):
+        """Must hold the lock. Doesn't commit, so the caller can share its commit."""
+        if not self._used_file_paths:
+            return
+
+        now = time.time()
+        used_file_paths, self._used_file_paths = self._used_file_paths, set()
+        self._connection.executemany("UPDATE parse_cache SET last_used = ? WHERE path = ?",
+                                     ((now, file_path) for file_path in used_file_paths))
+
+    def remove_missing(self, directory: str, found_file_paths: set[str]) -> int:
+        """Deletes the rows of files in a directory tree that aren't in found_file_paths. Returns how many."""
+        missing_file_paths = [file_path for file_path in self.get_directory(directory)
+                              if file_path not in found_file_paths]
+
+        with self._lock:
+            try:
+                self._connection.executemany("DELETE FROM parse_cache WHERE path = ?",
+                                             ((file_path,) for file_path in missing_file_paths))
+                self._connection.commit()
+            except sqlite3.Error:
+                return 0
+
+        return len(missing_file_paths)
+
+    def clear(self):
+        with self._lock:
+            self._used_file_paths.clear()
+            self._connection.execute("DELETE FROM parse_cache")
+            self._connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def _evict_least_recently_used(self):
+        """Deletes the least recently used rows if the cache has grown past max_entries."""
+        self._writes_since_eviction_check = 0
+
+        with self._lock:
+            try:
+                row_count = self._connection.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+                if row_count <= self.max_entries:
+                    return
+
+                self._connection.execute(
+                    "DELETE FROM parse_cache WHERE path IN "
+                    "(SELECT path FROM parse_cache ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                    (row_count - self.max_entries,))
+                self._connection.commit()
+            except sqlite3.Error:
+                return
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Opens (Or creates) the cache database. A corrupted database is deleted and recreated."""
+        # See JSONConfig._ensure_exists() for why the path is resolved (Issue #58).
+        self.path = self.path.resolve(strict=False)
+
+        return open_cache_database(self.path, self._create_schema)
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> sqlite3.Connection:
+        prepare_cache_connection(connection, "parse_cache", PARSE_CACHE_SCHEMA_VERSION)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "path TEXT PRIMARY KEY, dev INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, "
+            "analysis_only INTEGER, excluded_folders TEXT, parser_version TEXT, metadata BLOB, last_used REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)")
+        connection.commit()
+
+        return connection
+
+
+def _directory_path_range(directory: str) -> tuple[str, str]:
+    """
+    Returns the [lower, upper) range of path strings inside a directory, so the primary key index can be used.
+    E.g., 'C:/TV' -> ['C:/TV\\', 'C:/TV]'), where ']' is the character after '\\'.
+    """
+    prefix = os.path.join(directory, "")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+# Lazy created so simply importing this module doesn't touch the disk.
+_parse_cache: ParseCache | None = None
+
+
+# pylint: disable=global-statement
+def retrieve_parse_cache() -> ParseCache:
+    """Ensure the application-wide parse cache is built and return it."""
+    global _parse_cache
+
+    if _parse_cache is None:
+        _parse_cache = ParseCache(Path(user_data_dir(appauthor=False, appname="Simpler FileBot"))
+                                  / "parse_cache.sqlite3")
+
+    return _parse_cache
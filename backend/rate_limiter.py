@@ -0,0 +1,59 @@
+import threading
+import time
+
+# (Requests per second, burst size) allowed per database host. A full burst plus the rest of the window stays under
+# each provider's quota: TMDB allows around 50 requests per second, OMDB doesn't say (So it's kept low), and TVMaze
+# allows 20 calls every 10 seconds. Hosts that aren't listed aren't limited.
+PROVIDER_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "api.themoviedb.org": (40, 10),
+    "www.omdbapi.com": (10, 10),
+    "api.tvmaze.com": (1, 10),
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Holds up to capacity tokens and gains rate_per_second of them every second. Each
+    request takes a token, waiting for one if the bucket is empty, so bursts of up to capacity requests go out at
+    once and the rest are spread out to rate_per_second.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, blocking until it's available. Waiting threads get their tokens in the order they asked."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+            self._updated = now
+
+            # Reserve the token now, even if it's only available later. A negative balance is a queue of requests.
+            self._tokens -= 1
+            wait_seconds = -self._tokens / self.rate_per_second if self._tokens < 0 else 0.0
+
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+# Lazy created per host, and shared by every thread sending requests to it.
+_rate_limiters: dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def retrieve_rate_limiter(host: str) -> TokenBucket | None:
+    """Ensure the TokenBucket for a database host is built and return it, or None if the host isn't limited."""
+    host = host.lower()
+    if host not in PROVIDER_RATE_LIMITS:
+        return None
+
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = TokenBucket(*PROVIDER_RATE_LIMITS[host])
+
+        return _rate_limiters[host]
@@ -0,0 +1,261 @@
+import io
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+
+import requests
+from platformdirs import user_data_dir
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from backend.rate_limiter import retrieve_rate_limiter
+from backend.sqlite_cache import open_cache_database, prepare_cache_connection
+
+# Bump this whenever the table's columns change. Tables with an older schema are dropped and recreated.
+RESPONSE_CACHE_SCHEMA_VERSION = 1
+
+# How long a response is reused for. Episode lists rarely change once a season has aired, while searches can pick
+# up new listings at any time, so they're only reused while the same files are matched again, e.g., with another year.
+SEARCH_TTL_SECONDS = 60 * 60
+SERIES_TTL_SECONDS = 60 * 60 * 24
+EPISODE_LIST_TTL_SECONDS = 60 * 60 * 24 * 7
+
+# Which GET requests are cached, and for how long: (Host, path pattern, query parameter that has to be in the request
+# or None, TTL in seconds). The first match wins. Anything else is always sent to the network.
+RESPONSE_CACHE_TTLS = (
+    ("api.themoviedb.org", re.compile(r"/3/tv/\d+/season/\d+"), None, EPISODE_LIST_TTL_SECONDS),
+    ("api.themoviedb.org", re.compile(r"/3/tv/\d+"), None, SERIES_TTL_SECONDS),
+    ("api.themoviedb.org", re.compile(r"/3/search/\w+"), None, SEARCH_TTL_SECONDS),
+    ("www.omdbapi.com", re.compile(r"/?"), "season", EPISODE_LIST_TTL_SECONDS),
+    ("www.omdbapi.com", re.compile(r"/?"), None, SEARCH_TTL_SECONDS),
+    ("api.tvmaze.com", re.compile(r"/shows/\d+/episodes"), None, EPISODE_LIST_TTL_SECONDS),
+    ("api.tvmaze.com", re.compile(r"/search/\w+"), None, SEARCH_TTL_SECONDS),
+)
+
+# Query parameters that only authenticate a request. They're left out of keys, so API keys aren't written to disk
+# and changing a key doesn't throw the cache away.
+API_KEY_PARAMETERS = frozenset({"api_key", "apikey"})
+
+
+def create_key(url: str) -> str:
+    """
+    Normalizes a GET request's URL into a cache key: the scheme and host are lowercased, the query parameters are
+    sorted, and API keys are removed.
+    E.g., 'HTTP://OMDbAPI.com?y=1995&t=Heat&apikey=X' -> 'http://omdbapi.com/?t=Heat&y=1995'.
+    """
+    scheme, host, path, query, _ = urlsplit(url)
+    parameters = sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                        if name.lower() not in API_KEY_PARAMETERS)
+
+    return urlunsplit((scheme.lower(), host.lower(), path or "/", urlencode(parameters), ""))
+
+
+def retrieve_ttl_seconds(url: str) -> int | None:
+    """How long the response of a GET request to url is cached for, or None if it shouldn't be cached."""
+    _, host, path, query, _ = urlsplit(url)
+    # Case-insensitive, e.g., the omdb client sends 'Season'.
+    parameter_names = {name.casefold() for name, _ in parse_qsl(query, keep_blank_values=True)}
+
+    for rule_host, path_pattern, required_parameter, ttl_seconds in RESPONSE_CACHE_TTLS:
+        if host.lower() == rule_host and path_pattern.fullmatch(path) \
+                and (required_parameter is None or required_parameter in parameter_names):
+            return ttl_seconds
+
+    return None
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of database (TMDB, OMDB, TVMaze) responses, so re-matching the same files doesn't need
+    the network. See CachingHTTPAdapter.
+
+    Responses are keyed by their normalized request (See create_key()) and reused until they expire. The least
+    recently used ones are evicted once the cached bodies add up to more than max_bytes.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 64 * 1024 * 1024):
+        # See JSONConfig._ensure_exists() for why the path is resolved (Issue #58).
+        self.path = path.resolve(strict=False)
+        self.max_bytes = max_bytes
+
+        # Hit/miss counters for the lifetime of this object. Expired responses count as misses.
+        self.hits = 0
+        self.misses = 0
+
+        # Worker threads share this connection, so every statement is serialized through the lock.
+        self._lock = threading.Lock()
+        self._connection = open_cache_database(self.path, self._create_schema)
+        self._evict()
+
+    @property
+    def hit_ratio(self) -> float:
+        """Hits / lookups, or 0.0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        """Returns the (Content type, body) of an unexpired cached response, or None on a miss."""
+        with self._lock:
+            try:
+                now = time.time()
+                row = self._connection.execute(
+                    "SELECT content_type, body FROM response_cache WHERE key = ? AND expires > ?",
+                    (key, now)).fetchone()
+
+                if row is not None:
+                    self._connection.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (now, key))
+                    self._connection.commit()
+            except sqlite3.Error:
+                # A locked or broken cache should never stop a match. Treat it as a miss.
+                row = None
+
+            if row is not None:
+                self.hits += 1
+                return row[0], row[1]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, content_type: str, body: bytes, ttl_seconds: int):
+        """Stores a response for ttl_seconds, replacing any older one with the same key."""
+        with self._lock:
+            try:
+                now = time.time()
+                self._connection.execute("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?)",
+                                         (key, content_type, body, len(body), now + ttl_seconds, now))
+                self._connection.commit()
+            except sqlite3.Error:
+                return
+
+        # Responses are only written after a network round-trip, so checking the size on every write is cheap.
+        self._evict()
+
+    def size_bytes(self) -> int:
+        """The total size of the cached bodies."""
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM response_cache")
+            self._connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def _evict(self):
+        """Deletes expired responses, then the least recently used ones while the bodies are over max_bytes."""
+        with self._lock:
+            try:
+                self._connection.execute("DELETE FROM response_cache WHERE expires <= ?", (time.time(),))
+
+                size_bytes = self._connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+                if size_bytes > self.max_bytes:
+                    evicted_keys = []
+                    for key, size in self._connection.execute(
+                            "SELECT key, size FROM response_cache ORDER BY last_used ASC, rowid ASC"):
+                        if size_bytes <= self.max_bytes:
+                            break
+                        evicted_keys.append((key,))
+                        size_bytes -= size
+
+                    self._connection.executemany("DELETE FROM response_cache WHERE key = ?", evicted_keys)
+
+                self._connection.commit()
+            except sqlite3.Error:
+                return
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> sqlite3.Connection:
+        prepare_cache_connection(connection, "response_cache", RESPONSE_CACHE_SCHEMA_VERSION)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, content_type TEXT, body BLOB, size INTEGER, expires REAL, last_used REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS response_cache_last_used ON response_cache (last_used)")
+        connection.commit()
+
+        return connection
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that answers GET requests from a ResponseCache, and only sends the ones it can't answer to the
+    network. Successful (200) responses of the requests in RESPONSE_CACHE_TTLS are cached. Mounted by
+    retrieve_cached_session(), which every database sends its requests through.
+
+    Requests sent to the network wait for their host's rate limiter (See PROVIDER_RATE_LIMITS), so concurrent lookups
+    stay within each provider's quota. Cached responses don't count.
+    """
+
+    def __init__(self, response_cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.response_cache = response_cache
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        ttl_seconds = retrieve_ttl_seconds(request.url) if request.method == "GET" else None
+        if ttl_seconds is None:
+            return self._send_to_network(request, stream, timeout, verify, cert, proxies)
+
+        key = create_key(request.url)
+        cached_response = self.response_cache.get(key)
+        if cached_response is not None:
+            content_type, body = cached_response
+            return self.build_response(request, HTTPResponse(body=io.BytesIO(body), status=200, reason="OK",
+                                                             headers={"Content-Type": content_type},
+                                                             preload_content=False))
+
+        response = self._send_to_network(request, stream, timeout, verify, cert, proxies)
+        if response.status_code == 200:
+            # Reading the (Decoded) body here is fine even for stream=True. It's cached, and response.content keeps it.
+            self.response_cache.put(key, response.headers.get("Content-Type", ""), response.content, ttl_seconds)
+
+        return response
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _send_to_network(self, request: requests.PreparedRequest, stream, timeout, verify, cert,
+                         proxies) -> requests.Response:
+        rate_limiter = retrieve_rate_limiter(urlsplit(request.url).hostname or "")
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        return super().send(request, stream, timeout, verify, cert, proxies)
+
+
+# Lazy created so simply importing this module doesn't touch the disk.
+_response_cache: ResponseCache | None = None
+_cached_session: requests.Session | None = None
+
+
+# pylint: disable=global-statement
+def retrieve_response_cache() -> ResponseCache:
+    """Ensure the application-wide response cache is built and return it."""
+    global _response_cache
+
+    if _response_cache is None:
+        _response_cache = ResponseCache(Path(user_data_dir(appauthor=False, appname="Simpler FileBot"))
+                                        / "response_cache.sqlite3")
+
+    return _response_cache
+
+
+def retrieve_cached_session() -> requests.Session:
+    """Ensure the requests.Session shared by every database, backed by the response cache, is built and return it."""
+    global _cached_session
+
+    if _cached_session is None:
+        _cached_session = requests.Session()
+        caching_adapter = CachingHTTPAdapter(retrieve_response_cache())
+        _cached_session.mount("http://", caching_adapter)
+        _cached_session.mount("https://", caching_adapter)
+
+    return _cached_session
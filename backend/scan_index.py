@@ -0,0 +1,71 @@
+import os
+import pickle
+from dataclasses import dataclass
+
+from backend.parse_cache import ParseCache, ParseCacheKey, retrieve_parse_cache
+from backend.settings_backend import SettingsSnapshot
+
+
+@dataclass
+class ScanReport:
+    """How the files of one batch of added paths were handled."""
+    reused_file_count: int = 0
+    parsed_file_count: int = 0
+    removed_file_count: int = 0
+    # Files that were already in the input list, so they were skipped instead of parsed again.
+    duplicate_file_count: int = 0
+
+    def __str__(self):
+        description = (f"{self.reused_file_count} reused, {self.parsed_file_count} parsed, "
+                       f"{self.removed_file_count} removed")
+        if self.duplicate_file_count:
+            description += f", {self.duplicate_file_count} duplicates skipped"
+
+        return description
+
+
+class DirectoryScanIndex:
+    """
+    Compares one scan of a directory tree against what the parse cache knows about it, so re-dropping the same
+    folder only parses new or changed files. Files that are in the cache but weren't found anymore are removed.
+
+    Every cached row of the tree is read with a single query when the first file is looked up. Meant to be used
+    by the thread doing the scan: lookup() for every file found, then finish() once the whole tree was scanned.
+    """
+
+    def __init__(self, directory: str, settings: SettingsSnapshot, parse_cache: ParseCache | None = None):
+        self.directory = directory
+        self.settings = settings
+        self.parse_cache = parse_cache if parse_cache is not None else retrieve_parse_cache()
+        self.scan_report = ScanReport()
+
+        self._indexed_files: dict[str, tuple[ParseCacheKey, bytes]] | None = None
+        self._found_file_paths: set[str] = set()
+        self._reused_file_paths: list[str] = []
+
+    def lookup(self, entry: os.DirEntry, file_stat: os.stat_result | None) -> dict | None:
+        """
+        Returns the cached metadata of a file found by os.scandir(), or None if it's new or has changed.
+        file_stat is its stat, or None if it was deleted mid-scan (The parser deals with it then).
+        """
+        if self._indexed_files is None:
+            self._indexed_files = self.parse_cache.get_directory(self.directory)
+
+        self._found_file_paths.add(entry.path)
+
+        indexed_file = self._indexed_files.get(entry.path)
+        if indexed_file is None or file_stat is None or \
+                indexed_file[0] != ParseCache.create_key(entry.path, self.settings, file_stat):
+            self.scan_report.parsed_file_count += 1
+            return None
+
+        self.scan_report.reused_file_count += 1
+        self._reused_file_paths.append(entry.path)
+        return pickle.loads(indexed_file[1])
+
+    def finish(self) -> ScanReport:
+        """Removes the files that weren't found by this scan from the cache. Only call this after a complete scan."""
+        self.parse_cache.touch(self._reused_file_paths)
+        self.scan_report.removed_file_count = self.parse_cache.remove_missing(self.directory, self._found_file_paths)
+
+        return self.scan_report
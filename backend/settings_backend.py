@@ -1,3 +1,6 @@
+import os
+from dataclasses import dataclass
+
 from PySide6.QtGui import QGuiApplication, Qt
 
 from backend.json_config import JSONConfig
@@ -5,6 +8,29 @@ from backend.json_config import JSONConfig
 # Lazy created since Qt.ColorScheme does not work until after app is fully built.
 _settings_json_config: JSONConfig | None = None
 
+# Only dropped files, and files from dropped folders, with these extensions are added.
+DEFAULT_MEDIA_EXTENSIONS = ("3gp", "avi", "divx", "flv", "m2ts", "m4v", "mkv", "mov", "mp4", "mpeg", "mpg", "mts",
+                            "ogm", "ogv", "rmvb", "ts", "vob", "webm", "wmv")
+# Dropped files, and files and folders (Ending with '/') from dropped folders, that are skipped. See FilePrefilter.
+DEFAULT_IGNORE_PATTERNS = ("*sample*", "Sample/", "Samples/", "Extras/", "Featurettes/")
+# Dropped files, and files from dropped folders, that are smaller than this (In bytes) are skipped. 0 allows every size.
+DEFAULT_MINIMUM_FILE_SIZE = 0
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Immutable copy of the settings that affect file analysis. Captured once and shared by a batch of files."""
+    use_only_filename_for_analysis: bool = False
+    excluded_folders: tuple[str, ...] = ()
+    media_extensions: tuple[str, ...] = DEFAULT_MEDIA_EXTENSIONS
+    ignore_patterns: tuple[str, ...] = DEFAULT_IGNORE_PATTERNS
+    minimum_file_size: int = DEFAULT_MINIMUM_FILE_SIZE
+
+
+# Cached snapshot and the (path, mtime, size) of settings.json when it was read. Cleared whenever a setting is saved.
+_settings_snapshot: SettingsSnapshot | None = None
+_settings_snapshot_file_stamp: tuple | None = None
+
 
 # pylint: disable=global-statement
 def ensure() -> JSONConfig:
@@ -19,13 +45,51 @@ def ensure() -> JSONConfig:
                           if QGuiApplication.styleHints().colorScheme() == Qt.ColorScheme.Unknown
                           else QGuiApplication.styleHints().colorScheme().name),
                 "excluded_folders": [],
-                "use_only_filename_for_analysis": False
+                "use_only_filename_for_analysis": False,
+                "media_extensions": list(DEFAULT_MEDIA_EXTENSIONS),
+                "ignore_patterns": list(DEFAULT_IGNORE_PATTERNS),
+                "minimum_file_size": DEFAULT_MINIMUM_FILE_SIZE
             }
         )
 
     return _settings_json_config
 
 
+def retrieve_settings_snapshot() -> SettingsSnapshot:
+    """
+    Returns a snapshot of the file analysis settings. settings.json is only read again after a setting was saved
+    through this module or the file was edited by hand, so capturing a snapshot per batch of files is cheap.
+    """
+    global _settings_snapshot, _settings_snapshot_file_stamp
+
+    settings_file_path = ensure().path
+    try:
+        file_stat = os.stat(settings_file_path)
+        file_stamp = (settings_file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        file_stamp = None
+
+    if _settings_snapshot is None or file_stamp is None or file_stamp != _settings_snapshot_file_stamp:
+        settings = ensure().get_all()
+        _settings_snapshot = SettingsSnapshot(
+            use_only_filename_for_analysis=settings.get("use_only_filename_for_analysis", False),
+            excluded_folders=tuple(settings.get("excluded_folders", [])),
+            media_extensions=tuple(settings.get("media_extensions", DEFAULT_MEDIA_EXTENSIONS)),
+            ignore_patterns=tuple(settings.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS)),
+            minimum_file_size=settings.get("minimum_file_size", DEFAULT_MINIMUM_FILE_SIZE)
+        )
+        _settings_snapshot_file_stamp = file_stamp
+
+    return _settings_snapshot
+
+
+def _invalidate_settings_snapshot():
+    """Forces the next retrieve_settings_snapshot() to re-read settings.json."""
+    global _settings_snapshot
+
+    _settings_snapshot = None
+
+
 def retrieve_theme_from_settings() -> str:
     """Returns the theme from settings.json. Defaults to 'Dark' if settings are erroneous."""
     return ensure().get("theme", "Dark")
@@ -36,14 +100,29 @@ def save_new_theme_to_settings(scheme: Qt.ColorScheme):
     ensure().set("theme", scheme.name)
 
 
+def set_color_theme_on_startup():
+    """
+    Grabs the desired theme from settings and sets the color theme for the UI before other elements are drawn.
+    Setting the color theme after elements have been drawn does not work.
+    """
+
+    if retrieve_theme_from_settings() == "Light":
+        QGuiApplication.styleHints().setColorScheme(Qt.ColorScheme.Light)
+    else:
+        # Default to 'Dark' otherwise.
+        QGuiApplication.styleHints().setColorScheme(Qt.ColorScheme.Dark)
+
+
 def add_excluded_folder(folder_path: str):
     """Add a folder to the 'excluded_folders' list in settings.json."""
     ensure().add("excluded_folders", folder_path)
+    _invalidate_settings_snapshot()
 
 
 def remove_excluded_folder(folder_path: str):
     """Remove a folder from the 'excluded_folders' list in settings.json."""
     ensure().remove("excluded_folders", folder_path)
+    _invalidate_settings_snapshot()
 
 
 def retrieve_excluded_folders() -> list[str]:
@@ -55,11 +134,40 @@ def retrieve_filename_analysis_only_flag() -> bool:
 
 
 def set_filename_analysis_only_flag(new_value: bool):
-    return ensure().set("use_only_filename_for_analysis", new_value)
+    ensure().set("use_only_filename_for_analysis", new_value)
+    _invalidate_settings_snapshot()
+
+
+def retrieve_media_extensions() -> list[str]:
+    return ensure().get("media_extensions", list(DEFAULT_MEDIA_EXTENSIONS))
+
+
+def set_media_extensions(media_extensions: list[str]):
+    ensure().set("media_extensions", media_extensions)
+    _invalidate_settings_snapshot()
+
+
+def retrieve_ignore_patterns() -> list[str]:
+    return ensure().get("ignore_patterns", list(DEFAULT_IGNORE_PATTERNS))
+
+
+def set_ignore_patterns(ignore_patterns: list[str]):
+    ensure().set("ignore_patterns", ignore_patterns)
+    _invalidate_settings_snapshot()
+
+
+def retrieve_minimum_file_size() -> int:
+    return ensure().get("minimum_file_size", DEFAULT_MINIMUM_FILE_SIZE)
+
+
+def set_minimum_file_size(minimum_file_size: int):
+    ensure().set("minimum_file_size", minimum_file_size)
+    _invalidate_settings_snapshot()
 
 
 def delete_and_recreate_settings_file():
     ensure().delete_and_recreate_file()
+    _invalidate_settings_snapshot()
 
 
 def get_settings_file_path():
@@ -0,0 +1,35 @@
+import sqlite3
+from pathlib import Path
+from typing import Callable
+
+
+def open_cache_database(path: Path, create_schema: Callable[[sqlite3.Connection], sqlite3.Connection]) \
+        -> sqlite3.Connection:
+    """
+    Opens (Or creates) a cache database at path, which should already be resolved, and runs create_schema on it.
+    A corrupted database is deleted and recreated.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    try:
+        return create_schema(connection)
+    except sqlite3.DatabaseError:
+        connection.close()
+        path.unlink(missing_ok=True)
+        return create_schema(sqlite3.connect(path, check_same_thread=False))
+
+
+def prepare_cache_connection(connection: sqlite3.Connection, table: str, schema_version: int):
+    """
+    Sets up a cache database's connection, and drops its table if it was created with an older schema version.
+    The caller creates the table (IF NOT EXISTS) afterward.
+    """
+    # WAL + NORMAL sync keeps each commit cheap. Losing the last few rows on a power cut is fine for a cache.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    # Rows written with an older schema can't be read anymore. It's only a cache, so start over.
+    if connection.execute("PRAGMA user_version").fetchone()[0] != schema_version:
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.execute(f"PRAGMA user_version = {schema_version}")
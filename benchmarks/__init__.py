@@ -0,0 +1 @@
+# Empty init file so benchmarks can be run as modules from the project root, e.g., py -m benchmarks.<name>
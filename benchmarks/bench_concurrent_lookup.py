@@ -0,0 +1,150 @@
+"""
+Compares how long matching a batch of movies with TheMovieDB takes, before and after looking movies up concurrently.
+A local stub server stands in for TMDB, and answers every search after --latency ms. The requests go through the
+same session as a real match, with TMDB's rate limiter (PROVIDER_RATE_LIMITS), but nothing is cached.
+Before, each movie was searched for after the previous one was done. Now up to max_concurrent_lookups searches are
+in flight at once, and the rate limiter keeps them within TMDB's quota. Both are checked to match the same movies,
+in the same order, and the busiest second is checked to stay within the quota.
+
+Usage (From the project root): py -m benchmarks.bench_concurrent_lookup [--movies 300] [--latency 50]
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+import tmdbsimple as tmdb
+
+from backend.media_record import MediaRecord
+from backend.rate_limiter import PROVIDER_RATE_LIMITS
+from backend.response_cache import CachingHTTPAdapter, ResponseCache
+from databases import themoviedb_python_db
+from databases.themoviedb_python_db import TheMovieDBPythonDB
+
+TMDB_HOST = "api.themoviedb.org"
+
+
+class StubTMDBHandler(BaseHTTPRequestHandler):
+    """Answers a movie search with one listing named after the query, after LATENCY_SECONDS."""
+    LATENCY_SECONDS = 0.05
+    request_times: list[float] = []
+    _lock = threading.Lock()
+
+    # pylint: disable=invalid-name
+    def do_GET(self):
+        with self._lock:
+            self.request_times.append(time.perf_counter())
+        time.sleep(self.LATENCY_SECONDS)
+
+        query = parse_qs(urlsplit(self.path).query)["query"][0]
+        body = json.dumps({"results": [{"id": abs(hash(query)) % 100000, "title": query,
+                                        "release_date": "2000-01-01"}]}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+class StubServerAdapter(CachingHTTPAdapter):
+    """Sends the requests meant for TMDB to the stub server instead."""
+
+    def __init__(self, stub_server_url: str, response_cache: ResponseCache):
+        super().__init__(response_cache)
+        self.stub_server_url = stub_server_url
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        request.url = request.url.replace(f"https://{TMDB_HOST}", self.stub_server_url)
+        return super().send(request, stream, timeout, verify, cert, proxies)
+
+
+class SequentialTheMovieDBPythonDB(TheMovieDBPythonDB):
+    """TheMovieDBPythonDB, before: one movie at a time."""
+    max_concurrent_lookups = 1
+
+
+def measure(database: TheMovieDBPythonDB) -> tuple[list, float, int]:
+    """Returns (Matches, seconds, the most requests the stub server got within a second)."""
+    StubTMDBHandler.request_times = []
+    start = time.perf_counter()
+    database_matches = database.retrieve_matches_from_db()
+    seconds = time.perf_counter() - start
+
+    request_times = StubTMDBHandler.request_times
+    busiest_second = max(sum(1 for other in request_times if request_time <= other < request_time + 1)
+                         for request_time in request_times)
+
+    return database_matches, seconds, busiest_second
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    """
+    Starts the stub server on a free port. It gets TMDB's rate limit. It's not a TMDB host, so its responses aren't
+    cached.
+    """
+    stub_server = ThreadingHTTPServer(("127.0.0.1", 0), StubTMDBHandler)
+    threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+    PROVIDER_RATE_LIMITS[stub_server.server_address[0]] = PROVIDER_RATE_LIMITS[TMDB_HOST]
+
+    return stub_server
+
+
+def create_session(stub_server: ThreadingHTTPServer, response_cache_path: Path) -> requests.Session:
+    """Like retrieve_cached_session(), but TMDB is the stub server."""
+    stub_host, stub_port = stub_server.server_address[:2]
+    session = requests.Session()
+    session.mount("https://", StubServerAdapter(f"http://{stub_host}:{stub_port}", ResponseCache(response_cache_path)))
+
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds per request.")
+    args = parser.parse_args()
+
+    StubTMDBHandler.LATENCY_SECONDS = args.latency / 1e3
+    stub_server = start_stub_server()
+    rate_per_second, burst = PROVIDER_RATE_LIMITS[TMDB_HOST]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        session = create_session(stub_server, Path(temp_dir) / "response_cache.sqlite3")
+        themoviedb_python_db.retrieve_cached_session = lambda: session
+        tmdb.API_KEY = "BENCHMARK"
+
+        media_records = [MediaRecord(f"Movie {i} (2000).mkv", {"title": f"Movie {i}", "year": 2000,
+                                                                 "container": "mkv"})
+                         for i in range(args.movies)]
+
+        sequential_matches, sequential_seconds, sequential_busiest = measure(
+            SequentialTheMovieDBPythonDB(media_records))
+        time.sleep(burst / rate_per_second)
+        matches, seconds, busiest = measure(TheMovieDBPythonDB(media_records))
+
+    stub_server.shutdown()
+
+    assert matches == sequential_matches, "Both should match the same movies, in the same order."
+    assert [match.title for match in matches] == [media_record.title for media_record in media_records]
+    assert busiest <= rate_per_second + burst, "The rate limiter should keep requests within TMDB's quota."
+
+    print(f"{args.movies} movies, {args.latency:.0f} ms per request, TMDB limit: {rate_per_second:.0f} requests/s "
+          f"(Bursts of {burst})")
+    print(f"  time:           {sequential_seconds:7.2f} s -> {seconds:7.2f} s  "
+          f"({TheMovieDBPythonDB.max_concurrent_lookups} lookups at once)")
+    print(f"  busiest second: {sequential_busiest:7} -> {busiest:7} requests")
+
+
+if __name__ == "__main__":
+    main()
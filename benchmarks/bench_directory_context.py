@@ -0,0 +1,55 @@
+"""
+Compares parsing every file as a full path against parsing each folder once and only the file name per file,
+on a synthetic library with deep folder hierarchies. File names are chosen so the regex fast path never applies.
+
+Usage (From the project root): py -m benchmarks.bench_directory_context [--shows 4] [--seasons 3] [--episodes 12]
+"""
+import argparse
+import time
+
+from backend import media_record
+from backend.media_record import compact_metadata, guess_metadata
+from backend.settings_backend import SettingsSnapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shows", type=int, default=4)
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--episodes", type=int, default=12)
+    args = parser.parse_args()
+
+    file_paths = [f"D:/Media/Library/Video/TV Shows/Show Number {chr(65 + show)} (2008)/Season {season}/"
+                  f"Show Number {chr(65 + show)} - S{season:02d}E{episode:02d} - Episode Name.mkv"
+                  for show in range(args.shows)
+                  for season in range(1, args.seasons + 1)
+                  for episode in range(1, args.episodes + 1)]
+    settings = SettingsSnapshot()
+
+    # pylint: disable=protected-access
+    media_record._retrieve_directory_context.cache_clear()
+    media_record._guess_file_name_metadata.cache_clear()
+
+    start = time.perf_counter()
+    full_path_results = [compact_metadata(guess_metadata(file_path, settings, allow_fast_path=False))
+                         for file_path in file_paths]
+    full_path_seconds = time.perf_counter() - start
+
+    media_record._guess_file_name_metadata.cache_clear()
+
+    start = time.perf_counter()
+    shared_results = [compact_metadata(guess_metadata(file_path, settings)) for file_path in file_paths]
+    shared_seconds = time.perf_counter() - start
+
+    mismatch_count = sum(full_path_result != shared_result
+                         for full_path_result, shared_result in zip(full_path_results, shared_results))
+
+    file_count = len(file_paths)
+    print(f"{file_count} files in {args.shows * args.seasons} folders, {mismatch_count} results differ")
+    print(f"full paths:         {full_path_seconds:7.3f}s  ({full_path_seconds / file_count * 1e3:6.2f} ms/file)")
+    print(f"shared directories: {shared_seconds:7.3f}s  ({shared_seconds / file_count * 1e3:6.2f} ms/file)  "
+          f"speedup x{full_path_seconds / shared_seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
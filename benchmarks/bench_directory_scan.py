@@ -0,0 +1,73 @@
+"""
+Compares the previous rglob scan, which had to finish before the first row could be added, against the
+DirectoryScannerWorker. Reports the scanner's time to its first batch (i.e., the first rows) and to the end of
+the scan, for synthetic trees of different sizes. Run it against a network drive with --root to see stat costs.
+
+Usage (From the project root): py -m benchmarks.bench_directory_scan [--sizes 1000 10000 50000] [--root PATH]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from backend.directory_scanner import DirectoryScannerWorker
+
+
+def make_tree(root: Path, file_count: int):
+    """Shows -> Seasons -> 24 episodes each, plus a few extra files per season."""
+    for i in range(file_count):
+        season_folder = root / f"Show {i // 240}" / f"Season {i // 24 % 10 + 1}"
+        if i % 24 == 0:
+            season_folder.mkdir(parents=True, exist_ok=True)
+        (season_folder / f"Show.{i // 240}.S{i // 24 % 10 + 1:02d}E{i % 24 + 1:02d}.mkv").touch()
+
+
+def measure(root: Path):
+    start = time.perf_counter()
+    rglob_file_count = sum(1 for path in root.rglob("*") if path.is_file())
+    rglob_seconds = time.perf_counter() - start
+
+    timings = {}
+    found_file_count = 0
+
+    def record_batch(batch: list[str]):
+        nonlocal found_file_count
+        timings.setdefault("first_batch", time.perf_counter() - start)
+        found_file_count += len(batch)
+
+    directory_scanner_worker = DirectoryScannerWorker(str(root))
+    directory_scanner_worker.batch_ready.connect(record_batch)
+
+    start = time.perf_counter()
+    directory_scanner_worker.run()
+    scan_seconds = time.perf_counter() - start
+
+    assert found_file_count == rglob_file_count, "The scanner should find exactly what rglob finds."
+
+    print(f"{rglob_file_count:7} files  rglob (First row after): {rglob_seconds * 1e3:8.1f} ms  "
+          f"scanner first batch: {timings.get('first_batch', 0) * 1e3:6.1f} ms  "
+          f"full scan: {scan_seconds * 1e3:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--root", type=Path, help="Scan an existing folder instead of synthetic trees.")
+    args = parser.parse_args()
+
+    if args.root is not None:
+        measure(args.root)
+        return
+
+    for size in args.sizes:
+        root = Path(tempfile.mkdtemp())
+        try:
+            make_tree(root, size)
+            measure(root)
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures how long the window freezes while a big drop of files is added. A 1 ms heartbeat timer records the gaps
+between event loop turns: the longest gap is the longest time the window couldn't repaint or react to input.
+Before, every dropped path was added in one loop, so the longest gap was the whole drop. Now paths are added
+PATH_QUEUE_TIME_BUDGET_SECONDS at a time. Both are checked to add the same rows.
+
+It's a pytest-qt module (Not collected by default, since it's named bench_*), so it gets a qtbot.
+Usage (From the project root): py -m pytest benchmarks/bench_drop_ui_stall.py -s -q
+"""
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QTimer
+from _pytest.monkeypatch import MonkeyPatch
+from pytestqt.qtbot import QtBot
+
+from backend.parse_cache import ParseCache
+from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+
+# Like selecting every file of a big library in a file manager and dropping them.
+FILE_COUNT = 5000
+
+
+class StallMeter:
+    """Records the longest gap between two ticks of a 1 ms timer, i.e., the longest the event loop was blocked."""
+
+    def __init__(self):
+        self.longest_gap = 0.0
+        self._last_tick = time.perf_counter()
+        self._timer = QTimer()
+        self._timer.setInterval(1)
+        self._timer.timeout.connect(self.tick)
+
+    def start(self):
+        self._last_tick = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self.tick()
+        self._timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.longest_gap = max(self.longest_gap, now - self._last_tick)
+        self._last_tick = now
+
+
+def _add_paths_in_one_loop(drag_and_drop_widget: DragAndDropFilesWidget, file_paths: list[str]):
+    """How dropEvent() used to add paths."""
+    for file_path in file_paths:
+        drag_and_drop_widget.add_path(file_path)
+
+
+def _measure(qtbot: QtBot, file_paths: list[str], is_time_sliced: bool) -> tuple[list[str], float, float]:
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    stall_meter = StallMeter()
+
+    stall_meter.start()
+    qtbot.wait(10)
+    start = time.perf_counter()
+    if is_time_sliced:
+        with qtbot.waitSignal(drag_and_drop_widget.path_queue_finished, timeout=600_000):
+            # A timer, so the paths are added from the event loop, like a real drop.
+            QTimer.singleShot(0, lambda: drag_and_drop_widget.add_paths(file_paths))
+    else:
+        QTimer.singleShot(0, lambda: _add_paths_in_one_loop(drag_and_drop_widget, file_paths))
+        qtbot.waitUntil(lambda: drag_and_drop_widget.count() == len(file_paths), timeout=600_000)
+    total_seconds = time.perf_counter() - start
+    stall_meter.stop()
+
+    return drag_and_drop_widget.file_names(), stall_meter.longest_gap, total_seconds
+
+
+def test_drop_ui_stall(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    library = tmp_path / "Library"
+    library.mkdir()
+    file_paths = []
+    for i in range(FILE_COUNT):
+        file_path = library / f"Show.{i // 240}.S{i // 24 % 10 + 1:02d}E{i % 24 + 1:02d}.mkv"
+        file_path.touch()
+        file_paths.append(str(file_path))
+
+    results = {}
+    for is_time_sliced in (False, True):
+        # A fresh parse cache for each, so both parse every file.
+        parse_cache = ParseCache(tmp_path / f"parse_cache_{is_time_sliced}.sqlite3")
+        monkeypatch.setattr("pages.core.drag_and_drop_files_widget.retrieve_parse_cache",
+                            lambda parse_cache=parse_cache: parse_cache)
+        monkeypatch.setattr("backend.media_record.retrieve_parse_cache", lambda parse_cache=parse_cache: parse_cache)
+        results[is_time_sliced] = _measure(qtbot, file_paths, is_time_sliced)
+
+    assert results[True][0] == results[False][0], "Time slicing should add exactly the same rows."
+
+    for is_time_sliced, (_, longest_gap, total_seconds) in results.items():
+        print(f"\n{FILE_COUNT} files  {'time-sliced' if is_time_sliced else 'one loop   '}  "
+              f"longest UI stall: {longest_gap * 1e3:9.1f} ms  total: {total_seconds:6.2f} s", end="")
@@ -0,0 +1,78 @@
+"""
+Compares the compiled ExcludedFolderMatcher against the previous prefix-scan implementation, which rebuilt and
+sorted every excluded prefix for each file.
+
+Usage (From the project root): py -m benchmarks.bench_excluded_folder_matcher [--files 50000] [--exclusions 30]
+"""
+import argparse
+import os
+import time
+
+from backend.media_record import remove_excluded_folders_from_file_path
+
+
+def retrieve_all_parent_prefixes(folder_path: str) -> set[str]:
+    """Previous implementation: the path itself plus every parent directory, all normalized."""
+    prefixes: set[str] = set()
+    current_folder = os.path.normpath(folder_path).rstrip(os.sep)
+    while current_folder and current_folder not in prefixes:
+        prefixes.add(current_folder)
+        parent = os.path.dirname(current_folder)
+
+        if parent == current_folder:
+            break
+
+        current_folder = parent
+
+    return prefixes
+
+
+def remove_excluded_folders_by_prefix_scan(file_path: str, excluded_folders: list[str]) -> str:
+    """Previous implementation of remove_excluded_folders_from_file_path()."""
+    if len(excluded_folders) == 0:
+        return file_path
+
+    prefixes: set[str] = set()
+    for folder in excluded_folders:
+        prefixes.update(retrieve_all_parent_prefixes(folder))
+
+    normalized_file_path = os.path.normpath(file_path)
+
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if normalized_file_path.lower().startswith(prefix.lower()):
+            cleaned_path = normalized_file_path[len(prefix):].lstrip(os.sep)
+            return cleaned_path.replace(os.sep, "/") if cleaned_path else ""
+
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--exclusions", type=int, default=30)
+    args = parser.parse_args()
+
+    media_root = os.path.join(os.sep, "Media")
+    excluded_folders = [os.path.join(media_root, f"Library {i}", "TV Shows") for i in range(args.exclusions)]
+    file_paths = [os.path.join(media_root, f"Library {i % args.exclusions}", "TV Shows", f"Show {i % 50}",
+                               f"Season {i % 8 + 1}", f"Show.{i % 50}.S0{i % 8 + 1}E{i % 24 + 1:02d}.mkv")
+                  for i in range(args.files)]
+
+    start = time.perf_counter()
+    legacy_results = [remove_excluded_folders_by_prefix_scan(file_path, excluded_folders) for file_path in file_paths]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trie_results = [remove_excluded_folders_from_file_path(file_path, excluded_folders) for file_path in file_paths]
+    trie_seconds = time.perf_counter() - start
+
+    assert legacy_results == trie_results, "The matcher should strip exactly what the prefix scan strips."
+
+    print(f"{args.files} files, {args.exclusions} excluded folders")
+    print(f"prefix scan: {legacy_seconds:7.3f}s  ({legacy_seconds / args.files * 1e6:7.2f} µs/file)")
+    print(f"trie:        {trie_seconds:7.3f}s  ({trie_seconds / args.files * 1e6:7.2f} µs/file)  "
+          f"speedup x{legacy_seconds / trie_seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures the throughput of guess_metadata() with and without the regex fast path on a synthetic library that
+mixes the common release shapes with names that still need guessit, e.g., episode titles and country codes.
+
+Usage (From the project root): py -m benchmarks.bench_fast_path [--files 1000]
+"""
+import argparse
+import time
+
+from backend.media_record import compact_metadata, fast_guess_metadata, guess_metadata
+from backend.settings_backend import SettingsSnapshot
+
+SHAPES = [
+    "D:/TV Shows/Show Name/Season {season}/Show.Name.S0{season}E{episode:02d}.1080p.WEB-DL.x264-GROUP.mkv",
+    "D:/TV Shows/Show Name - {season}x{episode:02d}.mkv",
+    "D:/Movies/Movie.Name.{year}.1080p.BluRay.x264-GRP.mkv",
+    "D:/Movies/Movie Name ({year}).mp4",
+    # Left to guessit.
+    "D:/TV Shows/Show Name - {season}x{episode:02d} - Episode Title.mkv",
+    "D:/TV Shows/The.Office.US.S0{season}E{episode:02d}.mkv",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000)
+    args = parser.parse_args()
+
+    file_paths = [SHAPES[i % len(SHAPES)].format(season=i % 8 + 1, episode=i % 24 + 1, year=1950 + i % 70)
+                  for i in range(args.files)]
+    settings = SettingsSnapshot()
+
+    start = time.perf_counter()
+    guessit_results = [compact_metadata(guess_metadata(file_path, settings, allow_fast_path=False))
+                       for file_path in file_paths]
+    guessit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_path_results = [compact_metadata(guess_metadata(file_path, settings)) for file_path in file_paths]
+    fast_path_seconds = time.perf_counter() - start
+
+    assert guessit_results == fast_path_results, "The fast path should produce the same metadata as guessit."
+
+    accepted_count = sum(fast_guess_metadata(file_path) is not None for file_path in file_paths)
+
+    print(f"{args.files} files, {accepted_count / args.files:.0%} taken by the fast path")
+    print(f"guessit only: {guessit_seconds:7.3f}s  ({args.files / guessit_seconds:9.0f} files/s)")
+    print(f"fast path:    {fast_path_seconds:7.3f}s  ({args.files / fast_path_seconds:9.0f} files/s)  "
+          f"speedup x{guessit_seconds / fast_path_seconds:.1f}")
+
+    start = time.perf_counter()
+    for file_path in file_paths:
+        fast_guess_metadata(file_path)
+    print(f"fast_guess_metadata() alone: {(time.perf_counter() - start) / args.files * 1e6:.1f} µs/file")
+
+
+if __name__ == "__main__":
+    main()
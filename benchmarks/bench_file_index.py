@@ -0,0 +1,74 @@
+"""
+Adds paths to a FileIndex where half are duplicates: the same paths spelled differently, and hardlinks to them.
+Before, nothing was checked, so every duplicate was parsed, matched, and renamed again. The obvious fix, checking
+the paths already in the list, is O(n) per file, so it's only timed up to --list-limit paths.
+
+Usage (From the project root): py -m benchmarks.bench_file_index [--sizes 10000 100000] [--list-limit 20000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from backend.file_index import FileIndex
+from benchmarks.bench_directory_scan import make_tree
+
+
+def make_paths(root: Path, path_count: int) -> list[str]:
+    """path_count // 2 files, then a quarter of them again with another spelling, and a quarter as hardlinks."""
+    make_tree(root / "Library", path_count // 2)
+    file_paths = sorted(str(path) for path in (root / "Library").rglob("*.mkv"))
+
+    same_paths = [os.path.join(os.path.dirname(file_path), ".", os.path.basename(file_path))
+                  for file_path in file_paths[::2]]
+
+    hardlinks = []
+    (root / "Links").mkdir()
+    for i, file_path in enumerate(file_paths[1::2]):
+        hardlink = str(root / "Links" / f"{i}.mkv")
+        os.link(file_path, hardlink)
+        hardlinks.append(hardlink)
+
+    return file_paths + same_paths + hardlinks
+
+
+def measure(file_paths: list[str], list_limit: int):
+    start = time.perf_counter()
+    file_index = FileIndex()
+    added_file_paths = [file_path for file_path in file_paths if file_index.add(file_path)]
+    file_index_seconds = time.perf_counter() - start
+
+    assert len(added_file_paths) == len(file_paths) // 2, "Every duplicate and hardlink should be skipped."
+
+    list_check = "skipped"
+    if len(file_paths) <= list_limit:
+        start = time.perf_counter()
+        listed_file_paths: list[str] = []
+        for file_path in file_paths:
+            normalized_path = FileIndex.normalize_path(file_path)
+            if normalized_path not in listed_file_paths:
+                listed_file_paths.append(normalized_path)
+        list_check = f"{(time.perf_counter() - start) * 1e3:8.1f} ms (Misses hardlinks)"
+
+    print(f"{len(file_paths):7} paths  FileIndex: {file_index_seconds * 1e3:8.1f} ms  list check: {list_check}  "
+          f"parses avoided: {len(file_paths) - len(added_file_paths)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--list-limit", type=int, default=20000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        root = Path(tempfile.mkdtemp())
+        try:
+            measure(make_paths(root, size), args.list_limit)
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
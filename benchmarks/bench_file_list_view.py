@@ -0,0 +1,111 @@
+"""
+Compares the previous QListWidget boxes, with a QListWidgetItem per row, against the FileListViews backed by
+models. For each, times filling the input and output boxes (In chunks, like parallel ingestion does), scrolling
+from top to bottom a page at a time with both boxes' scroll bars synced, and clearing them. Both boxes are checked
+to show the same rows.
+
+Usage (From the project root): py -m benchmarks.bench_file_list_view [--sizes 20000 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QListWidget, QListWidgetItem, QWidget, QHBoxLayout
+
+from backend.media_record import MediaRecord
+from backend.parallel_ingestion import CHUNK_SIZE
+from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+from pages.core.output_files_widget import OutputFilesWidget
+
+
+def make_media_records(row_count: int) -> list[MediaRecord]:
+    # Absolute paths, like the ones from a drop. The files don't need to exist.
+    tv_folder = os.path.abspath("TV")
+    return [MediaRecord(os.path.join(tv_folder, f"Show {i // 240}",
+                                     f"Show.{i // 240}.S{i // 24 % 10 + 1:02d}E{i % 24 + 1:02d}.mkv"),
+                        {"title": f"Show {i // 240}", "season": i // 24 % 10 + 1, "episode": i % 24 + 1})
+            for i in range(row_count)]
+
+
+def fill_list_widgets(left_box: QListWidget, right_box: QListWidget, media_records: list[MediaRecord]):
+    """How the boxes used to be filled: a QListWidgetItem per row, holding its MediaRecord."""
+    for media_record in media_records:
+        list_item = QListWidgetItem(media_record.file_name)
+        list_item.setData(Qt.ItemDataRole.UserRole, media_record)
+        left_box.addItem(list_item)
+    for media_record in media_records:
+        right_box.addItem(QListWidgetItem(f"{media_record.title} - {media_record.file_name}"))
+
+
+def fill_file_list_views(left_box: DragAndDropFilesWidget, right_box: OutputFilesWidget,
+                         media_records: list[MediaRecord]):
+    for i in range(0, len(media_records), CHUNK_SIZE):
+        left_box.add_media_records_to_list(media_records[i:i + CHUNK_SIZE])
+    right_box.add_file_names([f"{media_record.title} - {media_record.file_name}" for media_record in media_records])
+
+
+def measure(app: QApplication, left_box, right_box, fill, media_records: list[MediaRecord]) -> dict[str, float]:
+    window = QWidget()
+    layout = QHBoxLayout(window)
+    layout.addWidget(left_box)
+    layout.addWidget(right_box)
+    # Same as CoreRenamerWidget.
+    left_box.verticalScrollBar().valueChanged.connect(right_box.verticalScrollBar().setValue)
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+
+    timings = {}
+    start = time.perf_counter()
+    fill(left_box, right_box, media_records)
+    app.processEvents()
+    timings["fill"] = time.perf_counter() - start
+
+    scroll_bar = left_box.verticalScrollBar()
+    start = time.perf_counter()
+    page_count = 0
+    while scroll_bar.value() < scroll_bar.maximum() and page_count < 1000:
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.pageStep())
+        left_box.viewport().repaint()
+        right_box.viewport().repaint()
+        page_count += 1
+    timings["scroll page"] = (time.perf_counter() - start) / max(page_count, 1)
+
+    rows = [left_box.model().index(row, 0).data() for row in range(0, left_box.model().rowCount(), 997)]
+
+    start = time.perf_counter()
+    left_box.clear()
+    right_box.clear()
+    app.processEvents()
+    timings["clear"] = time.perf_counter() - start
+
+    window.close()
+    return timings, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 200000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+
+    for size in args.sizes:
+        media_records = make_media_records(size)
+        list_widget_timings, list_widget_rows = measure(app, QListWidget(), QListWidget(), fill_list_widgets,
+                                                        media_records)
+        file_list_view_timings, file_list_view_rows = measure(app, DragAndDropFilesWidget(), OutputFilesWidget(),
+                                                              fill_file_list_views, media_records)
+
+        assert file_list_view_rows == list_widget_rows, "Both boxes should show the same rows."
+
+        for name, timings in (("QListWidget", list_widget_timings), ("FileListView", file_list_view_timings)):
+            print(f"{size:7} rows  {name:12}  fill: {timings['fill'] * 1e3:8.1f} ms  "
+                  f"scroll: {timings['scroll page'] * 1e3:6.2f} ms/page  clear: {timings['clear'] * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
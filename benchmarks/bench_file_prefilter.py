@@ -0,0 +1,79 @@
+"""
+Measures how many guessit parses the FilePrefilter saves on a synthetic release folder, i.e., video files next to
+the usual .nfo, .srt, .jpg, sample, and Extras/ files. Also reports the prefilter's own cost per file.
+
+Usage (From the project root): py -m benchmarks.bench_file_prefilter [--releases 200] [--parse-sample 50]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from backend.directory_scanner import scan_directory
+from backend.file_prefilter import retrieve_file_prefilter
+from backend.media_record import guess_metadata
+from backend.settings_backend import SettingsSnapshot
+
+
+def make_release_folder(root: Path, release_count: int):
+    """Every release has 1 video worth parsing and 7 files that aren't."""
+    for i in range(release_count):
+        release_folder = root / f"Movie {i} (2010) 1080p BluRay x264-GROUP"
+        (release_folder / "Sample").mkdir(parents=True)
+        (release_folder / "Extras").mkdir()
+
+        (release_folder / f"movie.{i}.2010.1080p.bluray.x264-group.mkv").touch()
+        (release_folder / f"movie.{i}.2010.1080p.bluray.x264-group.nfo").touch()
+        (release_folder / f"movie.{i}.2010.1080p.bluray.x264-group.srt").touch()
+        (release_folder / f"movie.{i}.2010.1080p.bluray.x264-group-sample.mkv").touch()
+        (release_folder / "Sample" / f"movie.{i}.sample.mkv").touch()
+        (release_folder / "Extras" / "Behind the Scenes.mkv").touch()
+        (release_folder / "poster.jpg").touch()
+        (release_folder / "movie.sfv").touch()
+
+
+def measure(root: Path, parse_sample: int):
+    settings = SettingsSnapshot()
+    file_prefilter = retrieve_file_prefilter(settings)
+
+    start = time.perf_counter()
+    all_file_paths = list(scan_directory(str(root)))
+    unfiltered_scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    filtered_file_paths = list(scan_directory(str(root), file_prefilter=file_prefilter))
+    filtered_scan_seconds = time.perf_counter() - start
+
+    # Parsing every file would take minutes, so estimate the per-file cost from a sample.
+    sample_file_paths = all_file_paths[:parse_sample]
+    start = time.perf_counter()
+    for file_path in sample_file_paths:
+        guess_metadata(file_path, settings, allow_fast_path=False)
+    seconds_per_parse = (time.perf_counter() - start) / max(len(sample_file_paths), 1)
+
+    skipped_file_count = len(all_file_paths) - len(filtered_file_paths)
+    print(f"Files found: {len(all_file_paths)}  after prefilter: {len(filtered_file_paths)}  "
+          f"parses saved: {skipped_file_count} ({skipped_file_count / len(all_file_paths):.0%})")
+    print(f"Scan without prefilter: {unfiltered_scan_seconds * 1e3:.1f} ms  "
+          f"with prefilter: {filtered_scan_seconds * 1e3:.1f} ms")
+    print(f"Estimated parse time without prefilter: {len(all_file_paths) * seconds_per_parse:.1f} s  "
+          f"with prefilter: {len(filtered_file_paths) * seconds_per_parse:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--releases", type=int, default=200)
+    parser.add_argument("--parse-sample", type=int, default=50, help="Files parsed to estimate the cost per parse.")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        make_release_folder(root, args.releases)
+        measure(root, args.parse_sample)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures what a torrent landing in a watched library costs. Before, picking up the new files meant scanning the whole
+tree again. The FolderWatcher only lists the folder that changed, once, after DEBOUNCE_MILLISECONDS of quiet.
+Reports how many batches the change events were coalesced into and how long processing them took.
+
+Usage (From the project root): py -m benchmarks.bench_folder_watcher [--library-size 10000] [--torrent-size 200]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from backend.directory_scanner import scan_directory
+from backend.folder_watcher import FolderWatcher, DEBOUNCE_MILLISECONDS
+from benchmarks.bench_directory_scan import make_tree
+
+
+def measure(root: Path, torrent_size: int):
+    application = QCoreApplication.instance() or QCoreApplication([])
+    folder_watcher = FolderWatcher(str(root))
+    folder_watcher.start()
+
+    emitted_batches = []
+    folder_watcher.files_added.connect(emitted_batches.append)
+
+    # Time spent in the watcher's own work, i.e., without the debounce wait.
+    processing_seconds = 0.0
+    process_directory_changes = folder_watcher.process_directory_changes
+
+    def timed_process_directory_changes():
+        nonlocal processing_seconds
+        start = time.perf_counter()
+        process_directory_changes()
+        processing_seconds += time.perf_counter() - start
+
+    folder_watcher._debounce_timer.timeout.disconnect()  # pylint: disable=protected-access
+    folder_watcher._debounce_timer.timeout.connect(timed_process_directory_changes)  # pylint: disable=protected-access
+
+    torrent_folder = root / "New Show" / "Season 1"
+    torrent_folder.mkdir(parents=True)
+    for i in range(torrent_size):
+        (torrent_folder / f"New.Show.S01E{i + 1:03d}.mkv").touch()
+
+    QTimer.singleShot(DEBOUNCE_MILLISECONDS * 4, application.quit)
+    application.exec()
+    folder_watcher.stop()
+
+    start = time.perf_counter()
+    rescanned_file_count = sum(1 for _ in scan_directory(str(root)))
+    rescan_seconds = time.perf_counter() - start
+
+    added_file_count = sum(len(batch) for batch in emitted_batches)
+    assert added_file_count == torrent_size, "Every new file should be emitted exactly once."
+
+    print(f"{torrent_size} new files in a {rescanned_file_count} file library: {len(emitted_batches)} batch(es), "
+          f"watcher: {processing_seconds * 1e3:.1f} ms  full rescan: {rescan_seconds * 1e3:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--library-size", type=int, default=10000)
+    parser.add_argument("--torrent-size", type=int, default=200)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        make_tree(root, args.library_size)
+        measure(root, args.torrent_size)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
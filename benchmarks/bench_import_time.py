@@ -0,0 +1,80 @@
+"""
+Measures how long importing main.py takes, using the interpreter's own '-X importtime' report, and fails if it's
+over a threshold, or if a module that should only load on first use is imported at startup.
+Before, guessit, requests, and every database provider library were imported along with the Formats and Settings
+pages, before the first frame. They're imported on first use now. The previous startup is measured by importing
+those modules right after main.py.
+
+Each run is a fresh interpreter. The best of --runs is compared with --max-ms, so a noisy run doesn't fail it.
+
+Usage (From the project root): py -m benchmarks.bench_import_time [--runs 5] [--max-ms 400]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Only imported on first use (A match, a parse, or selecting the page in the menu).
+DEFERRED_MODULES = ("guessit", "requests", "tmdbsimple", "omdb", "tvmaze", "backend.response_cache",
+                    "backend.rate_limiter", "databases.themoviedb_python_db", "databases.omdb_python_db",
+                    "databases.tvmaze_python_db", "pages.formats", "pages.settings")
+
+
+def parse_import_time_report(report: str) -> dict[str, tuple[int, int]]:
+    """
+    '-X importtime' lines look like 'import time:  self [us] | cumulative | imported package', where nested imports
+    are indented under the module that imported them. Returns {module: (cumulative microseconds, nesting depth)}.
+    """
+    modules = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = (int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2)
+
+    return modules
+
+
+def measure_import_seconds(statement: str, interpreter_modules: set[str] | None = None) \
+        -> tuple[float, dict[str, tuple[int, int]]]:
+    """Imports in a fresh interpreter. Only top-level imports count, minus the ones the interpreter itself does."""
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    report = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], check=True, capture_output=True,
+                            text=True, env=environment).stderr
+    modules = parse_import_time_report(report)
+
+    microseconds = sum(cumulative for name, (cumulative, depth) in modules.items()
+                       if depth == 0 and name not in (interpreter_modules or set()))
+
+    return microseconds / 1e6, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=400, help="Fail if the best import of main.py is slower.")
+    args = parser.parse_args()
+
+    _, interpreter_modules = measure_import_seconds("pass")
+    interpreter_modules = set(interpreter_modules)
+
+    eager_statement = f"import main, {', '.join(DEFERRED_MODULES)}"
+    eager_seconds = min(measure_import_seconds(eager_statement, interpreter_modules)[0] for _ in range(args.runs))
+
+    runs = [measure_import_seconds("import main", interpreter_modules) for _ in range(args.runs)]
+    seconds = min(run_seconds for run_seconds, _ in runs)
+
+    print(f"import main (Best of {args.runs}): {eager_seconds * 1e3:7.1f} ms -> {seconds * 1e3:7.1f} ms  "
+          f"(Threshold: {args.max_ms:.0f} ms)")
+
+    imported_at_startup = sorted({name for _, modules in runs for name in modules} & set(DEFERRED_MODULES))
+    if imported_at_startup:
+        sys.exit(f"Imported at startup, but should only load on first use: {', '.join(imported_at_startup)}")
+
+    if seconds * 1e3 > args.max_ms:
+        sys.exit(f"Importing main.py took {seconds * 1e3:.1f} ms, over the {args.max_ms:.0f} ms threshold.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compares how long the user waits to see matched movies before and after streaming them from the DatabaseWorker,
+and how long cancelling takes. The database sleeps for --latency ms per request, like a movie search would.
+Before, nothing was shown until every movie was looked up, and a match couldn't be cancelled. Now every movie is
+yielded as soon as it's looked up, and cancelling stops before the next request. Both are checked to match the same
+names.
+
+Usage (From the project root): py -m benchmarks.bench_match_streaming [--movies 40] [--latency 50]
+"""
+import argparse
+import threading
+import time
+
+from backend.core_backend import iterate_matched_file_names, match_titles_using_db_and_format
+from backend.media_record import MediaRecord
+from databases.database import Database, DatabaseMatch, MatchCancelled
+
+
+class SlowMovieDB(Database):
+    """Looks up each movie with a request, like TheMovieDB and OMDB. Each request takes LATENCY_SECONDS."""
+    looks_up_movies_one_at_a_time = True
+    LATENCY_SECONDS = 0.05
+
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
+        matches = []
+        for media_record in self.media_records:
+            self.raise_if_cancelled()
+            time.sleep(self.LATENCY_SECONDS)
+            matches.append(DatabaseMatch(title=media_record.title, year=media_record.year))
+
+        return matches
+
+
+def make_media_records(movie_count: int) -> list[MediaRecord]:
+    return [MediaRecord(f"Movie {i} ({1950 + i % 70}).mkv", {"title": f"Movie {i}", "year": 1950 + i % 70,
+                                                             "container": "mkv"})
+            for i in range(movie_count)]
+
+
+def measure_cancel_seconds(media_records: list[MediaRecord]) -> float:
+    """Cancels a match halfway through from another thread, and returns how long it took to stop."""
+    database = SlowMovieDB(media_records)
+    cancelled_at = []
+
+    def _cancel_halfway():
+        time.sleep(SlowMovieDB.LATENCY_SECONDS * len(media_records) / 2)
+        cancelled_at.append(time.perf_counter())
+        database.cancel()
+
+    cancel_thread = threading.Thread(target=_cancel_halfway)
+    cancel_thread.start()
+    try:
+        for _ in iterate_matched_file_names(database):
+            pass
+    except MatchCancelled:
+        pass
+    stopped_at = time.perf_counter()
+    cancel_thread.join()
+
+    return stopped_at - cancelled_at[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds per request.")
+    args = parser.parse_args()
+
+    SlowMovieDB.LATENCY_SECONDS = args.latency / 1e3
+    media_records = make_media_records(args.movies)
+
+    start = time.perf_counter()
+    batch = match_titles_using_db_and_format(SlowMovieDB(media_records))
+    batch_seconds = time.perf_counter() - start
+
+    file_names = []
+    first_chunk_seconds = None
+    start = time.perf_counter()
+    for chunk in iterate_matched_file_names(SlowMovieDB(media_records)):
+        if first_chunk_seconds is None:
+            first_chunk_seconds = time.perf_counter() - start
+        file_names.extend(chunk.file_names)
+    streaming_seconds = time.perf_counter() - start
+
+    assert file_names == batch.file_names, "Streaming should match the same names, in the same order."
+
+    print(f"{args.movies} movies, {args.latency:.0f} ms per request")
+    print(f"  first name shown:  {batch_seconds * 1e3:8.1f} ms -> {first_chunk_seconds * 1e3:8.1f} ms")
+    print(f"  all names shown:   {batch_seconds * 1e3:8.1f} ms -> {streaming_seconds * 1e3:8.1f} ms")
+    print(f"  cancel halfway:      (Not possible) -> stopped {measure_cancel_seconds(media_records) * 1e3:.1f} ms "
+          f"after cancelling")
+
+
+if __name__ == "__main__":
+    main()
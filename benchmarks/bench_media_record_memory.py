@@ -0,0 +1,77 @@
+"""
+Uses tracemalloc to compare the memory retained by compact MediaRecords against the previous layout, which kept
+guessit's full MatchesDict plus extra copies of the path on every record.
+
+Usage (From the project root): py -m benchmarks.bench_media_record_memory [--files 1000]
+"""
+import argparse
+import gc
+import os
+import tracemalloc
+from pathlib import Path
+
+from guessit import guessit
+
+from backend.media_record import MediaRecord, guess_metadata
+from backend.settings_backend import SettingsSnapshot
+
+
+# pylint: disable=too-many-instance-attributes, too-few-public-methods
+class LegacyMediaRecord:
+    """The previous MediaRecord layout: a regular object holding the full guessit output."""
+
+    def __init__(self, file_path: str):
+        self.full_file_path = file_path
+        self.file_name = os.path.basename(file_path)
+        self.metadata = guessit(file_path)
+        self.media_type = self.metadata.get("type")
+        self.title = self.metadata.get("title")
+        self.year = self.metadata.get("year")
+        self.container = Path(file_path).suffix.lstrip(".")
+        self.is_absolute_order = False
+
+
+def measure_retained_bytes(create_record, file_paths: list[str]) -> int:
+    """Bytes still allocated after building (And keeping) a record for every file path."""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    records = [create_record(file_path) for file_path in file_paths]
+
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del records
+    return retained - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000)
+    args = parser.parse_args()
+
+    file_paths = [f"D:/Media/TV/Show Name {i % 40}/Season {i % 6 + 1}/"
+                  f"Show.Name.{i % 40}.S0{i % 6 + 1}E{i % 24 + 1:02d}.Episode.{i}.1080p.WEB-DL.DD5.1.x264-GROUP.mkv"
+                  for i in range(args.files)]
+    settings = SettingsSnapshot()
+
+    # Build guessit's rules before measuring, so they aren't counted against the first run.
+    guessit(file_paths[0])
+
+    legacy_bytes = measure_retained_bytes(LegacyMediaRecord, file_paths)
+    # Metadata is handed in directly, so the (Disk) parse cache doesn't affect the measurement.
+    compact_bytes = measure_retained_bytes(
+        lambda file_path: MediaRecord(file_path, guess_metadata(file_path, settings)), file_paths)
+
+    print(f"{args.files} records")
+    print(f"legacy:  {legacy_bytes / args.files:8.0f} bytes/record  "
+          f"(~{legacy_bytes / args.files * 100_000 / 2 ** 20:6.0f} MiB per 100k files)")
+    print(f"compact: {compact_bytes / args.files:8.0f} bytes/record  "
+          f"(~{compact_bytes / args.files * 100_000 / 2 ** 20:6.0f} MiB per 100k files)  "
+          f"reduction x{legacy_bytes / compact_bytes:.1f}")
+
+
+if __name__ == "__main__":
+    main()
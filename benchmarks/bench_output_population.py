@@ -0,0 +1,117 @@
+"""
+Compares filling the output box with matched file names before and after bulk population.
+Before, titles were formatted with a {None} marker (Reading the format from disk per file), and then the GUI thread
+searched every title for the marker, built a QListWidgetItem per title, highlighted it, and added it one row at a
+time. Now the names and missing-field flags are ready when the DatabaseWorker is done, and the GUI thread only does
+one model update. Both are checked to show the same names and highlights.
+
+Usage (From the project root): py -m benchmarks.bench_output_population [--sizes 5000 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication, QListWidget, QListWidgetItem
+
+from backend.core_backend import create_formatted_title, match_titles_using_db_and_format
+from backend.formats_backend import retrieve_series_format_from_formats_file
+from backend.media_record import MediaRecord
+from databases.file_name_match_db import FileNameMatchDB
+from pages.core.output_files_widget import OutputFilesWidget
+
+
+def make_database(row_count: int) -> FileNameMatchDB:
+    """Episodes of a long-running show. Every 10th one has no episode title, so its name is highlighted."""
+    return FileNameMatchDB([MediaRecord(f"Show.S{i // 100 + 1:02d}E{i % 100 + 1:02d}.mkv",
+                                        {"title": "Show", "type": "episode", "season": i // 100 + 1,
+                                         "episode": i % 100 + 1, "container": "mkv",
+                                         "episode_title": None if i % 10 == 0 else f"Episode {i}"})
+                            for i in range(row_count)], is_tv_series=True)
+
+
+def legacy_match_titles(database: FileNameMatchDB) -> list[str]:
+    """The DatabaseWorker's previous formatting, for episodes: {None} marks a missing value."""
+    matched_titles = database.retrieve_media_titles_from_db()
+    matched_years = database.retrieve_media_years_from_db()
+
+    formatted_titles = []
+    for i, media_record in enumerate(database.media_records):
+        series_context = {"series_name": media_record.title, "year": matched_years[i],
+                          "season_number": f"{int(media_record.metadata['season']):02d}",
+                          "episode_number": f"{int(media_record.metadata['episode']):02d}",
+                          "episode_title": matched_titles[i]}
+        formatted_title = create_formatted_title(retrieve_series_format_from_formats_file(), series_context)
+        formatted_titles.append(f"{formatted_title}.{media_record.container}")
+
+    return formatted_titles
+
+
+def legacy_populate_output_box(output_box: QListWidget, matched_media_titles: list[str]):
+    """MatchOptionsWidget.populate_output_box(), before."""
+    for title in matched_media_titles:
+        list_item = QListWidgetItem()
+
+        if "{None}" in title:
+            title = title.replace("{None}", "")
+            list_item.setBackground(QColor(255, 80, 80))
+
+        list_item.setText(title)
+        output_box.addItem(list_item)
+
+
+def measure(app: QApplication, row_count: int):
+    database = make_database(row_count)
+
+    start = time.perf_counter()
+    legacy_titles = legacy_match_titles(database)
+    legacy_format_seconds = time.perf_counter() - start
+
+    list_widget = QListWidget()
+    list_widget.show()
+    start = time.perf_counter()
+    legacy_populate_output_box(list_widget, legacy_titles)
+    app.processEvents()
+    legacy_gui_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched_file_names = match_titles_using_db_and_format(database)
+    format_seconds = time.perf_counter() - start
+
+    output_files_widget = OutputFilesWidget()
+    output_files_widget.show()
+    start = time.perf_counter()
+    output_files_widget.add_file_names(matched_file_names.file_names, matched_file_names.has_missing_fields)
+    app.processEvents()
+    gui_seconds = time.perf_counter() - start
+
+    assert output_files_widget.file_names() == [list_widget.item(i).text() for i in range(list_widget.count())], \
+        "Both output boxes should show the same names."
+    assert matched_file_names.has_missing_fields == \
+           [list_widget.item(i).background().style() != Qt.BrushStyle.NoBrush for i in range(list_widget.count())], \
+           "Both output boxes should highlight the same names."
+
+    print(f"{row_count:6} rows  formatting (Off the GUI thread): {legacy_format_seconds * 1e3:8.1f} ms -> "
+          f"{format_seconds * 1e3:7.1f} ms  GUI thread: {legacy_gui_seconds * 1e3:8.1f} ms -> "
+          f"{gui_seconds * 1e3:6.1f} ms")
+
+    list_widget.close()
+    output_files_widget.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+
+    for size in args.sizes:
+        measure(app, size)
+
+
+if __name__ == "__main__":
+    main()
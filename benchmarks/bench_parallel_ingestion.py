@@ -0,0 +1,73 @@
+"""
+Compares parsing a synthetic library on one core against parse_file_paths_in_parallel() with 1..N worker processes.
+
+Usage (From the project root): py -m benchmarks.bench_parallel_ingestion [--files 10000] [--max-workers 8]
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.media_record import guess_metadata
+from backend.parallel_ingestion import parse_file_paths_in_parallel
+from backend.settings_backend import SettingsSnapshot
+
+
+def create_synthetic_library(number_of_files: int) -> list[str]:
+    """Paths of a fake TV/movie library. The files don't need to exist since only the paths are parsed."""
+    file_paths = []
+
+    for i in range(number_of_files):
+        if i % 4 == 0:
+            file_paths.append(f"D:/Media/Movies/Movie Title {i} ({1950 + i % 75})/Movie.Title.{i}.1080p.BluRay.mkv")
+        else:
+            show, season, episode = i % 97, i % 9 + 1, i % 24 + 1
+            file_paths.append(f"D:/Media/TV/Show Name {show}/Season {season}/"
+                              f"Show.Name.{show}.S{season:02d}E{episode:02d}.720p.WEB-DL.x264-GROUP.mkv")
+
+    return file_paths
+
+
+def run_parallel(file_paths: list[str], max_workers: int) -> float:
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # Start (And warm up) every worker before timing, since the shared pool in the app is long-lived.
+        list(parse_file_paths_in_parallel(file_paths[:max_workers], SettingsSnapshot(), executor))
+
+        start = time.perf_counter()
+        for _ in parse_file_paths_in_parallel(file_paths, SettingsSnapshot(), executor):
+            pass
+
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    file_paths = create_synthetic_library(args.files)
+
+    # Warm up guessit in this process too, so rule building isn't counted against the sequential run.
+    guess_metadata(file_paths[0], SettingsSnapshot())
+    start = time.perf_counter()
+    for file_path in file_paths:
+        guess_metadata(file_path, SettingsSnapshot())
+    sequential_seconds = time.perf_counter() - start
+
+    print(f"{args.files} files on {os.cpu_count()} CPU core(s)")
+    print(f"sequential:  {sequential_seconds:8.2f}s  {args.files / sequential_seconds:8.0f} files/s")
+
+    # Powers of two up to (And including) the requested maximum.
+    worker_counts = sorted({2 ** i for i in range(args.max_workers.bit_length()) if 2 ** i <= args.max_workers}
+                           | {args.max_workers})
+
+    for max_workers in worker_counts:
+        parallel_seconds = run_parallel(file_paths, max_workers)
+        print(f"{max_workers:2d} workers:  {parallel_seconds:8.2f}s  {args.files / parallel_seconds:8.0f} files/s  "
+              f"speedup x{sequential_seconds / parallel_seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
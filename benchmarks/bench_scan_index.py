@@ -0,0 +1,66 @@
+"""
+Compares re-dropping an unchanged folder before and after the scan index. Before, every file was stat'd and looked
+up in the parse cache with its own query (And commit, to update last_used). Now the whole tree is read with one
+query and compared against the stats os.scandir() already has. Results are checked to be the same.
+
+Usage (From the project root): py -m benchmarks.bench_scan_index [--sizes 1000 10000]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from backend.directory_scanner import DirectoryScannerWorker, scan_directory
+from backend.parse_cache import ParseCache
+from backend.scan_index import DirectoryScanIndex
+from backend.settings_backend import SettingsSnapshot
+from benchmarks.bench_directory_scan import make_tree
+
+
+def measure(root: Path, parse_cache: ParseCache):
+    settings = SettingsSnapshot()
+
+    # Fill the cache, as if the folder was dropped once already.
+    for file_path in scan_directory(str(root)):
+        parse_cache.put(ParseCache.create_key(file_path, settings), {"title": Path(file_path).stem})
+
+    start = time.perf_counter()
+    legacy_metadata = {file_path: parse_cache.get(ParseCache.create_key(file_path, settings))
+                       for file_path in scan_directory(str(root))}
+    legacy_seconds = time.perf_counter() - start
+
+    scanned_files = []
+    scan_reports = []
+    directory_scanner_worker = DirectoryScannerWorker(str(root), scan_index=DirectoryScanIndex(
+        str(root), settings, parse_cache))
+    directory_scanner_worker.batch_ready.connect(scanned_files.extend)
+    directory_scanner_worker.scan_report_ready.connect(scan_reports.append)
+
+    start = time.perf_counter()
+    directory_scanner_worker.run()
+    scan_index_seconds = time.perf_counter() - start
+
+    assert {scanned_file.path: scanned_file.metadata for scanned_file in scanned_files} == legacy_metadata, \
+        "The scan index should reuse exactly what the per-file lookups find."
+
+    print(f"{len(legacy_metadata):7} files  per-file lookups: {legacy_seconds * 1e3:8.1f} ms  "
+          f"scan index: {scan_index_seconds * 1e3:8.1f} ms  ({scan_reports[0]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        root = Path(tempfile.mkdtemp())
+        try:
+            make_tree(root / "Library", size)
+            measure(root / "Library", ParseCache(root / "parse_cache.sqlite3"))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
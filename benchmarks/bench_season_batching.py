@@ -0,0 +1,115 @@
+"""
+Compares how many requests matching a long-running series in absolute order takes with TheMovieDB, and how long they
+take, before and after loading its seasons with append_to_response. The database is a stand-in for tmdbsimple that
+sleeps for --latency ms per request, and counts them.
+Before, the series' info was requested, and then every season by itself (max_concurrent_season_lookups at a time).
+Now the series' info and up to 20 seasons come back in each request, so n seasons take ceil(n / 20) requests. Both
+are checked to match the same episode titles.
+
+Usage (From the project root): py -m benchmarks.bench_season_batching [--seasons 45] [--latency 50]
+"""
+import argparse
+import threading
+import time
+from functools import partial
+
+import tmdbsimple as tmdb
+
+from backend.concurrent_lookup import iterate_lookups_in_order
+from databases.themoviedb_python_db import TheMovieDBPythonDB, _create_episode_lookup, _retrieve_season_episodes
+
+EPISODES_PER_SEASON = 12
+
+
+class FakeTMDB:
+    """Answers requests after LATENCY_SECONDS, and counts them. Every season has EPISODES_PER_SEASON episodes."""
+    LATENCY_SECONDS = 0.05
+    SEASON_COUNT = 45
+    request_count = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def request(cls):
+        with cls._lock:
+            cls.request_count += 1
+        time.sleep(cls.LATENCY_SECONDS)
+
+    @classmethod
+    def create_season(cls, season_number: int) -> dict:
+        return {"episodes": [{"episode_number": episode_number, "name": f"{season_number}x{episode_number:02d}"}
+                             for episode_number in range(1, EPISODES_PER_SEASON + 1)]}
+
+
+class FakeTV:
+    """tmdb.TV. Appends the seasons asked for with append_to_response."""
+
+    def __init__(self, _series_id: int):
+        pass
+
+    def info(self, append_to_response: str = "") -> dict:
+        FakeTMDB.request()
+        appended_season_numbers = [int(appended.split("/")[1]) for appended in append_to_response.split(",")
+                                   if appended.startswith("season/")]
+
+        return {"number_of_seasons": FakeTMDB.SEASON_COUNT} | {
+            f"season/{season_number}": FakeTMDB.create_season(season_number)
+            for season_number in appended_season_numbers if season_number <= FakeTMDB.SEASON_COUNT}
+
+
+class FakeTVSeasons:
+    """tmdb.TV_Seasons."""
+
+    def __init__(self, _series_id: int, season_number: int):
+        self.season_number = season_number
+
+    def info(self) -> dict:
+        FakeTMDB.request()
+        return FakeTMDB.create_season(self.season_number)
+
+
+def legacy_create_episode_lookup(series_id: int, max_workers: int) -> dict[(int, int), str]:
+    """_create_episode_lookup() in absolute order, before: the series' info, and then every season by itself."""
+    number_of_total_seasons = int(tmdb.TV(series_id).info().get("number_of_seasons", 1))
+    seasons = iterate_lookups_in_order(partial(_retrieve_season_episodes, series_id, cancel_event=threading.Event()),
+                                       range(1, number_of_total_seasons + 1), max_workers)
+
+    episode_names = [episode_info.get("name") for episode_info_list in seasons for episode_info in episode_info_list]
+    return {(1, episode_number): name for episode_number, name in enumerate(episode_names, start=1)}
+
+
+def measure(function) -> tuple[dict, float, int]:
+    FakeTMDB.request_count = 0
+    start = time.perf_counter()
+    episode_lookup = function()
+
+    return episode_lookup, time.perf_counter() - start, FakeTMDB.request_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seasons", type=int, default=45)
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds per request.")
+    args = parser.parse_args()
+
+    FakeTMDB.LATENCY_SECONDS = args.latency / 1e3
+    FakeTMDB.SEASON_COUNT = args.seasons
+    tmdb.TV = FakeTV
+    tmdb.TV_Seasons = FakeTVSeasons
+    max_workers = TheMovieDBPythonDB.max_concurrent_season_lookups
+
+    legacy_episode_lookup, legacy_seconds, legacy_request_count = measure(
+        lambda: legacy_create_episode_lookup(1, max_workers))
+    episode_lookup, seconds, request_count = measure(
+        lambda: _create_episode_lookup(1, set(), is_absolute_order=True, max_workers=max_workers))
+
+    assert episode_lookup == legacy_episode_lookup, "Both should match the same episode titles."
+    assert len(episode_lookup) == args.seasons * EPISODES_PER_SEASON
+
+    print(f"{args.seasons} seasons in absolute order, {args.latency:.0f} ms per request, "
+          f"{max_workers} requests at once")
+    print(f"  requests: {legacy_request_count:8} -> {request_count:8}")
+    print(f"  time:     {legacy_seconds * 1e3:8.1f} ms -> {seconds * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
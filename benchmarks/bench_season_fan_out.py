@@ -0,0 +1,141 @@
+"""
+Compares how long matching an anime in absolute order takes with TheMovieDB and OMDB, before and after fetching its
+seasons concurrently. The databases are stand-ins for tmdbsimple and the omdb client that sleep for --latency ms per
+request. Absolute order needs every season of the series, so the series has --seasons seasons.
+Before, each season was fetched after the previous one was done. Now up to max_concurrent_season_lookups seasons are
+fetched at once and merged in season order. Both are checked to match the same episode titles.
+
+Usage (From the project root): py -m benchmarks.bench_season_fan_out [--seasons 20] [--latency 50]
+"""
+import argparse
+import time
+
+import tmdbsimple as tmdb
+
+from backend.media_record import MediaRecord
+from databases import omdb_python_db, themoviedb_python_db
+from databases.database import Database
+from databases.omdb_python_db import OMDBPythonDB
+from databases.themoviedb_python_db import TheMovieDBPythonDB
+
+EPISODES_PER_SEASON = 12
+
+
+class FakeProvider:
+    """Answers requests after LATENCY_SECONDS. Every season of the series has EPISODES_PER_SEASON episodes."""
+    LATENCY_SECONDS = 0.05
+    SEASON_COUNT = 20
+
+    @classmethod
+    def request(cls):
+        time.sleep(cls.LATENCY_SECONDS)
+
+    @classmethod
+    def create_episode_names(cls, season_number: int) -> list[str]:
+        return [f"{season_number}x{episode_number:02d}" for episode_number in range(1, EPISODES_PER_SEASON + 1)]
+
+
+class FakeSearch:
+    """tmdb.Search."""
+
+    def tv(self, query: str) -> dict:
+        FakeProvider.request()
+        return {"results": [{"id": 1, "name": query, "first_air_date": "2009-04-05"}]}
+
+
+class FakeTV:
+    """tmdb.TV. It doesn't append seasons, so TMDB's seasons are fetched one at a time (See bench_season_batching)."""
+
+    def __init__(self, _series_id: int):
+        pass
+
+    def info(self, **_) -> dict:
+        FakeProvider.request()
+        return {"number_of_seasons": FakeProvider.SEASON_COUNT}
+
+
+class FakeTVSeasons:
+    """tmdb.TV_Seasons."""
+
+    def __init__(self, _series_id: int, season_number: int):
+        self.season_number = season_number
+
+    def info(self) -> dict:
+        FakeProvider.request()
+        return {"episodes": [{"episode_number": episode_number, "name": name} for episode_number, name
+                             in enumerate(FakeProvider.create_episode_names(self.season_number), start=1)]}
+
+
+class FakeOMDBClient:
+    """omdb.OMDBClient."""
+
+    def __init__(self, **_):
+        pass
+
+    def set_default(self, key, default):
+        pass
+
+    def get(self, title: str, year: int | None = None, season: int | None = None) -> dict:
+        FakeProvider.request()
+        if season is None:
+            return {"title": title, "year": year or "2009–2010", "total_seasons": str(FakeProvider.SEASON_COUNT)}
+
+        return {"episodes": [{"episode": episode_number, "title": name} for episode_number, name
+                             in enumerate(FakeProvider.create_episode_names(season), start=1)]}
+
+
+def measure(database_class: type[Database], media_records: list[MediaRecord]) -> str:
+    class SequentialDatabase(database_class):
+        """database_class, before: one season at a time."""
+        max_concurrent_season_lookups = 1
+
+    start = time.perf_counter()
+    sequential_matches = SequentialDatabase(media_records, True).retrieve_matches_from_db()
+    sequential_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = database_class(media_records, True).retrieve_matches_from_db()
+    seconds = time.perf_counter() - start
+
+    assert matches == sequential_matches, "Both should match the same episode titles."
+    assert [match.episode_title for match in matches] == \
+           [name for season_number in range(1, FakeProvider.SEASON_COUNT + 1)
+            for name in FakeProvider.create_episode_names(season_number)], "Episodes should be numbered in order."
+
+    return (f"{sequential_seconds * 1e3:8.1f} ms -> {seconds * 1e3:8.1f} ms  "
+            f"({database_class.max_concurrent_season_lookups} seasons at once)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seasons", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds per request.")
+    args = parser.parse_args()
+
+    FakeProvider.LATENCY_SECONDS = args.latency / 1e3
+    FakeProvider.SEASON_COUNT = args.seasons
+    tmdb.API_KEY = "BENCHMARK"
+    tmdb.Search = FakeSearch
+    tmdb.TV = FakeTV
+    tmdb.TV_Seasons = FakeTVSeasons
+    omdb_python_db.OMDBClient = FakeOMDBClient
+    omdb_python_db.retrieve_omdb_key = lambda: "BENCHMARK"
+    # No response cache, so every request reaches the stand-ins.
+    themoviedb_python_db.retrieve_cached_session = lambda: None
+    omdb_python_db.retrieve_cached_session = lambda: None
+
+    media_records = []
+    for episode_number in range(1, args.seasons * EPISODES_PER_SEASON + 1):
+        media_record = MediaRecord(f"Anime.E{episode_number:03d}.mkv", {"title": "Anime", "type": "episode",
+                                                                          "episode": episode_number,
+                                                                          "container": "mkv"})
+        media_record.is_absolute_order = True
+        media_records.append(media_record)
+
+    print(f"{len(media_records)} episodes in absolute order, {args.seasons} seasons, {args.latency:.0f} ms per request")
+    print(f"  TheMovieDB: {measure(TheMovieDBPythonDB, media_records)}")
+    print(f"  OMDB:       {measure(OMDBPythonDB, media_records)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares guess_metadata() against the previous implementation, which always parsed the file name a second time
+to fill in a missing season or episode, even when the full path parse already found both.
+
+Usage (From the project root): py -m benchmarks.bench_single_parse [--files 500]
+"""
+import argparse
+import os
+import time
+
+from guessit import guessit
+
+from backend import media_record
+from backend.media_record import guess_metadata, remove_excluded_folders_from_file_path
+from backend.settings_backend import SettingsSnapshot
+
+
+def guess_metadata_with_two_parses(file_path: str, settings: SettingsSnapshot) -> dict:
+    """Previous implementation of guess_metadata()."""
+    file_name = os.path.basename(file_path)
+
+    metadata = dict(guessit(remove_excluded_folders_from_file_path(file_path, settings.excluded_folders))
+                    if not settings.use_only_filename_for_analysis
+                    else guessit(file_name))
+
+    file_name_metadata: dict = guessit(file_name)
+    for field in ("season", "episode"):
+        if metadata.get(field) is None and file_name_metadata.get(field) is not None:
+            metadata[field] = file_name_metadata.get(field)
+
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=500)
+    args = parser.parse_args()
+
+    file_paths = [os.path.join(os.sep, "TV Shows", f"Show {i % 20}", f"Season {i % 8 + 1}",
+                               f"Show.{i % 20}.S0{i % 8 + 1}E{i % 24 + 1:02d}.1080p.WEB-DL.mkv")
+                  for i in range(args.files)]
+
+    for settings in (SettingsSnapshot(), SettingsSnapshot(use_only_filename_for_analysis=True)):
+        media_record._guess_file_name_metadata.cache_clear()  # pylint: disable=protected-access
+
+        start = time.perf_counter()
+        two_parse_results = [guess_metadata_with_two_parses(file_path, settings) for file_path in file_paths]
+        two_parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single_parse_results = [guess_metadata(file_path, settings) for file_path in file_paths]
+        single_parse_seconds = time.perf_counter() - start
+
+        assert two_parse_results == single_parse_results, "Skipping the second parse shouldn't change any metadata."
+
+        print(f"{args.files} episodes, use_only_filename_for_analysis={settings.use_only_filename_for_analysis}")
+        print(f"two parses:   {two_parse_seconds:7.3f}s  ({two_parse_seconds / args.files * 1e3:6.2f} ms/file)")
+        print(f"single parse: {single_parse_seconds:7.3f}s  ({single_parse_seconds / args.files * 1e3:6.2f} ms/file)  "
+              f"speedup x{two_parse_seconds / single_parse_seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Compares how many requests matching with TheMovieDB takes, and how long they take, before and after resolving each
+record once. The database is a stand-in for tmdbsimple that sleeps for --latency ms per request, and counts them.
+Before, the titles were looked up and then the years, so movies without a year and series without a year were
+searched for twice. Now the title and the year come from one search. Both are checked to match the same titles and
+years. Either way, the series' seasons come with its TV details request (See bench_season_batching).
+
+Usage (From the project root): py -m benchmarks.bench_single_pass_match [--movies 40] [--seasons 5] [--latency 50]
+"""
+import argparse
+import time
+
+import tmdbsimple as tmdb
+
+from backend.media_record import MediaRecord
+from databases import themoviedb_python_db
+from databases.themoviedb_python_db import TheMovieDBPythonDB
+
+
+class FakeTMDB:
+    """
+    Answers tmdb.Search, tmdb.TV, and tmdb.TV_Seasons requests after LATENCY_SECONDS, and counts them. The series has
+    SEASON_COUNT seasons of 10 episodes.
+    """
+    LATENCY_SECONDS = 0.05
+    SEASON_COUNT = 5
+    request_count = 0
+
+    @classmethod
+    def request(cls):
+        cls.request_count += 1
+        time.sleep(cls.LATENCY_SECONDS)
+
+    @classmethod
+    def create_season(cls, season_number: int) -> dict:
+        return {"episodes": [{"episode_number": episode_number, "name": f"{season_number}x{episode_number}"}
+                             for episode_number in range(1, 11)]}
+
+
+class FakeSearch:
+    """tmdb.Search. Every query has one listing."""
+
+    def movie(self, query: str) -> dict:
+        FakeTMDB.request()
+        return {"results": [{"id": hash(query) % 100000, "title": query, "release_date": "1999-03-31"}]}
+
+    def tv(self, query: str) -> dict:
+        FakeTMDB.request()
+        return {"results": [{"id": hash(query) % 100000, "name": query, "first_air_date": "2011-04-17"}]}
+
+
+class FakeTV:
+    """tmdb.TV. Appends the seasons asked for with append_to_response."""
+
+    def __init__(self, _series_id: int):
+        pass
+
+    def info(self, append_to_response: str = "") -> dict:
+        FakeTMDB.request()
+        response = {"number_of_seasons": FakeTMDB.SEASON_COUNT}
+        for season_number in range(1, FakeTMDB.SEASON_COUNT + 1):
+            if f"season/{season_number}" in append_to_response.split(","):
+                response[f"season/{season_number}"] = FakeTMDB.create_season(season_number)
+
+        return response
+
+
+class FakeTVSeasons:
+    """tmdb.TV_Seasons. Only used for seasons that FakeTV left out."""
+
+    def __init__(self, _series_id: int, season_number: int):
+        self.season_number = season_number
+
+    def info(self) -> dict:
+        FakeTMDB.request()
+        return FakeTMDB.create_season(self.season_number)
+
+
+def legacy_retrieve_media_years_from_db(database: TheMovieDBPythonDB) -> list[int | None]:
+    """TheMovieDBPythonDB.retrieve_media_years_from_db(), before. It searched again for records without a year."""
+    if database.is_tv_series:
+        if database.media_records[0].year is not None:
+            return [database.media_records[0].year] * len(database.media_records)
+
+        listing_date = list(tmdb.Search().tv(query=database.media_records[0].title)["results"])[0]["first_air_date"]
+        return [int(listing_date[:4])] * len(database.media_records)
+
+    release_years = []
+    for media_record in database.media_records:
+        if media_record.year is not None:
+            release_years.append(media_record.year)
+            continue
+
+        listing_date = list(tmdb.Search().movie(query=media_record.title)["results"])[0]["release_date"]
+        release_years.append(int(listing_date[:4]))
+
+    return release_years
+
+
+def measure(media_records: list[MediaRecord], is_tv_series: bool) -> str:
+    FakeTMDB.request_count = 0
+    start = time.perf_counter()
+    database = TheMovieDBPythonDB(media_records, is_tv_series)
+    legacy_titles = database.retrieve_media_titles_from_db()
+    legacy_years = legacy_retrieve_media_years_from_db(database)
+    legacy_seconds = time.perf_counter() - start
+    legacy_request_count = FakeTMDB.request_count
+
+    FakeTMDB.request_count = 0
+    start = time.perf_counter()
+    database_matches = TheMovieDBPythonDB(media_records, is_tv_series).retrieve_matches_from_db()
+    seconds = time.perf_counter() - start
+
+    assert [match.episode_title if is_tv_series else match.title for match in database_matches] == legacy_titles, \
+        "Both should match the same titles."
+    assert [match.year for match in database_matches] == legacy_years, "Both should match the same years."
+
+    return (f"requests: {legacy_request_count:4} -> {FakeTMDB.request_count:4}  "
+            f"time: {legacy_seconds * 1e3:8.1f} ms -> {seconds * 1e3:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=40)
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=50, help="Milliseconds per request.")
+    args = parser.parse_args()
+
+    FakeTMDB.LATENCY_SECONDS = args.latency / 1e3
+    FakeTMDB.SEASON_COUNT = args.seasons
+    tmdb.API_KEY = "BENCHMARK"
+    tmdb.Search = FakeSearch
+    tmdb.TV = FakeTV
+    tmdb.TV_Seasons = FakeTVSeasons
+    # No response cache, so every request reaches the stand-in.
+    themoviedb_python_db.retrieve_cached_session = lambda: None
+
+    movies = [MediaRecord(f"Movie {i}.mkv", {"title": f"Movie {i}", "container": "mkv"}) for i in range(args.movies)]
+    episodes = [MediaRecord(f"Show.S{season:02d}E{episode:02d}.mkv",
+                            {"title": "Show", "type": "episode", "season": season, "episode": episode,
+                             "container": "mkv"})
+                for season in range(1, args.seasons + 1) for episode in range(1, 11)]
+
+    print(f"{args.latency:.0f} ms per request")
+    print(f"  {f'{args.movies} movies without a year:':42} {measure(movies, False)}")
+    print(f"  {f'{len(episodes)} episodes of a series without a year:':42} {measure(episodes, True)}")
+
+
+if __name__ == "__main__":
+    main()
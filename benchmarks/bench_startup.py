@@ -0,0 +1,99 @@
+"""
+Measures application startup: time to the main window's first paint, and time until the first file (Added right
+after that paint) shows up as a parsed record. Also reports how long adding that file blocked the UI thread.
+Each run is a fresh interpreter, so guessit always starts cold.
+
+Usage (From the project root): py -m benchmarks.bench_startup [--runs 3]
+"""
+import time
+
+START = time.perf_counter()
+
+# pylint: disable=wrong-import-position
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+# pylint: disable=import-outside-toplevel,too-many-locals
+def measure_startup(warm_up: bool) -> dict:
+    """Runs in the child process. Returns the timings in seconds since the interpreter started importing."""
+    # Imported here, so importing them is part of what's measured.
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    import main as application
+    from backend import parse_cache
+    from backend.guessit_warm_up import retrieve_guessit_warm_up
+    from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+
+    timings = {}
+    temp_dir = Path(tempfile.mkdtemp())
+    # Keep the user's parse cache out of this. A cache hit would skip guessit entirely.
+    parse_cache._parse_cache = parse_cache.ParseCache(temp_dir / "parse_cache.sqlite3")  # pylint: disable=protected-access
+    # Not a shape the regex fast path takes, so the file really goes through guessit.
+    file_path = temp_dir / "The Office US - S01E02 - Diversity Day.mkv"
+    file_path.touch()
+
+    app = QApplication(sys.argv)
+    main_window = application.MainWindow()
+    input_box = main_window.findChild(DragAndDropFilesWidget)
+
+    def add_file():
+        start = time.perf_counter()
+        input_box.add_paths([str(file_path)])
+        timings["ui_blocked"] = time.perf_counter() - start
+
+    def record_first_parsed_record():
+        timings.setdefault("first_parsed_record", time.perf_counter() - START)
+        app.quit()
+
+    class FirstPaintFilter(QObject):
+        """Records when the main window is first painted, then adds the file."""
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and "first_paint" not in timings:
+                timings["first_paint"] = time.perf_counter() - START
+                QTimer.singleShot(0, add_file)
+            return super().eventFilter(watched, event)
+
+    paint_filter = FirstPaintFilter()
+    main_window.installEventFilter(paint_filter)
+    input_box.model().rowsInserted.connect(record_first_parsed_record)
+
+    main_window.show()
+    # Same as main.py.
+    if warm_up:
+        QTimer.singleShot(0, retrieve_guessit_warm_up().start)
+
+    app.exec()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=["cold", "warm-up"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(measure_startup(args.child == "warm-up")))
+        return
+
+    for mode in ("cold", "warm-up"):
+        runs = [json.loads(subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                                          check=True, capture_output=True, text=True).stdout.splitlines()[-1])
+                for _ in range(args.runs)]
+
+        def best(key: str, timings_list: list[dict] = runs) -> float:
+            return min(timings[key] for timings in timings_list) * 1e3
+
+        print(f"{mode:8} first paint: {best('first_paint'):7.1f} ms  "
+              f"first parsed record: {best('first_parsed_record'):7.1f} ms  "
+              f"UI blocked by the first file: {best('ui_blocked'):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
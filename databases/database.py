@@ -1,36 +1,115 @@
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
 from backend.media_record import MediaRecord
+from backend.media_record_collection import MediaRecordCollection
+
+
+class MatchCancelled(Exception):
+    """Raised by a Database before its next request, once it's cancelled."""
+
+
+@dataclass(frozen=True)
+class DatabaseMatch:
+    """
+    What a database matched for one MediaRecord. Any field that wasn't found is None.
+
+    provider_id is the matched movie's or series' id in the database (E.g., a TMDB id or an IMDb id).
+    episode_title is only set for episodes.
+    """
+    provider_id: int | str | None = None
+    title: str | None = None
+    year: int | None = None
+    episode_title: str | None = None
 
 
 class Database(ABC):
-    """Abstract class to interact with a database and return data."""
+    """
+    Abstract class to interact with a database and return data.
+
+    Implementations call raise_if_cancelled() before every request, so a match can be cancelled from another thread.
+    """
+
+    # True if every movie is looked up with its own requests. Matching movies one at a time then costs no extra
+    # requests, and each one can be shown as soon as it's matched (See iterate_matched_file_names()).
+    looks_up_movies_one_at_a_time = False
 
-    def __init__(self, media_records: list[MediaRecord], is_tv_series: bool = False):
-        self.media_records = media_records
+    # How many movies are looked up at the same time, if they're looked up one at a time. The requests still go
+    # through the provider's rate limiter (See PROVIDER_RATE_LIMITS).
+    max_concurrent_lookups = 1
+
+    # How many seasons of a series are fetched at the same time, for databases that fetch them one at a time.
+    max_concurrent_season_lookups = 1
+
+    def __init__(self, media_records: list[MediaRecord] | MediaRecordCollection, is_tv_series: bool = False):
+        self.media_records = media_records if isinstance(media_records, MediaRecordCollection) \
+            else MediaRecordCollection(media_records)
         self.is_tv_series = is_tv_series
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Thread-safe. The next raise_if_cancelled() raises MatchCancelled."""
+        self.cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def raise_if_cancelled(self):
+        raise_if_cancelled(self.cancel_event)
+
+    def for_media_records(self, media_records: list[MediaRecord]) -> "Database":
+        """A database of the same kind for some of the MediaRecords. Cancelling this one cancels it too."""
+        database = type(self)(media_records, self.is_tv_series)
+        database.cancel_event = self.cancel_event
+
+        return database
 
     @abstractmethod
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
+        """
+        Looks up every MediaRecord in self.media_records once, and returns what was matched for each one. Each match
+        corresponds to the record at the same index.
+
+        The title and the year of a record come from the same lookup, so a movie or a series is only searched for
+        once per match.
+
+        :return: A DatabaseMatch per MediaRecord, with None for the fields that weren't found.
+        :rtype: list[DatabaseMatch]
+        """
+
     def retrieve_media_titles_from_db(self) -> list[str | None]:
         """
         Retrieves a list of movie titles or episode titles from the database, depending on whether
         self.media_records is a list of movies or episodes. Each matched title corresponds to
         the record at the same index. If a title is missing, the value is None.
 
+        Looks every record up. Use retrieve_matches_from_db() to get the titles and the years from one lookup.
+
         :return: A list where each element is a database-matched title or None if not available.
         :rtype: list[str | None]
         """
+        return [match.episode_title if self.is_tv_series else match.title
+                for match in self.retrieve_matches_from_db()]
 
-    @abstractmethod
     def retrieve_media_years_from_db(self) -> list[int | None]:
         """
         Retrieves a list of media release years corresponding to self.media_records.
         Each element in the returned list aligns with the record at the same index in self.media_records.
         The list may contain an integer representing the release year or None if the year is unavailable.
 
+        Looks every record up. Use retrieve_matches_from_db() to get the titles and the years from one lookup.
+
         :return: A list where each element is an integer year or None if not available.
         :rtype: list[int | None]
         """
+        return [match.year for match in self.retrieve_matches_from_db()]
+
+
+def raise_if_cancelled(cancel_event: threading.Event):
+    """Raises MatchCancelled if cancel_event is set. For helpers that make requests outside a Database's methods."""
+    if cancel_event.is_set():
+        raise MatchCancelled()
 
 
 def retrieve_episode_name_from_episode_lookup(media_record: MediaRecord, episode_lookup: dict[(int, int), str]) -> str:
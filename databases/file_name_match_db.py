@@ -1,5 +1,5 @@
 from backend.media_record import MediaRecord
-from databases.database import Database
+from databases.database import Database, DatabaseMatch
 
 
 class FileNameMatchDB(Database):
@@ -11,22 +11,15 @@ class FileNameMatchDB(Database):
     def __init__(self, media_records: list[MediaRecord], is_tv_series: bool = False):
         super().__init__(media_records, is_tv_series)
 
-    def retrieve_media_titles_from_db(self) -> list[str | None]:
-        media_titles = []
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
+        matches = []
 
         for media_record in self.media_records:
             if self.is_tv_series:
-                media_titles.append(media_record.metadata.get("episode_title"))
+                matches.append(DatabaseMatch(title=media_record.title, year=media_record.year,
+                                             episode_title=media_record.metadata.get("episode_title")))
 
             if not self.is_tv_series:
-                media_titles.append(media_record.title)
+                matches.append(DatabaseMatch(title=media_record.title, year=media_record.year))
 
-        return media_titles
-
-    def retrieve_media_years_from_db(self) -> list[int | None]:
-        media_years = []
-
-        for media_record in self.media_records:
-            media_years.append(media_record.year)
-
-        return media_years
+        return matches
@@ -1,8 +1,12 @@
+from functools import partial
+
 from omdb import OMDBClient
 
 from backend.api_key_config import retrieve_omdb_key
+from backend.concurrent_lookup import iterate_lookups_in_order
+from backend.response_cache import retrieve_cached_session
 from backend.media_record import MediaRecord
-from databases.database import Database, retrieve_episode_name_from_episode_lookup
+from databases.database import Database, DatabaseMatch, retrieve_episode_name_from_episode_lookup
 
 
 # pylint: disable=R0801
@@ -14,73 +18,73 @@ class OMDBPythonDB(Database):
     This DB supports both movies and tv shows since OMDB supports both.
     """
 
+    looks_up_movies_one_at_a_time = True
+    max_concurrent_lookups = 4
+    max_concurrent_season_lookups = 4
+
     def __init__(self, media_records: list[MediaRecord], is_tv_series: bool = False):
         super().__init__(media_records, is_tv_series)
 
         # Lazy build it since the API key might not be set.
         self.omdb_client: OMDBClient | None = None
 
-    def retrieve_media_titles_from_db(self) -> list[str | None]:
-        if self.omdb_client is None:
-            self.omdb_client = OMDBClient(apikey=retrieve_omdb_key())
-            self.omdb_client.set_default('timeout', 5)
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
+        self._ensure_omdb_client()
 
-        matched_titles: list[str | None] = []
+        matches: list[DatabaseMatch] = []
 
         if self.is_tv_series:
             # MediaRecord Episode Match.
-            episode_lookup = self._create_episode_lookup(self.media_records[0].title, self.media_records[0].year,
-                                                         MediaRecord.get_all_season_numbers(self.media_records),
-                                                         self.media_records[0].is_absolute_order)
-
-            for media_record in self.media_records:
-                matched_titles.append(retrieve_episode_name_from_episode_lookup(media_record, episode_lookup))
-        else:
-            # MediaRecord Movie Match.
-            for media_record in self.media_records:
-                matched_movie = self.omdb_client.get(title=media_record.title, year=media_record.year)
-                matched_titles.append(matched_movie.get("title"))
-
-        return matched_titles
-
-    def retrieve_media_years_from_db(self) -> list[int | None]:
-        if self.omdb_client is None:
-            self.omdb_client = OMDBClient(apikey=retrieve_omdb_key())
-            self.omdb_client.set_default('timeout', 5)
-
-        if self.is_tv_series:
-            # Simply return the year if it already exists for a series.
-            if self.media_records[0].year is not None:
-                return [self.media_records[0].year] * len(self.media_records)
+            title: str = self.media_records[0].title
+            year: int | None = self.media_records[0].year
+            is_absolute_order: bool = self.media_records[0].is_absolute_order
 
-            series_info = self.omdb_client.get(title=self.media_records[0].title)
+            # The series info has the series' year and number of seasons. Season lookups don't, so it's only asked
+            # for if the year is missing or the episodes are in absolute order.
+            series_info: dict | None = None
 
-            year_range = series_info.get("year")
+            if year is None or is_absolute_order:
+                self.raise_if_cancelled()
+                series_info = self.omdb_client.get(title=title, year=year)
 
-            if year_range and year_range[:4].isdigit():
-                year = int(year_range[:4])
-                return [year] * len(self.media_records)
+            series_year = year if year is not None else _parse_year(series_info.get("year"))
+            episode_lookup = self._create_episode_lookup(title, year, self.media_records.get_all_season_numbers(),
+                                                         is_absolute_order, series_info)
 
-            return [None] * len(self.media_records)
+            for media_record in self.media_records:
+                matches.append(DatabaseMatch(
+                    provider_id=series_info.get("imdb_id") if series_info is not None else None,
+                    title=series_info.get("title") if series_info is not None else None, year=series_year,
+                    episode_title=retrieve_episode_name_from_episode_lookup(media_record, episode_lookup)))
+        else:
+            # MediaRecord Movie Match. Each movie is looked up by itself, so they're looked up concurrently.
+            matches = list(iterate_lookups_in_order(self._retrieve_movie_match, self.media_records,
+                                                    self.max_concurrent_lookups))
 
-        # Return the 'movie' release year of each MediaRecord.
-        release_years: list[int | None] = []
+        return matches
 
-        for media_record in self.media_records:
-            # Just use the year attached to the MediaRecord if it exists.
-            if media_record.year is not None:
-                release_years.append(media_record.year)
-                continue
+    def _retrieve_movie_match(self, media_record: MediaRecord) -> DatabaseMatch:
+        """The year is the record's, or the matched movie's if the record has none."""
+        self.raise_if_cancelled()
+        matched_movie = self.omdb_client.get(title=media_record.title, year=media_record.year)
+        movie_year = media_record.year if media_record.year is not None else _parse_year(matched_movie.get("year"))
 
-            movie_info = self.omdb_client.get(title=media_record.title)
-            release_years.append(movie_info.get("year"))
+        return DatabaseMatch(provider_id=matched_movie.get("imdb_id"), title=matched_movie.get("title"),
+                             year=movie_year)
 
-        return release_years
+    def _ensure_omdb_client(self):
+        if self.omdb_client is None:
+            self.omdb_client = OMDBClient(apikey=retrieve_omdb_key())
+            self.omdb_client.set_default('timeout', 5)
+            # Send requests through the response cache.
+            self.omdb_client.session = retrieve_cached_session()
 
-    def _create_episode_lookup(self, title: str, year: int | None, season_numbers: set[int], is_absolute_order: bool) \
-            -> dict[(int, int), str]:
+    def _create_episode_lookup(self, title: str, year: int | None, season_numbers: set[int], is_absolute_order: bool,
+                               series_info: dict | None = None) -> dict[(int, int), str]:
         """
-        Generate an episode lookup for a series.
+        Generate an episode lookup for a series. Raises MatchCancelled before the next request once cancelled.
+        For absolute order, the number of seasons comes from series_info, which is only requested if it's not passed.
+        Up to max_concurrent_season_lookups seasons are fetched at the same time, and merged in season order.
 
         Return a dict: [(season_number, episode_number) -> title].
         """
@@ -89,31 +93,46 @@ class OMDBPythonDB(Database):
         if is_absolute_order:
             # OMDB does not have a convenient way to retrieve the absolute order for a series.
             # We will query all episodes and create our own absolute order.
-            number_of_total_seasons = int(self.omdb_client.get(title=title, year=year).get("total_seasons", 1))
-            current_episode_counter = 1
+            if series_info is None:
+                self.raise_if_cancelled()
+                series_info = self.omdb_client.get(title=title, year=year)
 
-            for season_number in range(1, number_of_total_seasons + 1):
-                query = self.omdb_client.get(title=title, year=year, season=season_number)
-                episode_info_list = query.get("episodes")
+            number_of_total_seasons = int(series_info.get("total_seasons", 1))
+            season_numbers = range(1, number_of_total_seasons + 1)
 
-                if episode_info_list is None:
-                    continue
+        # OMDB requires you to look up episodes one season at a time.
+        season_numbers = sorted(season_numbers)
+        seasons = iterate_lookups_in_order(partial(self._retrieve_season_episodes, title, year), season_numbers,
+                                           self.max_concurrent_season_lookups)
+        current_episode_counter = 1
+
+        for season_number, episode_info_list in zip(season_numbers, seasons):
+            if episode_info_list is None:
+                continue
 
-                for episode_info in episode_info_list:
+            for episode_info in episode_info_list:
+                if is_absolute_order:
+                    # Seasons are merged in order, so the counter numbers the episodes across the whole series.
                     episode_lookup.update({(1, current_episode_counter): episode_info.get("title")})
                     current_episode_counter += 1
-        else:
-            # OMDB requires you to look up episodes one season at a time.
-            for season_number in season_numbers:
-                query = self.omdb_client.get(title=title, year=year, season=season_number)
-                episode_info_list = query.get("episodes")
-
-                if episode_info_list is None:
-                    continue
-
-                for episode_info in episode_info_list:
+                else:
                     episode_lookup.update({
                         (season_number, int(episode_info.get("episode", -1))): episode_info.get("title")
                     })
 
         return episode_lookup
+
+    def _retrieve_season_episodes(self, title: str, year: int | None, season_number: int) -> list[dict] | None:
+        self.raise_if_cancelled()
+        return self.omdb_client.get(title=title, year=year, season=season_number).get("episodes")
+
+
+def _parse_year(year: int | str | None) -> int | None:
+    """OMDB years are a year, or a range for series, e.g., '1999–2006'. Returns the first year."""
+    if isinstance(year, int):
+        return year
+
+    if year and year[:4].isdigit():
+        return int(year[:4])
+
+    return None
@@ -1,8 +1,18 @@
+import threading
+from functools import partial
+
 import tmdbsimple as tmdb
 
 from backend.api_key_config import retrieve_the_movie_db_key
+from backend.concurrent_lookup import iterate_lookups_in_order
+from backend.response_cache import retrieve_cached_session
 from backend.media_record import MediaRecord
-from databases.database import Database, retrieve_episode_name_from_episode_lookup
+from databases.database import Database, DatabaseMatch, retrieve_episode_name_from_episode_lookup, \
+    raise_if_cancelled
+
+
+# TheMovieDB appends at most 20 requests to a TV details response (append_to_response).
+SEASONS_PER_REQUEST = 20
 
 
 class TheMovieDBPythonDB(Database):
@@ -13,94 +23,74 @@ class TheMovieDBPythonDB(Database):
     This DB supports both movies and tv shows since TMDB supports both.
     """
 
+    looks_up_movies_one_at_a_time = True
+    max_concurrent_lookups = 8
+    max_concurrent_season_lookups = 10
+
     def __init__(self, media_records: list[MediaRecord], is_tv_series: bool = False):
         super().__init__(media_records, is_tv_series)
 
         # Timeout for connect & request after 5 seconds.
         tmdb.REQUESTS_TIMEOUT = 5
+        # Send requests through the response cache.
+        tmdb.REQUESTS_SESSION = retrieve_cached_session()
 
-    def retrieve_media_titles_from_db(self) -> list[str | None]:
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
         if tmdb.API_KEY is None:
             tmdb.API_KEY = retrieve_the_movie_db_key()
 
-        matched_titles: list[str | None] = []
+        matches: list[DatabaseMatch] = []
 
         if self.is_tv_series:
             # MediaRecord Episode Match.
+            self.raise_if_cancelled()
             possible_listings: dict = tmdb.Search().tv(query=self.media_records[0].title).get("results", "")
 
             if len(possible_listings) == 0:
-                return [None] * len(self.media_records)
+                return [DatabaseMatch(year=self.media_records[0].year)] * len(self.media_records)
 
-            # Default pick.
+            # Default pick. The user does not know the year of the series, so its year is the listing's.
             selected_listing = list(possible_listings)[0]
+            series_year = _get_release_year_of_listing(selected_listing, "first_air_date")
 
             if self.media_records[0].year is not None:
-                target_year = self.media_records[0].year
-                selected_listing = _find_best_listing_near_year(possible_listings, target_year, "first_air_date")
+                series_year = self.media_records[0].year
+                selected_listing = _find_best_listing_near_year(possible_listings, series_year, "first_air_date")
 
             episode_lookup = _create_episode_lookup(selected_listing.get("id"),
-                                                    MediaRecord.get_all_season_numbers(self.media_records),
-                                                    self.media_records[0].is_absolute_order)
+                                                    self.media_records.get_all_season_numbers(),
+                                                    self.media_records[0].is_absolute_order, self.cancel_event,
+                                                    self.max_concurrent_season_lookups)
 
             for media_record in self.media_records:
-                matched_titles.append(retrieve_episode_name_from_episode_lookup(media_record, episode_lookup))
+                matches.append(DatabaseMatch(
+                    provider_id=selected_listing.get("id"), title=selected_listing.get("name"), year=series_year,
+                    episode_title=retrieve_episode_name_from_episode_lookup(media_record, episode_lookup)))
         else:
-            # MediaRecord Movie Match.
-            for media_record in self.media_records:
-                possible_listings: dict = tmdb.Search().movie(query=media_record.title).get("results", "")
-                target_year: int | None = media_record.year
-
-                if len(possible_listings) == 0:
-                    matched_titles.append(None)
-                    continue
-
-                if target_year is None:
-                    # Choose the first possible listing.
-                    matched_titles.append(list(possible_listings)[0].get("title", None))
-                else:
-                    # Rare case where names might differentiate slightly and year is used to filter wrong names.
-                    best_listing = _find_best_listing_near_year(possible_listings, target_year, "release_date")
-                    matched_titles.append(best_listing.get("title", None))
-
-        return matched_titles
-
-    def retrieve_media_years_from_db(self) -> list[int | None]:
-        if tmdb.API_KEY is None:
-            tmdb.API_KEY = retrieve_the_movie_db_key()
+            # MediaRecord Movie Match. Each movie is looked up by itself, so they're looked up concurrently.
+            matches = list(iterate_lookups_in_order(self._retrieve_movie_match, self.media_records,
+                                                    self.max_concurrent_lookups))
 
-        # Return the 'series' release year.
-        if self.is_tv_series:
-            # Simply return the year if it already exists for a series.
-            if self.media_records[0].year is not None:
-                return [self.media_records[0].year] * len(self.media_records)
-
-            possible_listings: dict = tmdb.Search().tv(query=self.media_records[0].title).get("results", "")
-            if len(possible_listings) == 0:
-                return [None] * len(self.media_records)
-
-            # In this branch case, the user does not know the year of the series. Just select the first listing.
-            listing_date = list(possible_listings)[0].get("first_air_date", None)
+        return matches
 
-            return [int(listing_date[:4]) if listing_date is not None else None] * len(self.media_records)
+    def _retrieve_movie_match(self, media_record: MediaRecord) -> DatabaseMatch:
+        self.raise_if_cancelled()
+        possible_listings: dict = tmdb.Search().movie(query=media_record.title).get("results", "")
+        target_year: int | None = media_record.year
 
-        # Return the 'movie' release year of each MediaRecord.
-        release_years: list[int | None] = []
+        if len(possible_listings) == 0:
+            return DatabaseMatch(year=target_year)
 
-        for media_record in self.media_records:
-            # Just use the year attached to the MediaRecord if it exists.
-            if media_record.year is not None:
-                release_years.append(media_record.year)
-                continue
-
-            possible_listings: dict = tmdb.Search().movie(query=media_record.title).get("results", "")
-
-            # In this branch case, the user does not know the year of the series. Just select the first listing.
-            listing_date = list(possible_listings)[0].get("release_date", None)
-
-            release_years.append(int(listing_date[:4]) if listing_date and listing_date[:4].isdigit() else None)
+        if target_year is None:
+            # Choose the first possible listing, and its year.
+            selected_listing = list(possible_listings)[0]
+            target_year = _get_release_year_of_listing(selected_listing, "release_date")
+        else:
+            # Rare case where names might differentiate slightly and year is used to filter wrong names.
+            selected_listing = _find_best_listing_near_year(possible_listings, target_year, "release_date")
 
-        return release_years
+        return DatabaseMatch(provider_id=selected_listing.get("id"), title=selected_listing.get("title", None),
+                             year=target_year)
 
 
 def _find_best_listing_near_year(possible_listings: dict, target_year: int, identifier_for_year: str) -> dict:
@@ -122,53 +112,105 @@ def _get_release_year_of_listing(listing: dict, identifier_for_year: str) -> int
     return None
 
 
-def _create_episode_lookup(series_id: int, season_numbers: set[int], is_absolute_order: bool) \
-        -> dict[(int, int), str]:
+def _create_episode_lookup(series_id: int, season_numbers: set[int], is_absolute_order: bool,
+                           cancel_event: threading.Event | None = None,
+                           max_workers: int = 1) -> dict[(int, int), str]:
     """
-    Generate an episode lookup for a series.
+    Generate an episode lookup for a series. Raises MatchCancelled before the next request once cancel_event is set.
+    Seasons are loaded in batches (See _retrieve_seasons_in_batches()), and merged in season order.
 
     Return a dict: [(season_number, episode_number) -> title].
     """
     episode_lookup: dict[(int, int), str] = {}
+    cancel_event = cancel_event if cancel_event is not None else threading.Event()
 
-    if is_absolute_order:
-        # TheMovieDB Python API does not have a convenient way to retrieve the absolute order for a series.
-        # We will query all episodes and create our own absolute order.
-        number_of_total_seasons = int(tmdb.TV(series_id).info().get("number_of_seasons", 1))
-        current_episode_counter = 1
+    # TheMovieDB Python API does not have a convenient way to retrieve the absolute order for a series.
+    # For absolute order, we will query all episodes and create our own absolute order.
+    seasons = _retrieve_seasons_in_batches(series_id, None if is_absolute_order else season_numbers, cancel_event,
+                                           max_workers)
+    current_episode_counter = 1
 
-        for season_number in range(1, number_of_total_seasons + 1):
-            try:
-                response = tmdb.TV_Seasons(series_id, season_number).info()
-            except IOError:
-                # Skip if the TheMovieDB couldn't find the season info for a particular season.
-                continue
+    for season_number, episode_info_list in sorted(seasons.items()):
+        if episode_info_list is None:
+            continue
 
-            episode_info_list = response.get("episodes")
-
-            if episode_info_list is None:
-                continue
-
-            for episode_info in episode_info_list:
+        for episode_info in episode_info_list:
+            if is_absolute_order:
+                # Seasons are merged in order, so the counter numbers the episodes across the whole series.
                 episode_lookup.update({(1, current_episode_counter): episode_info.get("name")})
                 current_episode_counter += 1
+            else:
+                episode_lookup.update({
+                    (season_number, int(episode_info.get("episode_number", -1))): episode_info.get("name")
+                })
+
+    return episode_lookup
+
+
+def _retrieve_seasons_in_batches(series_id: int, season_numbers: set[int] | None, cancel_event: threading.Event,
+                                 max_workers: int = 1) -> dict[int, list[dict] | None]:
+    """
+    Loads the episodes of a series' seasons with the TV details request, which returns up to SEASONS_PER_REQUEST
+    seasons along with the series' info (append_to_response=season/1,season/2,...). n seasons take ceil(n / 20)
+    requests instead of n. If season_numbers is None, every season of the series is loaded: the first request also
+    tells how many there are.
+
+    The first request is sent by itself, and the other batches up to max_workers at a time. Seasons missing from a
+    (Partial) response fall back to a request per season, also up to max_workers at a time.
 
-    else:
+    Return a dict: {season_number -> its episodes, or None if TheMovieDB doesn't have them}.
+    """
+    is_every_season = season_numbers is None
+    season_numbers = list(range(1, SEASONS_PER_REQUEST + 1)) if is_every_season else sorted(season_numbers)
+    if not season_numbers:
+        return {}
+
+    responses = [_retrieve_series_info(series_id, season_numbers[:SEASONS_PER_REQUEST], cancel_event)]
+
+    if is_every_season:
+        season_numbers = list(range(1, int(responses[0].get("number_of_seasons", 1)) + 1))
+
+    batches = [season_numbers[i:i + SEASONS_PER_REQUEST]
+               for i in range(SEASONS_PER_REQUEST, len(season_numbers), SEASONS_PER_REQUEST)]
+    responses.extend(iterate_lookups_in_order(partial(_retrieve_series_info, series_id, cancel_event=cancel_event),
+                                              batches, max_workers))
+
+    seasons: dict[int, list[dict] | None] = {}
+    for response in responses:
         for season_number in season_numbers:
-            try:
-                response = tmdb.TV_Seasons(series_id, season_number).info()
-            except IOError:
-                # Skip if the TheMovieDB couldn't find the season info for a particular season.
-                continue
+            season = response.get(f"season/{season_number}")
+            if isinstance(season, dict) and "episodes" in season:
+                seasons[season_number] = season["episodes"]
 
-            episode_info_list = response.get("episodes")
+    # Seasons TheMovieDB left out of the responses.
+    missing_season_numbers = [season_number for season_number in season_numbers if season_number not in seasons]
+    seasons.update(zip(missing_season_numbers, list(iterate_lookups_in_order(
+        partial(_retrieve_season_episodes, series_id, cancel_event=cancel_event), missing_season_numbers,
+        max_workers))))
 
-            if episode_info_list is None:
-                continue
+    return seasons
 
-            for episode_info in episode_info_list:
-                episode_lookup.update({
-                    (season_number, int(episode_info.get("episode_number", -1))): episode_info.get("name")
-                })
 
-    return episode_lookup
+def _retrieve_series_info(series_id: int, season_numbers: list[int], cancel_event: threading.Event) -> dict:
+    """
+    The series' TV details, with the seasons in season_numbers appended as 'season/<season_number>', or an empty
+    dict if TheMovieDB couldn't find them. Its seasons are then fetched one at a time.
+    """
+    raise_if_cancelled(cancel_event)
+    try:
+        return tmdb.TV(series_id).info(
+            append_to_response=",".join(f"season/{season_number}" for season_number in season_numbers))
+    except IOError:
+        return {}
+
+
+def _retrieve_season_episodes(series_id: int, season_number: int, cancel_event: threading.Event) -> list[dict] | None:
+    """The episodes of a season, or None if TheMovieDB doesn't have them."""
+    raise_if_cancelled(cancel_event)
+    try:
+        response = tmdb.TV_Seasons(series_id, season_number).info()
+    except IOError:
+        # Skip if the TheMovieDB couldn't find the season info for a particular season.
+        return None
+
+    return response.get("episodes")
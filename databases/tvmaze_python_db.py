@@ -1,8 +1,48 @@
+import requests
 from tvmaze.api import Api
-from tvmaze.models import ResultSet, Model
+from tvmaze.expections import ConnectionError as TVMazeConnectionError, TvMazeException
+from tvmaze.models import ResultSet, Model, Show, Episode
 
 from backend.media_record import MediaRecord
-from databases.database import Database, retrieve_episode_name_from_episode_lookup
+from backend.response_cache import retrieve_cached_session
+from databases.database import Database, DatabaseMatch, retrieve_episode_name_from_episode_lookup
+
+
+class TVMazeClient:
+    """
+    The two TVMaze requests the database makes, sent through a requests.Session (E.g., the response cache's).
+    python-tvmaze's own clients send every request with the module-level requests.request(), so they can't be handed
+    one. Responses are parsed into python-tvmaze's models, and errors are raised the same as python-tvmaze does.
+    """
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def search_shows(self, query: str) -> ResultSet[Model | None]:
+        """Api().search.shows(), e.g., the best match is the first listing."""
+        results = self._get("/search/shows", params={"q": query}) or []
+        return Show.parse_list(result.get("show") for result in results)
+
+    def show_episodes(self, show_id: int) -> ResultSet[Model | None]:
+        """Api().show.episodes()."""
+        return Episode.parse_list(self._get(f"/shows/{show_id}/episodes"))
+
+    def _get(self, path: str, params: dict | None = None) -> list | dict | None:
+        """Same as python-tvmaze's Client._request(): None for 4xx responses, and TvMazeException for other errors."""
+        try:
+            response = self.session.get(Api.BASE_URL + path, params=params)
+        except requests.RequestException as e:
+            raise TVMazeConnectionError(e) from e
+
+        try:
+            if 400 <= response.status_code <= 499:
+                return None
+            if not 200 <= response.status_code <= 299:
+                raise TvMazeException(response.json().get("message"))
+
+            return response.json()
+        except ValueError:
+            return None
 
 
 class TVMazePythonDB(Database):
@@ -15,35 +55,40 @@ class TVMazePythonDB(Database):
 
     def __init__(self, media_records: list[MediaRecord], is_tv_series: bool = False):
         super().__init__(media_records, is_tv_series)
-        self.api = Api()
+        # Through the response cache, so matching the same series again doesn't need the network.
+        self.tvmaze_client = TVMazeClient(retrieve_cached_session())
 
-    def retrieve_media_titles_from_db(self) -> list[str | None]:
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
         """
         The TVMaze API will return the best match as the first element. This should be fine for most cases.
 
         However, for cases such as 'Doctor Who (2005)' and 'Doctor Who (2023)', this method will default to the newest
         listing. Users will get an opportunity to change the matched year from [auto] before matching with a database.
         """
-        possible_listings: ResultSet[Model | None] = self.api.search.shows(self.media_records[0].title)
+        self.raise_if_cancelled()
+        possible_listings: ResultSet[Model | None] = self.tvmaze_client.search_shows(self.media_records[0].title)
 
         if len(possible_listings) == 0:
-            return [None] * len(self.media_records)
+            return [DatabaseMatch(year=self.media_records[0].year)] * len(self.media_records)
 
-        # Default pick.
+        # Default pick. Since there's no matched year from the input list of MediaRecords, the series' year is the
+        # premiere year of the 1st result.
         selected_listing: Model = possible_listings[0]
+        series_year: int | None = get_premiere_year_of_listing(selected_listing)
 
         # If the user inputs a specific year or a year is matched from the filename, filter shows greater than
         # one year away from the input year, and pick the first element in the remaining list of possible shows.
         if self.media_records[0].year is not None:
-            target_year: int = self.media_records[0].year
+            series_year = self.media_records[0].year
 
             # Get the first listing once listings are filtered within one year of the target year.
             # This should be 'good enough' to get the best matching show/listing for the user.
-            selected_listing = filter_listings_within_one_year_of_target(possible_listings, target_year)[0]
+            selected_listing = filter_listings_within_one_year_of_target(possible_listings, series_year)[0]
 
         matched_show_id: int = selected_listing.id
 
-        matched_episodes: ResultSet[Model | None] = self.api.show.episodes(matched_show_id)
+        self.raise_if_cancelled()
+        matched_episodes: ResultSet[Model | None] = self.tvmaze_client.show_episodes(matched_show_id)
 
         # Map: (Season, Episode number) to Episode name.
         episode_lookup = {(episode.season, episode.number): episode.name for episode in matched_episodes}
@@ -56,28 +101,15 @@ class TVMazePythonDB(Database):
                 episode_lookup.update({(1, current_episode_counter): episode.name})
                 current_episode_counter += 1
 
-        result: list[str | None] = []
+        result: list[DatabaseMatch] = []
 
         for media_record in self.media_records:
-            result.append(retrieve_episode_name_from_episode_lookup(media_record, episode_lookup))
+            result.append(DatabaseMatch(
+                provider_id=matched_show_id, title=getattr(selected_listing, "name", None), year=series_year,
+                episode_title=retrieve_episode_name_from_episode_lookup(media_record, episode_lookup)))
 
         return result
 
-    def retrieve_media_years_from_db(self) -> list[int | None]:
-        """Return the premiere year of the series, padding them to the length of the input list of MediaRecords."""
-
-        # If the media records list already contains the year, return it.
-        if self.media_records[0].year is not None:
-            return [self.media_records[0].year] * len(self.media_records)
-
-        possible_listings: ResultSet[Model | None] = self.api.search.shows(self.media_records[0].title)
-
-        if len(possible_listings) == 0:
-            return [None] * len(self.media_records)
-
-        # Since there's no matched year from the input list of MediaRecords, return the premiere year of the 1st result.
-        return [get_premiere_year_of_listing(possible_listings[0])] * len(self.media_records)
-
 
 def filter_listings_within_one_year_of_target(possible_listings: ResultSet[Model | None], target_year: int) -> list:
     """
@@ -1,26 +1,35 @@
+import multiprocessing
 import os
 import sys
 from pathlib import Path
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, Slot
 from PySide6.QtGui import QGuiApplication, QIcon, QPixmap
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QHBoxLayout, QListWidget, QStackedWidget, QSizePolicy
 
 from pages.core.main_page import MainPage
-from pages.formats import FormatsPage
-from pages.settings import SettingsPage
+from backend.guessit_warm_up import retrieve_guessit_warm_up
+from backend.settings_backend import set_color_theme_on_startup
 from backend.utils import resource_path
 
 # Percentage of the screen's dimensions that various widget sizes should adhere to.
 DEFAULT_APP_WIDTH_SCALING = 0.70
 DEFAULT_APP_HEIGHT_SCALING = 0.60
 
+# Menu rows of the pages.
+MAIN_PAGE_ROW = 0
+FORMATS_PAGE_ROW = 1
+SETTINGS_PAGE_ROW = 2
+
 
 class MainWindow(QMainWindow):
     """Container for different Widgets/Pages with a menu-style list for switching between pages."""
 
     def __init__(self):
         super().__init__()
+        # Before any page is built. Setting the color theme after elements have been drawn does not work.
+        set_color_theme_on_startup()
+
         central_layout = QHBoxLayout()
         screen_size_info = QGuiApplication.primaryScreen().availableGeometry()
 
@@ -29,17 +38,19 @@ class MainWindow(QMainWindow):
         self.menu.addItems(["🖋  Rename", "💾  Formats", "⚙️  Settings"])
         central_layout.addWidget(self.menu)
 
-        # QStackedWidget that stores different pages/widgets that can be switched to/from.
+        # QStackedWidget that stores different pages/widgets that can be switched to/from. Only the main page is built
+        # up front. The others start as empty placeholders and are built the first time they're selected.
         self.pages = QStackedWidget()
         self.pages.addWidget(MainPage())
-        self.pages.addWidget(FormatsPage())
-        self.pages.addWidget(SettingsPage())
+        self.pages.addWidget(QWidget())
+        self.pages.addWidget(QWidget())
+        self.built_page_rows = {MAIN_PAGE_ROW}
         self.pages.setSizePolicy(QSizePolicy.Policy.MinimumExpanding, QSizePolicy.Policy.MinimumExpanding)
         central_layout.addWidget(self.pages)
 
-        # Connects signal for when the user clicks on a menu tab to setCurrentIndex()'s slot to change pages.
-        self.menu.currentRowChanged.connect(self.pages.setCurrentIndex)
-        self.menu.setCurrentRow(0)
+        # Connects signal for when the user clicks on a menu tab to show_page()'s slot to change pages.
+        self.menu.currentRowChanged.connect(self.show_page)
+        self.menu.setCurrentRow(MAIN_PAGE_ROW)
 
         # Package the central_layout into a QWidget container as QMainWindow works with Widgets, not layouts.
         central_widget_container = QWidget()
@@ -62,6 +73,32 @@ class MainWindow(QMainWindow):
         default_screen_height = int(screen_size_info.height() * DEFAULT_APP_HEIGHT_SCALING)
         self.resize(default_screen_width, default_screen_height)
 
+    @Slot(int)
+    def show_page(self, row: int):
+        """Switches to the page at row, replacing its placeholder with the real page the first time."""
+        if row not in self.built_page_rows:
+            placeholder = self.pages.widget(row)
+            self.pages.insertWidget(row, create_page(row))
+            self.pages.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.built_page_rows.add(row)
+
+        self.pages.setCurrentIndex(row)
+
+
+# pylint: disable=import-outside-toplevel
+def create_page(row: int) -> QWidget:
+    """
+    Builds the Formats or Settings page. They're imported here, on first use, so neither their modules nor their
+    widgets slow down startup.
+    """
+    if row == FORMATS_PAGE_ROW:
+        from pages.formats import FormatsPage
+        return FormatsPage()
+
+    from pages.settings import SettingsPage
+    return SettingsPage()
+
 
 def apply_stylesheet(application: QApplication, qss_path: str):
     with Path(qss_path).open("r", encoding="utf-8") as style_file:
@@ -69,10 +106,16 @@ def apply_stylesheet(application: QApplication, qss_path: str):
 
 
 if __name__ == "__main__":
+    # Worker processes (Used for parsing large folders) need this to start correctly from the PyInstaller executable.
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
     apply_stylesheet(app, resource_path("styles/default.qss"))
     main_window = MainWindow()
     main_window.show()
+    # Build guessit's rules in the background once the event loop starts painting the window,
+    # so the first dropped file doesn't stall the UI.
+    QTimer.singleShot(0, retrieve_guessit_warm_up().start)
 
     # If running as a GitHub Actions build check, auto-quit after one second since app is a UI.
     if os.environ.get("CI", "false").lower() == "true":
@@ -2,14 +2,14 @@ import os.path
 
 from PySide6.QtCore import Qt, Slot, QTimer
 from PySide6.QtGui import QCursor
-from PySide6.QtWidgets import QListWidget, QHBoxLayout, QVBoxLayout, QLabel, QWidget, QPushButton, \
-    QApplication, QDialog
+from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QLabel, QWidget, QPushButton, QApplication, QDialog
 
 from backend.core_backend import (get_invalid_file_names_and_fixes,
                                   perform_file_renaming)
 from backend.error_popup_widget import ErrorPopupWidget
 from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
 from pages.core.match_options_widget import MatchOptionsWidget
+from pages.core.output_files_widget import OutputFilesWidget
 
 
 class CoreRenamerWidget(QWidget):
@@ -28,7 +28,7 @@ class CoreRenamerWidget(QWidget):
 
         # Left input box layout: Title + Box.
         left_box_layout = QVBoxLayout()
-        # We want a subclass of QListWidget for drag-and-drop capabilities for the input box.
+        # Both boxes are list views backed by models, so big lists of files stay fast.
         self.left_box = DragAndDropFilesWidget()
         left_box_label = QLabel("Input Filenames")
         left_box_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -50,7 +50,7 @@ class CoreRenamerWidget(QWidget):
 
         # Right output box layout: Title + Box.
         right_box_layout = QVBoxLayout()
-        self.right_box = QListWidget()
+        self.right_box = OutputFilesWidget()
         right_box_label = QLabel("Output Filenames")
         right_box_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         right_box_layout.addWidget(right_box_label)
@@ -60,6 +60,9 @@ class CoreRenamerWidget(QWidget):
         self.left_box.currentRowChanged.connect(self.right_box.setCurrentRow)
         self.right_box.currentRowChanged.connect(self.left_box.setCurrentRow)
 
+        # Keep the right box lined up with the left box when a watched file disappears.
+        self.left_box.watched_file_removed.connect(self.remove_output_row)
+
         # Synchronize scrolling for the left and right boxes.
         self.left_box.verticalScrollBar().valueChanged.connect(lambda position:
                                                                self.right_box.verticalScrollBar().setValue(position))
@@ -78,16 +81,25 @@ class CoreRenamerWidget(QWidget):
         files_ui_layout.addLayout(buttons_layout)
         files_ui_layout.addLayout(right_box_layout)
 
+    @Slot(int)
+    def remove_output_row(self, row: int):
+        self.right_box.remove_row(row)
+
     @Slot()
     def open_match_options_widget(self):
         """
         Opens a MatchOptionsWidget if there are input files and passes instance of CoreRenamerWidget
-        in as parent for sizing/positioning as well as the left input box (QListWidget).
+        in as parent for sizing/positioning as well as the left input box (DragAndDropFilesWidget).
         """
         # Nothing to match... return.
         if self.left_box.count() == 0:
             return
 
+        # Matching only part of a drop would leave the rest of it without a name to rename to.
+        if self.left_box.is_adding_paths():
+            ErrorPopupWidget("Files are still being added. Please wait until they're all in the list!").exec()
+            return
+
         # Open a MatchOptionsWidget to allow users to select a database option.
         return_code = MatchOptionsWidget(self.left_box, self.right_box).exec()
 
@@ -107,21 +119,18 @@ class CoreRenamerWidget(QWidget):
 
         QApplication.setOverrideCursor(QCursor(Qt.CursorShape.WaitCursor))
 
-        output_file_names: list[str] = []
-        for i in range(self.right_box.count()):
-            output_file_names.append(self.right_box.item(i).text())
+        output_file_names: list[str] = self.right_box.file_names()
 
         invalid_file_names_and_fixes: dict[str, str] = get_invalid_file_names_and_fixes(output_file_names)
 
         if len(invalid_file_names_and_fixes) > 0:
             error_msg = "These matched names aren't valid. Will use fixed names:\n\n"
 
-            for i in range(self.right_box.count()):
-                matched_file_name = self.right_box.item(i).text()
+            for i, matched_file_name in enumerate(output_file_names):
                 fix = invalid_file_names_and_fixes.get(matched_file_name)
                 if fix is not None:
                     # Replace the invalid matched name with the fix in the right box.
-                    self.right_box.item(i).setText(invalid_file_names_and_fixes.get(self.right_box.item(i).text()))
+                    self.right_box.set_file_name(i, fix)
 
                     error_msg += matched_file_name + " → " + fix + "\n"
 
@@ -179,13 +188,15 @@ class CoreRenamerWidget(QWidget):
         old_file_names = []
         new_file_names = []
 
+        # The 'file names' from the right box (Do not contain the folder, just the file name).
+        output_file_names = self.right_box.file_names()
+
         for i in range(self.left_box.count()):
             # Retrieve the full file path from the left box.
-            full_old_file_path = self.left_box.item(i).data(Qt.ItemDataRole.UserRole).full_file_path
+            full_old_file_path = self.left_box.media_records[i].full_file_path
             old_file_names.append(full_old_file_path)
 
-            # Retrieve the 'file name' from the right box (Does not contain the folder, just the file name).
-            output_file_name = self.right_box.item(i).text()
+            output_file_name = output_file_names[i]
             # Prefix the folder to the output file name.
             full_new_path = os.path.join(os.path.dirname(full_old_file_path), output_file_name)
 
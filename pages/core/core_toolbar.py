@@ -1,16 +1,18 @@
 from PySide6.QtCore import Slot
-from PySide6.QtWidgets import QWidget, QListWidget, QHBoxLayout, QPushButton, QCheckBox, QFileDialog
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QCheckBox, QFileDialog, QLabel, QProgressBar
 from PySide6.QtGui import QShortcut, QKeySequence
 
+from backend.scan_index import ScanReport
 from backend.settings_backend import retrieve_filename_analysis_only_flag, set_filename_analysis_only_flag
 from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+from pages.core.output_files_widget import OutputFilesWidget
 
 
 class CoreToolBar(QWidget):
     """Contains the toolbar helper elements (buttons) residing below CoreRenamerWidget."""
     BUTTON_SPACING: int = 15
 
-    def __init__(self, input_box: DragAndDropFilesWidget, output_box: QListWidget, parent=None):
+    def __init__(self, input_box: DragAndDropFilesWidget, output_box: OutputFilesWidget, parent=None):
         super().__init__(parent)
         self.input_box = input_box
         self.output_box = output_box
@@ -27,6 +29,10 @@ class CoreToolBar(QWidget):
         remove_file_button.clicked.connect(self.remove_file)
         remove_all_files_button = QPushButton(" ❌ Remove All Files  ")
         remove_all_files_button.clicked.connect(self.remove_all_files)
+        # Checked while a folder is being watched.
+        self.watch_folder_button = QPushButton(" 👁 Watch Folder . . .  ")
+        self.watch_folder_button.setCheckable(True)
+        self.watch_folder_button.toggled.connect(self.toggle_watch_folder)
 
         filename_only_checkbox = QCheckBox("Use only the file's name for metadata analysis")
         filename_only_checkbox.setChecked(retrieve_filename_analysis_only_flag())
@@ -38,27 +44,75 @@ class CoreToolBar(QWidget):
         core_tool_bar_layout.addSpacing(self.BUTTON_SPACING)
         core_tool_bar_layout.addWidget(remove_all_files_button)
         core_tool_bar_layout.addSpacing(self.BUTTON_SPACING)
+        core_tool_bar_layout.addWidget(self.watch_folder_button)
+        core_tool_bar_layout.addSpacing(self.BUTTON_SPACING)
         core_tool_bar_layout.addWidget(filename_only_checkbox)
         # Adding a stretch at the end, left-aligns all buttons and sizes them correctly.
         core_tool_bar_layout.addStretch()
 
+        # Shows how many of the last added files were reused from the scan index instead of parsed again.
+        self.scan_report_label = QLabel()
+        self.input_box.scan_report_ready.connect(self.show_scan_report)
+        core_tool_bar_layout.addWidget(self.scan_report_label)
+
+        # Only shown while a big drop is being added, a time slice at a time.
+        self.path_queue_progress_bar = QProgressBar()
+        self.path_queue_progress_bar.setFormat("Adding files: %v / %m")
+        self.path_queue_progress_bar.hide()
+        self.cancel_adding_files_button = QPushButton(" ✋ Cancel  ")
+        self.cancel_adding_files_button.clicked.connect(self.input_box.cancel_adding_paths)
+        self.cancel_adding_files_button.hide()
+        self.input_box.path_queue_progress.connect(self.show_path_queue_progress)
+        self.input_box.path_queue_finished.connect(self.hide_path_queue_progress)
+        core_tool_bar_layout.addWidget(self.path_queue_progress_bar)
+        core_tool_bar_layout.addWidget(self.cancel_adding_files_button)
+
     @Slot()
     def open_files(self):
         file_paths, _ = QFileDialog.getOpenFileNames(None, "Select Media Files")
-        for file_path in file_paths:
-            self.input_box.add_file_to_list(file_path)
+        self.input_box.add_paths(file_paths)
+
+    @Slot(bool)
+    def toggle_watch_folder(self, checked: bool):
+        if not checked:
+            self.input_box.stop_watching_folder()
+            self.watch_folder_button.setToolTip("")
+            return
+
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+        if not folder_path:
+            # Nothing was chosen, so un-check the button without stopping anything.
+            self.watch_folder_button.blockSignals(True)
+            self.watch_folder_button.setChecked(False)
+            self.watch_folder_button.blockSignals(False)
+            return
+
+        self.input_box.watch_folder(folder_path)
+        self.watch_folder_button.setToolTip(f"Watching: {folder_path}")
+
+    @Slot(ScanReport)
+    def show_scan_report(self, scan_report: ScanReport):
+        self.scan_report_label.setText(f"Last added: {scan_report}")
+
+    @Slot(int, int)
+    def show_path_queue_progress(self, added_path_count: int, path_count: int):
+        self.path_queue_progress_bar.setMaximum(path_count)
+        self.path_queue_progress_bar.setValue(added_path_count)
+        self.path_queue_progress_bar.show()
+        self.cancel_adding_files_button.show()
+
+    @Slot()
+    def hide_path_queue_progress(self):
+        self.path_queue_progress_bar.hide()
+        self.cancel_adding_files_button.hide()
 
     @Slot()
     def remove_file(self):
         row = self.input_box.currentRow()
 
         if row != -1:
-            removed_item = self.input_box.takeItem(row)
-            del removed_item
-
-        if row < self.output_box.count():
-            removed_item = self.output_box.takeItem(row)
-            del removed_item
+            self.input_box.remove_row(row)
+            self.output_box.remove_row(row)
 
     @Slot()
     def remove_all_files(self):
@@ -1,23 +1,247 @@
+import time
+from collections import deque
 from pathlib import Path
+from typing import Iterable
 
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, Slot, QThreadPool, QObject, Signal, QTimer
 from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtWidgets import QListWidget, QListWidgetItem, QMenu, QDialog, QVBoxLayout, QLabel
+from PySide6.QtWidgets import QMenu, QDialog, QVBoxLayout, QLabel
 
+from backend.directory_scanner import DirectoryScannerWorker, ScannedFile
+from backend.error_popup_widget import ErrorPopupWidget
+from backend.file_index import FileIndex
+from backend.file_prefilter import retrieve_file_prefilter
+from backend.folder_watcher import FolderWatcher
+from backend.guessit_warm_up import retrieve_guessit_warm_up
 from backend.media_record import MediaRecord
+from backend.media_record_collection import MediaRecordCollection
+from backend.parallel_ingestion import ParallelIngestionWorker, PARALLEL_INGESTION_THRESHOLD
+from backend.parse_cache import retrieve_parse_cache
+from backend.scan_index import DirectoryScanIndex, ScanReport
+from backend.settings_backend import SettingsSnapshot, retrieve_settings_snapshot
 from backend.utils import resource_path
+from pages.core.file_list_models import InputFilesModel
+from pages.core.file_list_view import FileListView
 
-class DragAndDropFilesWidget(QListWidget):
+# How long adding queued paths can block the event loop per turn. About one frame, so the window keeps repainting.
+PATH_QUEUE_TIME_BUDGET_SECONDS = 0.016
+
+
+# pylint: disable=too-many-instance-attributes
+class FolderScan(QObject):
+    """
+    Adds the files of a dropped folder to a DragAndDropFilesWidget while the folder is still being scanned.
+
+    Files that don't pass the settings' FilePrefilter (Wrong extension, samples, extras, etc.) are skipped by the
+    scanner, so they're never parsed. Files that haven't changed since the folder was last added are reused from the
+    scan index, and files that are already in the widget are skipped. The rest are parsed in the order they were
+    found. Folders with fewer than PARALLEL_INGESTION_THRESHOLD files are parsed on the GUI thread once the scan is
+    done, larger ones by one ParallelIngestionWorker at a time as batches come in.
+
+    The workers aren't auto-deleted by QThreadPool (From its own thread, which crashes if their Python wrappers are
+    still in use). They're kept here instead, and deleted with this object once the widget lets go of it. For the
+    same reason, this object has no Qt parent: Python alone decides when it's deleted.
+    """
+    finished = Signal()
+
+    def __init__(self, files_widget: "DragAndDropFilesWidget", directory: str, settings: SettingsSnapshot,
+                 folder_watcher: FolderWatcher | None = None):
+        super().__init__()
+        self.files_widget = files_widget
+        self.settings = settings
+        # Started with this scan's tree once it's done, so watching a folder only scans it once.
+        self.folder_watcher = folder_watcher
+
+        self.pending_scanned_files: list[ScannedFile] = []
+        # Files claimed in the widget's FileIndex that aren't rows yet. Released if they never will be.
+        self.claimed_file_paths: set[str] = set()
+        self.found_file_count = 0
+        self.is_scan_finished = False
+        # True once every file found by the scan was added to the widget (Or dropped, if it was cancelled).
+        self.is_finished = False
+        self.is_cancelled = False
+        self.scan_report = ScanReport()
+        self.parallel_ingestion_worker: ParallelIngestionWorker | None = None
+        # Every worker started by this scan. See above for why they're kept.
+        self.workers: list[DirectoryScannerWorker | ParallelIngestionWorker] = []
+
+        self.directory_scanner_worker = DirectoryScannerWorker(directory, retrieve_file_prefilter(settings),
+                                                               DirectoryScanIndex(directory, settings),
+                                                               collects_tree=folder_watcher is not None)
+        self.directory_scanner_worker.batch_ready.connect(self.add_batch)
+        self.directory_scanner_worker.scan_report_ready.connect(self.set_scan_report)
+        self.directory_scanner_worker.tree_scanned.connect(self.start_folder_watcher)
+        self.directory_scanner_worker.finished.connect(self.finish_scan)
+        self.directory_scanner_worker.error.connect(self.show_scan_error)
+
+    def start(self):
+        self.start_worker(self.directory_scanner_worker)
+
+    def start_worker(self, worker: DirectoryScannerWorker | ParallelIngestionWorker):
+        worker.setAutoDelete(False)
+        self.workers.append(worker)
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel(self):
+        """Stop scanning and parsing. Files already in the widget stay there."""
+        self.is_cancelled = True
+        self.pending_scanned_files.clear()
+        # Otherwise, dropping the folder again would skip these files as duplicates.
+        self.release_claimed_file_paths(self.claimed_file_paths)
+        # The folder watcher still needs the whole tree, so the scan goes on. Its files just aren't added anymore.
+        if self.folder_watcher is None:
+            self.directory_scanner_worker.cancel()
+        if self.parallel_ingestion_worker is not None:
+            self.parallel_ingestion_worker.cancel()
+
+    @Slot(list)
+    def add_batch(self, scanned_files: list[ScannedFile]):
+        if self.is_cancelled:
+            return
+
+        # Files are claimed in the widget's FileIndex now, so a second drop of the same folder skips them right away.
+        # With the scanner's stat, so claiming them doesn't stat every file again on the GUI thread.
+        new_scanned_files = [scanned_file for scanned_file in scanned_files
+                             if self.files_widget.file_index.add(scanned_file.path, scanned_file.file_stat)]
+        self.scan_report.duplicate_file_count += len(scanned_files) - len(new_scanned_files)
+        for scanned_file in new_scanned_files:
+            if scanned_file.metadata is None:
+                self.scan_report.parsed_file_count += 1
+            else:
+                self.scan_report.reused_file_count += 1
+
+        self.pending_scanned_files.extend(new_scanned_files)
+        self.claimed_file_paths.update(scanned_file.path for scanned_file in new_scanned_files)
+        self.found_file_count += len(scanned_files)
+        self.ingest_pending_file_paths()
+
+    @Slot(object)
+    def set_scan_report(self, scan_report: ScanReport):
+        # Only the removed files are taken from the index. The rest are counted as files are added to the widget.
+        self.scan_report.removed_file_count = scan_report.removed_file_count
+
+    @Slot(object)
+    def start_folder_watcher(self, files_by_directory: dict[str, set[str]]):
+        # Unless watch-folder mode was turned off (Or moved to another folder) in the meantime.
+        if self.files_widget.folder_watcher is self.folder_watcher:
+            self.folder_watcher.start_from_scan(files_by_directory)
+
+    @Slot()
+    def finish_scan(self):
+        self.is_scan_finished = True
+        self.ingest_pending_file_paths()
+
+    @Slot()
+    def show_scan_error(self):
+        ErrorPopupWidget("Could not read all of the files in the folder!").exec()
+        self.finish_scan()
+
+    @Slot(list)
+    def add_media_records(self, media_records: list[MediaRecord]):
+        # Chunks that were already on their way when the scan was cancelled are dropped.
+        if not self.is_cancelled:
+            self.add_claimed_media_records(media_records)
+
+    def add_claimed_media_records(self, media_records: list[MediaRecord]):
+        self.files_widget.add_media_records_to_list(media_records)
+        self.claimed_file_paths.difference_update(media_record.full_file_path for media_record in media_records)
+
+    def release_claimed_file_paths(self, file_paths: Iterable[str]):
+        """Takes files that won't become rows out of the widget's FileIndex."""
+        released_file_paths = self.claimed_file_paths.intersection(file_paths)
+        for file_path in released_file_paths:
+            self.files_widget.file_index.remove(file_path)
+
+        self.claimed_file_paths.difference_update(released_file_paths)
+
+    @Slot()
+    def fail_parallel_ingestion(self):
+        # The worker's files that weren't added by the time it failed.
+        if self.parallel_ingestion_worker is not None:
+            self.release_claimed_file_paths(self.parallel_ingestion_worker.file_paths)
+
+        self.files_widget.show_parallel_ingestion_error()
+        self.finish_parallel_ingestion()
+
+    @Slot()
+    def finish_parallel_ingestion(self):
+        self.parallel_ingestion_worker = None
+        self.ingest_pending_file_paths()
+
+    def ingest_pending_file_paths(self):
+        # Only one worker at a time, so rows are added in the same order the files were found.
+        if self.parallel_ingestion_worker is not None:
+            return
+
+        if self.pending_scanned_files and not self.is_cancelled:
+            # Large folders are parsed by worker processes, so the UI doesn't freeze and all CPU cores are used.
+            if self.found_file_count >= PARALLEL_INGESTION_THRESHOLD:
+                self.parallel_ingestion_worker = ParallelIngestionWorker(
+                    [scanned_file.path for scanned_file in self.pending_scanned_files], self.settings,
+                    [scanned_file.metadata for scanned_file in self.pending_scanned_files])
+                self.parallel_ingestion_worker.chunk_ready.connect(self.add_media_records)
+                self.parallel_ingestion_worker.error.connect(self.fail_parallel_ingestion)
+                self.parallel_ingestion_worker.finished.connect(self.finish_parallel_ingestion)
+                self.start_worker(self.parallel_ingestion_worker)
+                self.pending_scanned_files = []
+                return
+
+            # Wait for the rest of the scan. It might still turn out to be a large folder.
+            if not self.is_scan_finished:
+                return
+
+            self.add_claimed_media_records(
+                [MediaRecord(scanned_file.path, settings=self.settings) if scanned_file.metadata is None
+                 else MediaRecord(scanned_file.path, scanned_file.metadata)
+                 for scanned_file in self.pending_scanned_files])
+            self.pending_scanned_files = []
+
+        if self.is_scan_finished:
+            self.is_finished = True
+            self.finished.emit()
+
+
+# pylint: disable=too-many-public-methods
+class DragAndDropFilesWidget(FileListView):
     """
-    QListWidget subclass to allow for drag-and-drop files functionality.
+    The input box: a FileListView of the input files' MediaRecords, with drag-and-drop files functionality.
     dragEnterEvent(), dragMoveEvent(), and dropEvent() need to be overridden for that to work.
     """
+    # Emitted with a ScanReport once a batch of added files or a dropped folder is fully added.
+    scan_report_ready = Signal(object)
+    # Emitted with the row of every file removed because it disappeared from the watched folder.
+    watched_file_removed = Signal(int)
+    # Emitted with (Added, total) after every turn that leaves paths in the queue, i.e., only for big drops.
+    path_queue_progress = Signal(int, int)
+    # Emitted once the queue is empty, either because every path was added or because it was cancelled.
+    path_queue_finished = Signal()
 
     def __init__(self, parent=None):
-        super().__init__(parent)
+        super().__init__(InputFilesModel(MediaRecordCollection()), parent)
         self.setAcceptDrops(True)
 
-        # Allow the user to right-click a QListWidgetItem to show information about the MediaRecord.
+        # The MediaRecords of the rows, in the same order. Only changed through the model, so the view follows.
+        self.input_files_model: InputFilesModel = self.model()
+        self.media_records = self.input_files_model.media_records
+        # Every file in the widget, plus the files of dropped folders that are about to be added.
+        self.file_index = FileIndex()
+
+        # Batches of (paths, settings) added while guessit is still warming up. Added once it's done.
+        self._paths_waiting_for_warm_up: list[tuple[list[str], SettingsSnapshot]] = []
+        # Paths (And the settings they were added with) that are added a time slice at a time. See add_queued_paths().
+        self._queued_paths: deque[tuple[str, SettingsSnapshot]] = deque()
+        # Paths queued since the queue was last empty, and a report of the ones that were added so far.
+        self._queued_path_count = 0
+        self._path_queue_scan_report = ScanReport()
+        self._path_queue_timer = QTimer(self)
+        self._path_queue_timer.setInterval(0)
+        self._path_queue_timer.timeout.connect(self.add_queued_paths)
+        # Dropped folders that are still being scanned or parsed.
+        self.folder_scans: list[FolderScan] = []
+        # Keeps the list in sync with a folder while watch-folder mode is on.
+        self.folder_watcher: FolderWatcher | None = None
+
+        # Allow the user to right-click a row to show information about its MediaRecord.
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu_on_right_click)
 
@@ -31,45 +255,243 @@ class DragAndDropFilesWidget(QListWidget):
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
-            for url in event.mimeData().urls():
-                self.add_path(url.toLocalFile())
+            self.add_paths([url.toLocalFile() for url in event.mimeData().urls()])
 
             event.acceptProposedAction()
 
-    def add_path(self, file_path: str):
+    def add_paths(self, file_paths: list[str]):
+        """
+        Add files and/or folders to the list. Non-blocking while guessit is warming up: the paths are
+        added as soon as the warm-up finishes instead. Otherwise, only the first PATH_QUEUE_TIME_BUDGET_SECONDS
+        worth of paths are added right away, and the rest are queued. See add_queued_paths().
+        """
+        # Capture the settings once for every file in this batch, i.e., when the user added them.
+        settings = retrieve_settings_snapshot()
+
+        guessit_warm_up = retrieve_guessit_warm_up()
+        if guessit_warm_up.is_running():
+            if not self._paths_waiting_for_warm_up:
+                guessit_warm_up.finished.connect(self.add_paths_waiting_for_warm_up)
+            self._paths_waiting_for_warm_up.append((file_paths, settings))
+            return
+
+        self._add_paths_now(file_paths, settings)
+
+    @Slot()
+    def add_paths_waiting_for_warm_up(self):
+        retrieve_guessit_warm_up().finished.disconnect(self.add_paths_waiting_for_warm_up)
+
+        for file_paths, settings in self._paths_waiting_for_warm_up:
+            self._add_paths_now(file_paths, settings)
+
+        self._paths_waiting_for_warm_up.clear()
+
+    def _add_paths_now(self, file_paths: list[str], settings: SettingsSnapshot):
+        self._queued_paths.extend((file_path, settings) for file_path in file_paths)
+        self._queued_path_count += len(file_paths)
+
+        # The first time slice is added right away, so small drops are still in the list once this returns.
+        if not self._path_queue_timer.isActive():
+            self.add_queued_paths()
+
+    @Slot()
+    def add_queued_paths(self):
+        """
+        Add queued paths until PATH_QUEUE_TIME_BUDGET_SECONDS is used up, then yield to the event loop, so dropping
+        thousands of files doesn't freeze the window. The rest are added over the next event loop turns.
+        """
+        # Folders report on their own once they're scanned. This reports the files that were added directly.
+        parse_cache = retrieve_parse_cache()
+        hits, misses = parse_cache.hits, parse_cache.misses
+        deadline = time.perf_counter() + PATH_QUEUE_TIME_BUDGET_SECONDS
+
+        # At least one path per turn, so even files that take longer than the budget to parse get added.
+        while self._queued_paths:
+            file_path, settings = self._queued_paths.popleft()
+            if not self.add_path(file_path, settings):
+                self._path_queue_scan_report.duplicate_file_count += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+        parse_cache.flush_last_used()
+        self._path_queue_scan_report.reused_file_count += parse_cache.hits - hits
+        self._path_queue_scan_report.parsed_file_count += parse_cache.misses - misses
+
+        if self._queued_paths:
+            self._path_queue_timer.start()
+            self.path_queue_progress.emit(self._queued_path_count - len(self._queued_paths), self._queued_path_count)
+            return
+
+        scan_report = self._path_queue_scan_report
+        self._finish_path_queue()
+        if scan_report.reused_file_count or scan_report.parsed_file_count or scan_report.duplicate_file_count:
+            self.scan_report_ready.emit(scan_report)
+
+    def cancel_path_queue(self):
+        """Drop the paths that weren't added yet. The ones that were stay in the list, but aren't reported."""
+        self._queued_paths.clear()
+        if self._queued_path_count:
+            self._finish_path_queue()
+
+    def _finish_path_queue(self):
+        self._path_queue_timer.stop()
+        self._queued_path_count = 0
+        self._path_queue_scan_report = ScanReport()
+        self.path_queue_finished.emit()
+
+    def cancel_paths_waiting_for_warm_up(self):
+        if self._paths_waiting_for_warm_up:
+            retrieve_guessit_warm_up().finished.disconnect(self.add_paths_waiting_for_warm_up)
+            self._paths_waiting_for_warm_up.clear()
+
+    def cancel_adding_paths(self):
+        """Stop adding dropped files and folders. Files already in the widget stay there."""
+        self.cancel_paths_waiting_for_warm_up()
+        self.cancel_path_queue()
+        self.cancel_folder_scans()
+
+    def is_adding_paths(self) -> bool:
+        """True while dropped files and folders are still waiting for the warm-up, queued, or being scanned."""
+        return bool(self._paths_waiting_for_warm_up or self._queued_paths
+                    or any(not folder_scan.is_finished and not folder_scan.is_cancelled
+                           for folder_scan in self.folder_scans))
+
+    def add_path(self, file_path: str, settings: SettingsSnapshot | None = None) -> bool:
         """
-        Add a single file or file(s) in a directory to QListWidget.
+        Add a single file or file(s) in a directory to the list. Files that don't pass the settings' FilePrefilter
+        (E.g., a .nfo or a sample dropped next to the movie) are skipped, the same as in dropped folders.
+        Returns False if it's a file that was already in the list.
         TODO: Rename these variables. I hate Python and it is unclear which variable is a Path or String object.
         """
         path = Path(file_path)
+        # Capture the settings once for every file in this batch.
+        if settings is None:
+            settings = retrieve_settings_snapshot()
 
         if path.is_file():
-            self.add_file_to_list(file_path)
+            if not retrieve_file_prefilter(settings).accepts_file(file_path):
+                return True
+
+            return self.add_file_to_list(file_path, settings)
 
         if path.is_dir():
-            # Iterate through a folder recursively and add all files to the QListWidget.
-            for file in path.rglob("*"):
-                # Do not add the folder as a file.
-                if file.is_file():
-                    self.add_file_to_list(str(file))
+            # Scan the folder recursively in the background. Rows are added as files are found.
+            self.add_folder_to_list(file_path, settings)
+
+        return True
+
+    def add_folder_to_list(self, folder_path: str, settings: SettingsSnapshot | None = None,
+                           folder_watcher: FolderWatcher | None = None):
+        """
+        Non-blocking. Every file in the folder and its subfolders is added as the folder is scanned.
+        A folder_watcher for the folder starts watching it once the scan is done.
+        """
+        folder_scan = FolderScan(self, folder_path, settings if settings is not None else retrieve_settings_snapshot(),
+                                 folder_watcher)
+        # Not a lambda holding on to folder_scan: that would keep its wrapper alive inside its own connection.
+        folder_scan.finished.connect(self.remove_finished_folder_scans)
+        self.folder_scans.append(folder_scan)
+        folder_scan.start()
+
+    @Slot()
+    def remove_finished_folder_scans(self):
+        for folder_scan in [folder_scan for folder_scan in self.folder_scans if folder_scan.is_finished]:
+            # This was the last reference, so the scan and its workers are deleted once this slot returns.
+            self.folder_scans.remove(folder_scan)
+
+            if not folder_scan.is_cancelled:
+                self.scan_report_ready.emit(folder_scan.scan_report)
+
+    def cancel_folder_scans(self):
+        for folder_scan in self.folder_scans:
+            folder_scan.cancel()
+
+    def watch_folder(self, folder_path: str, settings: SettingsSnapshot | None = None):
+        """
+        Add every file in the folder, like dropping it, then keep adding and removing files as they're added to
+        and removed from the folder until stop_watching_folder(). Only the files that changed are parsed.
+        """
+        self.stop_watching_folder()
+        if settings is None:
+            settings = retrieve_settings_snapshot()
+
+        self.folder_watcher = FolderWatcher(folder_path, retrieve_file_prefilter(settings), self)
+        self.folder_watcher.files_added.connect(self.add_watched_files)
+        self.folder_watcher.files_removed.connect(self.remove_watched_files)
+        # Not folder_watcher.start(), which would scan the whole folder again, on the GUI thread.
+        self.add_folder_to_list(folder_path, settings, self.folder_watcher)
+
+    def stop_watching_folder(self):
+        """Files already in the widget stay there."""
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
+            self.folder_watcher.deleteLater()
+            self.folder_watcher = None
+
+    @Slot(list)
+    def add_watched_files(self, file_paths: list[str]):
+        # Files that are already in the list (E.g., found by the folder's first scan) are skipped by the FileIndex.
+        self.add_paths(file_paths)
+
+    @Slot(list)
+    def remove_watched_files(self, file_paths: list[str]):
+        removed_file_paths = set(file_paths)
+
+        # Backwards, so the rows that are left to check don't move.
+        for row in reversed(range(len(self.media_records))):
+            if self.media_records[row].full_file_path in removed_file_paths:
+                self.remove_row(row)
+                self.watched_file_removed.emit(row)
+
+    @Slot()
+    def show_parallel_ingestion_error(self):
+        ErrorPopupWidget("Could not analyze all of the files in the folder!").exec()
+
+    @Slot(list)
+    def add_media_records_to_list(self, media_records: list[MediaRecord]):
+        """
+        All at once, so the view only updates once. The files should already be claimed in the FileIndex, which
+        add_file_to_list() and FolderScan do before parsing, so they aren't checked (Or added) again here.
+        """
+        self.input_files_model.append_media_records(media_records)
+
+    def add_file_to_list(self, file_path: str, settings: SettingsSnapshot | None = None) -> bool:
+        """
+        Create a MediaRecord from a file path and insert the record into the widget list.
+        Files that are already in the list (Or hardlinks to them) are skipped without being parsed: returns False.
+        """
+        if not self.file_index.add(file_path):
+            return False
+
+        self.add_media_record_to_list(MediaRecord(file_path, settings=settings))
+        return True
+
+    def add_media_record_to_list(self, media_record: MediaRecord):
+        # Doesn't check the FileIndex. Callers that didn't claim the file there yet should use add_file_to_list().
+        self.input_files_model.append_media_records([media_record])
+
+    def remove_row(self, row: int) -> MediaRecord | None:
+        """Returns the removed MediaRecord, or None if there's no such row."""
+        media_record = self.input_files_model.pop(row)
+        if media_record is not None:
+            self.file_index.remove(media_record.full_file_path)
 
-    def add_file_to_list(self, file_path: str):
-        """Create a MediaRecord from a file path and insert the record into the widget list."""
-        media_record = MediaRecord(file_path)
+        return media_record
 
-        # Set the displayed text for the file and tie the corresponding MediaRecord to that list entry.
-        list_item = QListWidgetItem(media_record.file_name)
-        list_item.setData(Qt.ItemDataRole.UserRole, media_record)
-        self.addItem(list_item)
+    def clear(self):
+        # Otherwise, queued files and files from folders that are still being scanned would show up again.
+        self.cancel_adding_paths()
+        self.input_files_model.clear()
+        self.file_index.clear()
 
     def show_context_menu_on_right_click(self, position: QPoint):
-        """Show a context menu when a user right-clicks on a QListWidgetItem."""
-        item = self.itemAt(position)
-        if item is None:
+        """Show a context menu when a user right-clicks on a row."""
+        index = self.indexAt(position)
+        if not index.isValid():
             return
 
-        # Recover the MediaRecord data from the QListWidgetItem.
-        media_record: MediaRecord = item.data(Qt.ItemDataRole.UserRole)
+        media_record: MediaRecord = self.media_records[index.row()]
 
         context_menu = QMenu(self)
         metadata_choice = context_menu.addAction("Show metadata")
@@ -86,7 +508,8 @@ class DragAndDropFilesWidget(QListWidget):
 
         metadata_dialog_layout = QVBoxLayout(metadata_dialog)
 
-        for key, value in media_record.metadata.items():
+        # Records only keep the metadata fields needed for matching. Re-parse the file to show everything.
+        for key, value in media_record.retrieve_full_metadata().items():
             metadata_dialog_layout.addWidget(QLabel(f"{key}: {value}"))
 
         metadata_dialog.exec()
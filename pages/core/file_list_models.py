@@ -0,0 +1,120 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex
+from PySide6.QtGui import QColor
+
+from backend.media_record import MediaRecord
+from backend.media_record_collection import MediaRecordCollection
+
+# Background of output file names that are missing a field (Title, year, etc.).
+MISSING_FIELDS_COLOR = QColor(255, 80, 80)
+
+
+class InputFilesModel(QAbstractListModel):
+    """
+    The input files, one row per MediaRecord of a MediaRecordCollection. Rows only exist as indexes into the
+    collection, so there's no per-row Qt object, and many rows can be added with a single beginInsertRows().
+    The collection should only be changed through this model, so views are told about it.
+    """
+
+    def __init__(self, media_records: MediaRecordCollection, parent=None):
+        super().__init__(parent)
+        self.media_records = media_records
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        # A list has no children.
+        return 0 if parent.isValid() else len(self.media_records)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.media_records[index.row()].file_name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.media_records[index.row()].full_file_path
+        if role == Qt.ItemDataRole.UserRole:
+            return self.media_records[index.row()]
+
+        return None
+
+    def append_media_records(self, media_records: list[MediaRecord]):
+        if not media_records:
+            return
+
+        row = len(self.media_records)
+        self.beginInsertRows(QModelIndex(), row, row + len(media_records) - 1)
+        self.media_records.extend(media_records)
+        self.endInsertRows()
+
+    def pop(self, row: int) -> MediaRecord | None:
+        """Remove and return the record at row, or None if there's no such row."""
+        if not 0 <= row < len(self.media_records):
+            return None
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        media_record = self.media_records.pop(row)
+        self.endRemoveRows()
+
+        return media_record
+
+    def clear(self):
+        self.beginResetModel()
+        self.media_records.clear()
+        self.endResetModel()
+
+
+class OutputFilesModel(QAbstractListModel):
+    """The matched file names, one row each. Names that are missing a field are highlighted."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_names: list[str] = []
+        # Same order as file_names.
+        self.has_missing_fields: list[bool] = []
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.file_names)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        # The tooltip shows names too long to fit.
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return self.file_names[index.row()]
+        if role == Qt.ItemDataRole.BackgroundRole and self.has_missing_fields[index.row()]:
+            return MISSING_FIELDS_COLOR
+
+        return None
+
+    def append_file_names(self, file_names: list[str], has_missing_fields: list[bool] | None = None):
+        if not file_names:
+            return
+
+        row = len(self.file_names)
+        self.beginInsertRows(QModelIndex(), row, row + len(file_names) - 1)
+        self.file_names.extend(file_names)
+        self.has_missing_fields.extend(has_missing_fields if has_missing_fields is not None
+                                       else [False] * len(file_names))
+        self.endInsertRows()
+
+    def set_file_name(self, row: int, file_name: str):
+        self.file_names[row] = file_name
+        self.dataChanged.emit(self.index(row), self.index(row), [Qt.ItemDataRole.DisplayRole])
+
+    def pop(self, row: int) -> str | None:
+        """Remove and return the file name at row, or None if there's no such row."""
+        if not 0 <= row < len(self.file_names):
+            return None
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.has_missing_fields.pop(row)
+        file_name = self.file_names.pop(row)
+        self.endRemoveRows()
+
+        return file_name
+
+    def clear(self):
+        self.beginResetModel()
+        self.file_names.clear()
+        self.has_missing_fields.clear()
+        self.endResetModel()
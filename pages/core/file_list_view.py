@@ -0,0 +1,52 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Signal, Slot
+from PySide6.QtWidgets import QTableView, QAbstractItemView, QHeaderView
+
+
+class FileListView(QTableView):
+    """
+    One of the core page's file boxes: a single-column list of a model's rows. Rows come from the model instead of a
+    QListWidgetItem each, so hundreds of thousands of them can be added, cleared, and scrolled through quickly.
+    Also has the QListWidget methods the core page uses to sync the boxes: count(), currentRow(), setCurrentRow(),
+    and currentRowChanged.
+
+    A QTableView, not a QListView: QListView lays out every row whenever rows are added, while QTableView with fixed
+    row heights only looks at the rows on screen. Long names are elided instead of scrolled to (See their tooltips).
+    """
+    currentRowChanged = Signal(int)
+
+    def __init__(self, model: QAbstractListModel, parent=None):
+        super().__init__(parent)
+        # Every row is a single line of text with the same height, so Qt never measures or lays out each row.
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 4)
+        self.verticalHeader().hide()
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.horizontalHeader().hide()
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+
+        # Owned by this view, so it's deleted with it.
+        model.setParent(self)
+        self.setModel(model)
+        self.selectionModel().currentRowChanged.connect(self.emit_current_row_changed)
+
+    def count(self) -> int:
+        return self.model().rowCount()
+
+    def currentRow(self) -> int:
+        """-1 if there's no current row."""
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row: int):
+        # Rows that don't exist (E.g., the other box is longer) clear the current row.
+        self.setCurrentIndex(self.model().index(row, 0))
+
+    def file_names(self) -> list[str]:
+        """The displayed text of every row."""
+        return [self.model().index(row, 0).data() for row in range(self.count())]
+
+    @Slot(QModelIndex, QModelIndex)
+    def emit_current_row_changed(self, current: QModelIndex, _previous: QModelIndex):
+        self.currentRowChanged.emit(current.row())
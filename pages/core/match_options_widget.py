@@ -1,29 +1,28 @@
 from PySide6.QtCore import Qt, Slot, QThreadPool
-from PySide6.QtGui import QColor, QIcon, QPixmap, QCursor
-from PySide6.QtWidgets import QDialog, QListWidget, QVBoxLayout, QBoxLayout, QLabel, QWidget, QHBoxLayout, QLineEdit, \
-    QPushButton, QListWidgetItem, QApplication, QCheckBox
+from PySide6.QtGui import QIcon, QPixmap, QCursor
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QBoxLayout, QLabel, QWidget, QHBoxLayout, QLineEdit, \
+    QPushButton, QApplication, QCheckBox, QProgressBar
 
 from backend.api_key_config import api_key_config
+from backend.core_backend import MatchedFileNames
 from backend.database_worker import DatabaseWorker
-from backend.media_record import MediaRecord
+from backend.media_record_collection import MediaRecordCollection
 from backend.utils import resource_path
 from databases.database import Database
 from databases.file_name_match_db import FileNameMatchDB
-from databases.omdb_python_db import OMDBPythonDB
-from databases.themoviedb_python_db import TheMovieDBPythonDB
-from databases.tvmaze_python_db import TVMazePythonDB
 from pages.core.api_key_prompt_widget import ApiKeyPromptWidget
 from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+from pages.core.output_files_widget import OutputFilesWidget
 
 
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals, too-many-instance-attributes
 class MatchOptionsWidget(QDialog):
     """
     Popup to allow users to choose a movie or series database to match to.
     Handles database matching and populating the output box with matched file names.
     """
 
-    def __init__(self, files_widget: DragAndDropFilesWidget, output_box: QListWidget, parent=None):
+    def __init__(self, files_widget: DragAndDropFilesWidget, output_box: OutputFilesWidget, parent=None):
         super().__init__(parent)
 
         self.setWindowTitle("Match Options")
@@ -32,26 +31,43 @@ class MatchOptionsWidget(QDialog):
 
         layout = QVBoxLayout(self)
 
-        # Retrieve media records from files_widget.
-        self.media_records = []
-        for index in range(self.files_widget.count()):
-            list_element = self.files_widget.item(index)
-            media_record = list_element.data(Qt.ItemDataRole.UserRole)
-            self.media_records.append(media_record)
-
-        self.is_tv_series = MediaRecord.is_tv_series(self.media_records)
-
-        self.populate_match_options_layout(layout, self.media_records)
+        # A snapshot of the files_widget's media records. Its collection keeps changing on the GUI thread (E.g., when a
+        # watched folder changes), while the database worker reads this one from its own thread.
+        self.media_records = MediaRecordCollection(list(self.files_widget.media_records))
+
+        self.is_tv_series = self.media_records.is_tv_series()
+
+        # Disabled during a match, unlike the cancel button below it.
+        self.match_options_container = QWidget()
+        match_options_layout = QVBoxLayout(self.match_options_container)
+        match_options_layout.setContentsMargins(0, 0, 0, 0)
+        self.populate_match_options_layout(match_options_layout, self.media_records)
+        layout.addWidget(self.match_options_container)
+
+        # Shown while a database match is running.
+        match_progress_layout = QHBoxLayout()
+        self.match_progress_bar = QProgressBar()
+        self.match_progress_bar.setFormat("Matching: %v / %m")
+        self.match_progress_bar.hide()
+        self.cancel_match_button = QPushButton(" ✋ Cancel  ")
+        self.cancel_match_button.clicked.connect(self.cancel_match)
+        self.cancel_match_button.hide()
+        match_progress_layout.addWidget(self.match_progress_bar)
+        match_progress_layout.addWidget(self.cancel_match_button)
+        layout.addLayout(match_progress_layout)
 
         # Used to disable closing this window when database calls are happening.
         self._busy = False
+        # The running (Or last) database match. Not dropped when it finishes, since its thread may still be returning.
+        self.database_worker: DatabaseWorker | None = None
 
     def closeEvent(self, event):
         """
         Disallow closing the MatchOptionsWidget with the X button, Alt-F4, or the window manager
-        if the application is busy doing a database query.
+        if the application is busy doing a database query. The query is cancelled instead, which closes it.
         """
         if self._busy:
+            self.cancel_match()
             event.ignore()
         else:
             super().closeEvent(event)
@@ -59,37 +75,39 @@ class MatchOptionsWidget(QDialog):
     def reject(self):
         """
         Disallow closing the MatchOptionsWidget with the escape key or programmatically
-        if the application is busy doing a database query.
+        if the application is busy doing a database query. The query is cancelled instead, which closes it.
         """
-        if not self._busy:
+        if self._busy:
+            self.cancel_match()
+        else:
             super().reject()
 
-    def populate_match_options_layout(self, layout: QBoxLayout, media_records: list[MediaRecord]):
+    def populate_match_options_layout(self, layout: QBoxLayout, media_records: MediaRecordCollection):
         """Populates the layout with UI components based on MediaRecords."""
         # Display an error if the input contains a mix of movie and TV show files.
-        if MediaRecord.has_movies(media_records) and MediaRecord.has_episodes(media_records):
+        if media_records.has_movies() and media_records.has_episodes():
             layout.addWidget(QLabel("Cannot rename both movies and tv series at the same time!"))
             return
 
         # Display an error if there are multiple TV series for an input list of episodes.
-        if not MediaRecord.has_movies(media_records) and len(MediaRecord.get_unique_titles(media_records)) > 1:
+        if not media_records.has_movies() and len(media_records.get_unique_titles()) > 1:
             layout.addWidget(QLabel("Cannot rename multiple tv series at the same time!"))
             return
 
         # Contains only episodes.
-        if not MediaRecord.has_movies(media_records):
+        if not media_records.has_movies():
             layout.addLayout(self.create_layout_for_episode_matching(media_records))
         # Contains only movies.
-        elif not MediaRecord.has_episodes(media_records):
+        elif not media_records.has_episodes():
             layout.addLayout(self.create_layout_for_movie_matching(media_records))
 
-    def create_layout_for_episode_matching(self, media_records: list[MediaRecord]) -> QVBoxLayout:
+    def create_layout_for_episode_matching(self, media_records: MediaRecordCollection) -> QVBoxLayout:
         # Mapping of database buttons to the type of media they support.
         database_specs = self.retrieve_dictionary_of_db_buttons_with_mappings()
 
         episode_matching_layout = QVBoxLayout()
 
-        unique_titles = MediaRecord.get_unique_titles(media_records)
+        unique_titles = media_records.get_unique_titles()
         series_title = unique_titles.pop() if unique_titles else "Could not match title!"
 
         # Add UI and logic to set a custom series name in case guessit retrieved an incorrect show name.
@@ -99,8 +117,7 @@ class MatchOptionsWidget(QDialog):
         title_input_box = QLineEdit()
         title_input_box.setText(series_title)
         title_input_box.textEdited.connect(lambda:
-                                           MediaRecord.update_title_for_all_records(
-                                               title_input_box.text(), media_records))
+                                           media_records.update_title_for_all_records(title_input_box.text()))
         title_update_container_layout.addWidget(title_input_box)
 
         # Add UI and logic to set a custom year for a series.
@@ -112,8 +129,7 @@ class MatchOptionsWidget(QDialog):
         if media_records[0].year is not None:
             year_input_box.setText(str(media_records[0].year))
         year_input_box.textEdited.connect(lambda:
-                                          MediaRecord.update_year_for_all_records(
-                                              year_input_box.text(), media_records))
+                                          media_records.update_year_for_all_records(year_input_box.text()))
         year_update_container_layout.addWidget(year_input_box)
 
         absolute_order_checkbox = QCheckBox("Absolute TV Order?")
@@ -134,7 +150,7 @@ class MatchOptionsWidget(QDialog):
 
         return episode_matching_layout
 
-    def create_layout_for_movie_matching(self, media_records: list[MediaRecord]) -> QVBoxLayout:
+    def create_layout_for_movie_matching(self, media_records: MediaRecordCollection) -> QVBoxLayout:
         # Mapping of database buttons to the type of media they support.
         database_specs = self.retrieve_dictionary_of_db_buttons_with_mappings()
 
@@ -156,22 +172,17 @@ class MatchOptionsWidget(QDialog):
     def retrieve_dictionary_of_db_buttons_with_mappings(self) -> dict[QPushButton, list[str]]:
         """Returns a dictionary of (QPushButton, Whether the database button supports movies and/or shows)"""
         the_movie_db_button = QPushButton(" TheMovieDB ")
-        the_movie_db_button.clicked.connect(lambda: self.start_match(
-            TheMovieDBPythonDB(self.media_records, self.is_tv_series), "the_movie_db"
-        ))
+        the_movie_db_button.clicked.connect(self.start_the_movie_db_match)
         the_movie_db_button.setIcon(QIcon(QPixmap(resource_path("resources/TheMovieDB Logo.png"))))
         the_movie_db_button.setObjectName("dbBtn")
 
         omdb_db_button = QPushButton(" OMDB ")
-        omdb_db_button.clicked.connect(lambda: self.start_match(
-            OMDBPythonDB(self.media_records, self.is_tv_series), "omdb"
-        ))
+        omdb_db_button.clicked.connect(self.start_omdb_match)
         omdb_db_button.setIcon(QIcon(QPixmap(resource_path("resources/OMDB Logo.png"))))
         omdb_db_button.setObjectName("dbBtn")
 
         tv_maze_db_button = QPushButton(" TVMaze ")
-        tv_maze_db_button.clicked.connect(lambda: self.start_match(
-            TVMazePythonDB(self.media_records, self.is_tv_series)))
+        tv_maze_db_button.clicked.connect(self.start_tv_maze_match)
         tv_maze_db_button.setIcon(QIcon(QPixmap(resource_path("resources/TVMaze Logo.png"))))
         tv_maze_db_button.setObjectName("dbBtn")
 
@@ -188,6 +199,28 @@ class MatchOptionsWidget(QDialog):
 
         return result
 
+    # The online databases are imported on first use. Their libraries (And requests) take ~70 ms to import, so they're
+    # kept out of startup.
+    # pylint: disable=import-outside-toplevel
+    @Slot()
+    def start_the_movie_db_match(self):
+        from databases.themoviedb_python_db import TheMovieDBPythonDB
+
+        self.start_match(TheMovieDBPythonDB(self.media_records, self.is_tv_series), "the_movie_db")
+
+    @Slot()
+    def start_omdb_match(self):
+        from databases.omdb_python_db import OMDBPythonDB
+
+        self.start_match(OMDBPythonDB(self.media_records, self.is_tv_series), "omdb")
+
+    @Slot()
+    def start_tv_maze_match(self):
+        from databases.tvmaze_python_db import TVMazePythonDB
+
+        self.start_match(TVMazePythonDB(self.media_records, self.is_tv_series))
+    # pylint: enable=import-outside-toplevel
+
     def start_match(self, database: Database, json_key: str = None):
         """
         Starts a non-blocking database query to match our MediaRecords.
@@ -203,47 +236,72 @@ class MatchOptionsWidget(QDialog):
             if not response:
                 return
 
-        # Block UI clicks while the database call is running.
-        self.setEnabled(False)
-        # Change the cursor to a waiting cursor and restore it when the output box receives the matched titles.
-        QApplication.setOverrideCursor(QCursor(Qt.CursorShape.WaitCursor))
+        # Block UI clicks, except for the cancel button, while the database call is running.
+        self.match_options_container.setEnabled(False)
+        # Change the cursor to a busy cursor (The cancel button can still be clicked) and restore it when done.
+        QApplication.setOverrideCursor(QCursor(Qt.CursorShape.BusyCursor))
+        self.match_progress_bar.setMaximum(len(self.media_records))
+        self.match_progress_bar.setValue(0)
+        self.match_progress_bar.show()
+        self.cancel_match_button.show()
 
         # Clear output box before populating it.
         self.output_box.clear()
 
-        # Start the database matching.
-        database_worker = DatabaseWorker(database)
-        database_worker.finished.connect(self.populate_output_box)
-        database_worker.error.connect(self.handle_database_query_error)
+        # Start the database matching. Kept (Not auto-deleted by the thread pool) so it can be cancelled.
+        self.database_worker = DatabaseWorker(database)
+        self.database_worker.setAutoDelete(False)
+        self.database_worker.chunk_ready.connect(self.populate_output_box)
+        self.database_worker.progress.connect(self.show_match_progress)
+        self.database_worker.finished.connect(self.finish_match)
+        self.database_worker.error.connect(self.handle_database_query_error)
         self._busy = True
-        QThreadPool.globalInstance().start(database_worker)
+        QThreadPool.globalInstance().start(self.database_worker)
 
-    @Slot(list)
-    def populate_output_box(self, matched_media_titles: list[str]):
-        for title in matched_media_titles:
-            list_item = QListWidgetItem()
+    @Slot()
+    def cancel_match(self):
+        """Stops the running database match before its next request. finish_match() then closes this window."""
+        if self._busy:
+            self.database_worker.cancel()
+            self.cancel_match_button.setEnabled(False)
 
-            # If any element (title, year, etc.) could not be found, highlight (light-red) the bad matched name.
-            if "{None}" in title:
-                title = title.replace("{None}", "")
-                list_item.setBackground(QColor(255, 80, 80))
+    @Slot(object)
+    def populate_output_box(self, matched_file_names: MatchedFileNames):
+        # A chunk of rows in one model update. Names missing an element (title, year, etc.) are highlighted (light-red).
+        self.output_box.add_file_names(matched_file_names.file_names, matched_file_names.has_missing_fields)
 
-            list_item.setText(title)
-            self.output_box.addItem(list_item)
+    @Slot(int, int)
+    def show_match_progress(self, matched_count: int, total_count: int):
+        self.match_progress_bar.setMaximum(total_count)
+        self.match_progress_bar.setValue(matched_count)
 
-        # Return the UI state to normal and close the MatchOptionsWidget window with an accept code.
-        self.setEnabled(True)
-        QApplication.restoreOverrideCursor()
-        self._busy = False
-        self.accept()
+    @Slot()
+    def finish_match(self):
+        is_cancelled = self.database_worker.is_cancelled()
+        self.restore_ui_state()
+
+        if is_cancelled:
+            # Names matched before cancelling can't be renamed without the rest, so they're cleared.
+            self.output_box.clear()
+            self.reject()
+        else:
+            # Close the MatchOptionsWidget window with an accept code.
+            self.accept()
 
     @Slot()
     def handle_database_query_error(self):
         # Return the UI state to normal and close the MatchOptionsWidget window.
-        self.setEnabled(True)
+        self.restore_ui_state()
+        self.output_box.clear()
+        self.close()
+
+    def restore_ui_state(self):
+        self.match_options_container.setEnabled(True)
+        self.match_progress_bar.hide()
+        self.cancel_match_button.hide()
+        self.cancel_match_button.setEnabled(True)
         QApplication.restoreOverrideCursor()
         self._busy = False
-        self.close()
 
 
 def check_if_api_key_exists_otherwise_prompt_user(json_key: str) -> bool:
@@ -0,0 +1,27 @@
+from pages.core.file_list_models import OutputFilesModel
+from pages.core.file_list_view import FileListView
+
+
+class OutputFilesWidget(FileListView):
+    """The output box: the file names that the input files will be renamed to, in the same order."""
+
+    def __init__(self, parent=None):
+        super().__init__(OutputFilesModel(), parent)
+        self.output_files_model: OutputFilesModel = self.model()
+
+    def add_file_names(self, file_names: list[str], has_missing_fields: list[bool] | None = None):
+        """All at once, so the view only updates once. has_missing_fields highlights names that are missing a field."""
+        self.output_files_model.append_file_names(file_names, has_missing_fields)
+
+    def set_file_name(self, row: int, file_name: str):
+        self.output_files_model.set_file_name(row, file_name)
+
+    def file_names(self) -> list[str]:
+        return list(self.output_files_model.file_names)
+
+    def remove_row(self, row: int) -> str | None:
+        """Returns the removed file name, or None if there's no such row."""
+        return self.output_files_model.pop(row)
+
+    def clear(self):
+        self.output_files_model.clear()
@@ -2,7 +2,7 @@ import os.path
 import sys
 
 from PySide6.QtCore import Slot, QCoreApplication, QProcess, QUrl
-from PySide6.QtGui import QGuiApplication, Qt, QDesktopServices
+from PySide6.QtGui import Qt, QDesktopServices
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QPushButton, QMessageBox, QListWidget, \
     QHBoxLayout, QToolButton, QStyle, QFileDialog, QListWidgetItem
 
@@ -12,19 +12,6 @@ from backend.settings_backend import (retrieve_theme_from_settings, save_new_the
                                       delete_and_recreate_settings_file, get_settings_file_path)
 
 
-def set_color_theme_on_startup():
-    """
-    Grabs the desired theme from settings and sets the color theme for the UI before other elements are drawn.
-    Setting the color theme after elements have been drawn does not work.
-    """
-
-    if retrieve_theme_from_settings() == "Light":
-        QGuiApplication.styleHints().setColorScheme(Qt.ColorScheme.Light)
-    else:
-        # Default to 'Dark' otherwise.
-        QGuiApplication.styleHints().setColorScheme(Qt.ColorScheme.Dark)
-
-
 class SettingsPage(QWidget):
     """Settings page for miscellaneous options/settings."""
 
@@ -72,8 +59,8 @@ class SettingsPage(QWidget):
         reset_button = QPushButton("Reset All Settings to Default")
         reset_button.clicked.connect(self.reset_settings)
 
-        # Grabs settings from settings.json and displays them to the user on startup.
-        set_color_theme_on_startup()
+        # Grabs settings from settings.json and displays them to the user. The color theme is set by MainWindow, since
+        # this page is only built once it's first selected, after the other elements are drawn.
         self.display_excluded_folders_from_settings()
 
         settings_page_layout.addWidget(theme_label)
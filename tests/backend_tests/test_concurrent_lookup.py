@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from backend.concurrent_lookup import iterate_lookups_in_order
+from backend.media_record import MediaRecord
+from databases.database import MatchCancelled
+
+MEDIA_RECORDS = [MediaRecord(f"Movie {i}.mkv", {"title": f"Movie {i}", "container": "mkv"}) for i in range(8)]
+
+
+def test_results_are_in_input_order_when_later_lookups_finish_first():
+    def _lookup(media_record: MediaRecord) -> str:
+        # The first movie takes the longest.
+        time.sleep(0.01 * (len(MEDIA_RECORDS) - MEDIA_RECORDS.index(media_record)))
+        return media_record.title
+
+    assert list(iterate_lookups_in_order(_lookup, MEDIA_RECORDS, max_workers=4)) == \
+           [media_record.title for media_record in MEDIA_RECORDS]
+
+
+def test_no_more_than_max_workers_lookups_run_at_once():
+    running = []
+    most_running = []
+    lock = threading.Lock()
+
+    def _lookup(media_record: MediaRecord) -> str:
+        with lock:
+            running.append(media_record)
+            most_running.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(media_record)
+        return media_record.title
+
+    list(iterate_lookups_in_order(_lookup, MEDIA_RECORDS, max_workers=3))
+
+    assert max(most_running) == 3
+
+
+def test_first_exception_in_input_order_is_raised():
+    def _lookup(media_record: MediaRecord) -> str:
+        if media_record.title == "Movie 2":
+            raise MatchCancelled()
+        return media_record.title
+
+    results = []
+    with pytest.raises(MatchCancelled):
+        for result in iterate_lookups_in_order(_lookup, MEDIA_RECORDS, max_workers=4):
+            results.append(result)
+
+    assert results == ["Movie 0", "Movie 1"]
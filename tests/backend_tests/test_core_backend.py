@@ -3,19 +3,27 @@ import os
 import pytest
 
 from backend.core_backend import (match_titles_using_db_and_format, get_invalid_file_names_and_fixes,
-                                  perform_file_renaming, create_formatted_title)
+                                  perform_file_renaming, create_formatted_title, create_formatted_file_name,
+                                  iterate_matched_file_names)
 from backend.media_record import MediaRecord
+from databases.database import MatchCancelled
 from databases.file_name_match_db import FileNameMatchDB
 
 
+class OneAtATimeFileNameMatchDB(FileNameMatchDB):
+    """Streams movies one at a time, like TheMovieDB and OMDB do."""
+    looks_up_movies_one_at_a_time = True
+
+
 def test_match_titles_using_db_and_format_using_episodes_list_success():
     media_records = [MediaRecord("The.West.Wing.S01E01.Pilot.mkv"), MediaRecord("The.West.Wing.S01E08.Enemies.mkv")]
     database = FileNameMatchDB(media_records, True)
 
     matched_titles = match_titles_using_db_and_format(database)
 
-    assert matched_titles[0] == "S01E01 - Pilot.mkv"
-    assert matched_titles[1] == "S01E08 - Enemies.mkv"
+    assert matched_titles.file_names[0] == "S01E01 - Pilot.mkv"
+    assert matched_titles.file_names[1] == "S01E08 - Enemies.mkv"
+    assert matched_titles.has_missing_fields == [False, False]
 
 
 def test_match_titles_using_db_and_format_using_movies_list_success():
@@ -24,8 +32,40 @@ def test_match_titles_using_db_and_format_using_movies_list_success():
 
     matched_titles = match_titles_using_db_and_format(database)
 
-    assert matched_titles[0] == "The Lion King (1994).mkv"
-    assert matched_titles[1] == "The Lion King (2019).mkv"
+    assert matched_titles.file_names[0] == "The Lion King (1994).mkv"
+    assert matched_titles.file_names[1] == "The Lion King (2019).mkv"
+
+
+def test_iterate_matched_file_names_yields_a_chunk_per_movie_in_order():
+    media_records = [MediaRecord("The Lion King (1994).mkv"), MediaRecord("Thunderbolts.mkv"),
+                     MediaRecord("The Lion King (2019).mkv")]
+
+    chunks = list(iterate_matched_file_names(OneAtATimeFileNameMatchDB(media_records)))
+
+    assert [chunk.file_names for chunk in chunks] == [["The Lion King (1994).mkv"], ["Thunderbolts ().mkv"],
+                                                      ["The Lion King (2019).mkv"]]
+    # Same names as matching the whole batch at once.
+    batch = match_titles_using_db_and_format(FileNameMatchDB(media_records))
+    assert sum((chunk.file_names for chunk in chunks), []) == batch.file_names
+    assert sum((chunk.has_missing_fields for chunk in chunks), []) == batch.has_missing_fields
+
+
+def test_iterate_matched_file_names_yields_episodes_as_one_chunk():
+    media_records = [MediaRecord("The.West.Wing.S01E01.Pilot.mkv"), MediaRecord("The.West.Wing.S01E08.Enemies.mkv")]
+
+    chunks = list(iterate_matched_file_names(OneAtATimeFileNameMatchDB(media_records, True)))
+
+    assert [chunk.file_names for chunk in chunks] == [["S01E01 - Pilot.mkv", "S01E08 - Enemies.mkv"]]
+
+
+def test_iterate_matched_file_names_stops_once_cancelled():
+    database = OneAtATimeFileNameMatchDB([MediaRecord("The Lion King (1994).mkv"), MediaRecord("Thunderbolts.mkv")])
+    chunks = iterate_matched_file_names(database)
+
+    assert next(chunks).file_names == ["The Lion King (1994).mkv"]
+    database.cancel()
+    with pytest.raises(MatchCancelled):
+        next(chunks)
 
 
 def test_get_invalid_file_names_and_fixes():
@@ -113,3 +153,19 @@ def test_create_formatted_movie_title_correctly():
     formatted_title = create_formatted_title(format_template, movie_context)
 
     assert formatted_title == "2025 Warfare (2025)"
+
+
+def test_create_formatted_file_name_flags_missing_fields():
+    format_template = "{series_name} - S{season_number}E{episode_number} - {episode_title}"
+    series_context: dict = {
+        "series_name": "The Blacklist",
+        "year": None,
+        "season_number": "03",
+        "episode_number": "10",
+        "episode_title": None
+    }
+
+    assert create_formatted_file_name(format_template, series_context) == ("The Blacklist - S03E10 - ", True)
+    # The year is missing too, but the format doesn't use it.
+    series_context["episode_title"] = "The Front"
+    assert create_formatted_file_name(format_template, series_context) == ("The Blacklist - S03E10 - The Front", False)
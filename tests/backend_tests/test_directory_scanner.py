@@ -0,0 +1,69 @@
+import os
+import threading
+from pathlib import Path
+
+from _pytest.monkeypatch import MonkeyPatch
+from pytestqt.qtbot import QtBot
+
+from backend.directory_scanner import DirectoryScannerWorker, scan_directory
+
+
+def _make_tree(tmp_path: Path) -> list[str]:
+    """Create a folder tree with files at different depths and return every file path."""
+    file_paths = []
+    for folder in ("", "Season 1", "Season 1/Extras", "Season 2", "Empty"):
+        (tmp_path / folder).mkdir(parents=True, exist_ok=True)
+        if folder != "Empty":
+            for i in range(3):
+                file_path = tmp_path / folder / f"Episode {i}.mkv"
+                file_path.touch()
+                file_paths.append(str(file_path))
+
+    return file_paths
+
+
+def test_scan_directory_finds_the_same_files_as_rglob(tmp_path: Path):
+    file_paths = _make_tree(tmp_path)
+
+    assert sorted(scan_directory(str(tmp_path))) == sorted(file_paths)
+    assert sorted(scan_directory(str(tmp_path))) == sorted(str(path) for path in tmp_path.rglob("*") if path.is_file())
+
+
+def test_scan_directory_stops_when_cancelled(tmp_path: Path):
+    _make_tree(tmp_path)
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    assert not list(scan_directory(str(tmp_path), cancel_event))
+
+
+def test_scan_of_missing_directory_finds_nothing(tmp_path: Path):
+    assert not list(scan_directory(str(tmp_path / "Does Not Exist")))
+
+
+def test_worker_emits_every_file_in_batches(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.directory_scanner.BATCH_SIZE", 4)
+    file_paths = _make_tree(tmp_path)
+    directory_scanner_worker = DirectoryScannerWorker(str(tmp_path))
+    batches = []
+    directory_scanner_worker.batch_ready.connect(batches.append)
+
+    with qtbot.waitSignal(directory_scanner_worker.finished, timeout=10000):
+        directory_scanner_worker.run()
+
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(scanned_file.path for batch in batches for scanned_file in batch) == sorted(file_paths)
+    # Stat'd by the worker, so the GUI thread can claim them in its FileIndex without stat-ing them again.
+    assert all((scanned_file.file_stat.st_dev, scanned_file.file_stat.st_ino) ==
+               (os.stat(scanned_file.path).st_dev, os.stat(scanned_file.path).st_ino)
+               for batch in batches for scanned_file in batch)
+
+
+def test_cancelled_worker_emits_nothing(qtbot: QtBot, tmp_path: Path):
+    _make_tree(tmp_path)
+    directory_scanner_worker = DirectoryScannerWorker(str(tmp_path))
+    directory_scanner_worker.cancel()
+
+    with qtbot.assertNotEmitted(directory_scanner_worker.batch_ready):
+        with qtbot.waitSignal(directory_scanner_worker.finished, timeout=10000):
+            directory_scanner_worker.run()
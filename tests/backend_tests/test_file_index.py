@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+
+from backend.file_index import FileIndex
+
+
+def test_same_path_is_only_added_once(tmp_path: Path):
+    file_index = FileIndex()
+    file_path = tmp_path / "Iron Man (2008).mkv"
+    file_path.touch()
+
+    assert file_index.add(str(file_path))
+    assert not file_index.add(str(file_path))
+    assert not file_index.add(str(tmp_path / "." / "Iron Man (2008).mkv"))
+    assert len(file_index) == 1
+
+
+def test_hardlinks_are_the_same_file(tmp_path: Path):
+    file_index = FileIndex()
+    file_path = tmp_path / "Iron Man (2008).mkv"
+    file_path.touch()
+    os.link(file_path, tmp_path / "Iron.Man.2008.mkv")
+
+    assert file_index.add(str(file_path))
+    assert not file_index.add(str(tmp_path / "Iron.Man.2008.mkv"))
+
+
+def test_removed_file_can_be_added_again(tmp_path: Path):
+    file_index = FileIndex()
+    file_path = tmp_path / "Iron Man (2008).mkv"
+    file_path.touch()
+    file_index.add(str(file_path))
+
+    file_index.remove(str(file_path))
+
+    assert str(file_path) not in file_index
+    assert file_index.add(str(file_path))
+
+
+def test_missing_files_are_compared_by_path():
+    file_index = FileIndex()
+
+    assert file_index.add("C:/Does Not Exist/Iron Man (2008).mkv")
+    assert file_index.add("C:/Does Not Exist/Thunderbolts (2025).mkv")
+    assert not file_index.add("C:/Does Not Exist/Iron Man (2008).mkv")
@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.directory_scanner import scan_directory
+from backend.file_prefilter import FilePrefilter, compile_file_prefilter, retrieve_file_prefilter
+from backend.settings_backend import SettingsSnapshot, DEFAULT_MEDIA_EXTENSIONS, DEFAULT_IGNORE_PATTERNS
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def default_prefilter() -> FilePrefilter:
+    return FilePrefilter(DEFAULT_MEDIA_EXTENSIONS, DEFAULT_IGNORE_PATTERNS, 0)
+
+
+@pytest.mark.parametrize("file_name", ["Iron Man (2008).mkv", "The.Wire.S01E01.720p.MP4", "Pilot.avi"])
+def test_media_files_are_accepted(default_prefilter: FilePrefilter, file_name: str):
+    assert default_prefilter.accepts_file_name(file_name)
+
+
+@pytest.mark.parametrize("file_name", ["Iron Man (2008).nfo", "poster.jpg", "Iron Man (2008).srt", "README",
+                                       "iron.man.2008.1080p-sample.mkv", "SAMPLE.mkv"])
+def test_non_media_and_sample_files_are_rejected(default_prefilter: FilePrefilter, file_name: str):
+    assert not default_prefilter.accepts_file_name(file_name)
+
+
+def test_extensions_are_normalized():
+    file_prefilter = FilePrefilter([".MKV", " mp4 ", ""], [], 0)
+
+    assert file_prefilter.media_extensions == {"mkv", "mp4"}
+    assert file_prefilter.accepts_file_name("Iron Man (2008).mkv")
+
+
+def test_empty_allow_list_accepts_every_extension():
+    assert FilePrefilter([], [], 0).accepts_file_name("Iron Man (2008).nfo")
+
+
+def test_folder_patterns_only_match_folders(default_prefilter: FilePrefilter):
+    assert default_prefilter.is_ignored_folder("Extras")
+    assert default_prefilter.is_ignored_folder("featurettes")
+    assert not default_prefilter.is_ignored_folder("Season 1")
+    # 'Extras/' is a folder pattern, so a file called 'Extras.mkv' is still accepted.
+    assert default_prefilter.accepts_file_name("Extras.mkv")
+
+
+def test_small_files_are_rejected(tmp_path: Path):
+    (tmp_path / "Small.mkv").write_bytes(b"0" * 10)
+    (tmp_path / "Large.mkv").write_bytes(b"0" * 1000)
+    file_prefilter = FilePrefilter(["mkv"], [], 100)
+
+    with os.scandir(tmp_path) as entries:
+        accepted_file_names = sorted(entry.name for entry in entries if file_prefilter.accepts_entry(entry))
+
+    assert accepted_file_names == ["Large.mkv"]
+    assert [file_name for file_name in ("Small.mkv", "Large.mkv", "Missing.mkv")
+            if file_prefilter.accepts_file(str(tmp_path / file_name))] == ["Large.mkv"]
+
+
+def test_scan_directory_skips_ignored_files_and_folders(tmp_path: Path, default_prefilter: FilePrefilter):
+    (tmp_path / "Iron Man (2008).mkv").touch()
+    (tmp_path / "Iron Man (2008).nfo").touch()
+    (tmp_path / "Extras").mkdir()
+    (tmp_path / "Extras" / "Behind the Scenes.mkv").touch()
+
+    assert list(scan_directory(str(tmp_path), file_prefilter=default_prefilter)) == \
+           [str(tmp_path / "Iron Man (2008).mkv")]
+
+
+def test_prefilter_is_compiled_once_per_settings():
+    compile_file_prefilter.cache_clear()
+
+    assert retrieve_file_prefilter(SettingsSnapshot()) is retrieve_file_prefilter(SettingsSnapshot())
+    assert retrieve_file_prefilter(SettingsSnapshot()) is not \
+           retrieve_file_prefilter(SettingsSnapshot(minimum_file_size=1))
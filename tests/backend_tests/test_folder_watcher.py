@@ -0,0 +1,104 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from pytestqt.qtbot import QtBot
+
+from backend.directory_scanner import scan_directory_entries
+from backend.file_prefilter import FilePrefilter
+from backend.folder_watcher import FolderWatcher
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def folder_watcher(tmp_path: Path, monkeypatch: MonkeyPatch) -> FolderWatcher:
+    monkeypatch.setattr("backend.folder_watcher.DEBOUNCE_MILLISECONDS", 100)
+    (tmp_path / "Season 1").mkdir()
+    (tmp_path / "Season 1" / "Episode 1.mkv").touch()
+
+    folder_watcher = FolderWatcher(str(tmp_path))
+    yield folder_watcher
+    folder_watcher.stop()
+
+
+def test_start_returns_every_file_and_watches_every_folder(folder_watcher: FolderWatcher, tmp_path: Path):
+    assert folder_watcher.start() == [str(tmp_path / "Season 1" / "Episode 1.mkv")]
+    assert sorted(folder_watcher.watched_directories()) == [str(tmp_path), str(tmp_path / "Season 1")]
+
+
+def test_start_from_scan_watches_the_scanned_tree(qtbot: QtBot, folder_watcher: FolderWatcher, tmp_path: Path,
+                                                  monkeypatch: MonkeyPatch):
+    (tmp_path / "Empty").mkdir()
+    files_by_directory = {}
+    list(scan_directory_entries(str(tmp_path), files_by_directory=files_by_directory))
+    # The tree was already scanned, so it isn't listed again.
+    monkeypatch.setattr(folder_watcher, "_list_directory", None)
+
+    folder_watcher.start_from_scan(files_by_directory)
+
+    assert sorted(folder_watcher.watched_directories()) == \
+           [str(tmp_path), str(tmp_path / "Empty"), str(tmp_path / "Season 1")]
+    monkeypatch.undo()
+    with qtbot.waitSignal(folder_watcher.files_added, timeout=5000) as added:
+        (tmp_path / "Empty" / "Episode 2.mkv").touch()
+    assert added.args[0] == [str(tmp_path / "Empty" / "Episode 2.mkv")]
+
+
+def test_burst_of_new_files_is_emitted_once(qtbot: QtBot, folder_watcher: FolderWatcher, tmp_path: Path):
+    folder_watcher.start()
+    emitted_batches = []
+    folder_watcher.files_added.connect(emitted_batches.append)
+
+    with qtbot.waitSignal(folder_watcher.files_added, timeout=5000):
+        for i in range(2, 202):
+            (tmp_path / "Season 1" / f"Episode {i}.mkv").touch()
+
+    assert len(emitted_batches) == 1
+    assert len(emitted_batches[0]) == 200
+
+
+def test_removed_and_renamed_files_are_emitted(qtbot: QtBot, folder_watcher: FolderWatcher, tmp_path: Path):
+    folder_watcher.start()
+    (tmp_path / "Season 1" / "Episode 2.mkv").touch()
+    qtbot.waitSignal(folder_watcher.files_added, timeout=5000).wait()
+
+    with qtbot.waitSignal(folder_watcher.files_removed, timeout=5000) as removed:
+        with qtbot.waitSignal(folder_watcher.files_added, timeout=5000) as added:
+            (tmp_path / "Season 1" / "Episode 1.mkv").rename(tmp_path / "Season 1" / "Pilot.mkv")
+            (tmp_path / "Season 1" / "Episode 2.mkv").unlink()
+
+    assert sorted(removed.args[0]) == [str(tmp_path / "Season 1" / "Episode 1.mkv"),
+                                       str(tmp_path / "Season 1" / "Episode 2.mkv")]
+    assert added.args[0] == [str(tmp_path / "Season 1" / "Pilot.mkv")]
+
+
+def test_new_and_deleted_folders_are_watched_and_unwatched(qtbot: QtBot, folder_watcher: FolderWatcher,
+                                                           tmp_path: Path):
+    folder_watcher.start()
+
+    with qtbot.waitSignal(folder_watcher.files_added, timeout=5000) as added:
+        (tmp_path / "Season 2").mkdir()
+        (tmp_path / "Season 2" / "Episode 1.mkv").touch()
+    with qtbot.waitSignal(folder_watcher.files_removed, timeout=5000) as removed:
+        shutil.rmtree(tmp_path / "Season 1")
+
+    assert added.args[0] == [str(tmp_path / "Season 2" / "Episode 1.mkv")]
+    assert removed.args[0] == [str(tmp_path / "Season 1" / "Episode 1.mkv")]
+    assert sorted(folder_watcher.watched_directories()) == [str(tmp_path), str(tmp_path / "Season 2")]
+
+
+def test_prefilter_is_applied(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.folder_watcher.DEBOUNCE_MILLISECONDS", 100)
+    folder_watcher = FolderWatcher(str(tmp_path), FilePrefilter(["mkv"], ["*sample*", "Extras/"], 0))
+    folder_watcher.start()
+
+    with qtbot.waitSignal(folder_watcher.files_added, timeout=5000) as added:
+        (tmp_path / "Extras").mkdir()
+        (tmp_path / "Extras" / "Featurette.mkv").touch()
+        (tmp_path / "Iron Man (2008).nfo").touch()
+        (tmp_path / "Iron Man (2008) Sample.mkv").touch()
+        (tmp_path / "Iron Man (2008).mkv").touch()
+
+    assert added.args[0] == [str(tmp_path / "Iron Man (2008).mkv")]
+    folder_watcher.stop()
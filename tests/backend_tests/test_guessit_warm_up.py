@@ -0,0 +1,26 @@
+from pytestqt.qtbot import QtBot
+
+from backend.guessit_warm_up import GuessitWarmUp
+
+
+# pylint: disable=unused-argument
+def test_warm_up_finishes_in_background(qtbot: QtBot):
+    guessit_warm_up = GuessitWarmUp()
+    assert not guessit_warm_up.is_running()
+
+    with qtbot.waitSignal(guessit_warm_up.finished, timeout=30000):
+        guessit_warm_up.start()
+        assert guessit_warm_up.is_running()
+
+    assert guessit_warm_up.is_finished
+    assert not guessit_warm_up.is_running()
+
+
+def test_warm_up_only_starts_once(qtbot: QtBot):
+    guessit_warm_up = GuessitWarmUp()
+
+    with qtbot.waitSignal(guessit_warm_up.finished, timeout=30000):
+        guessit_warm_up.start()
+
+    with qtbot.assertNotEmitted(guessit_warm_up.finished, wait=200):
+        guessit_warm_up.start()
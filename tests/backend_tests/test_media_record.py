@@ -1,4 +1,13 @@
-from backend.media_record import MediaRecord
+import os
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from guessit import guessit
+
+from backend import media_record as media_record_module
+from backend.media_record import MediaRecord, remove_excluded_folders_from_file_path, guess_metadata, \
+    fast_guess_metadata, compact_metadata
+from backend.settings_backend import SettingsSnapshot
 
 
 def test_create_movie_record_successfully():
@@ -124,3 +133,236 @@ def test_season_number_missing_episode_number_still_recognized():
     media_record = MediaRecord("Chainsaw.Man.2022.S01.TrueHD.5.1/Chainsaw Man - 01 - Dog & Chainsaw.mkv")
 
     assert media_record.metadata["episode"] == 1
+
+
+def test_remove_excluded_folders_strips_excluded_folder():
+    excluded_folders = [os.path.join(os.sep, "Stuff")]
+    file_path = os.path.join(os.sep, "Stuff", "Show Name", "Season 1", "E01.mkv")
+
+    assert remove_excluded_folders_from_file_path(file_path, excluded_folders) == "Show Name/Season 1/E01.mkv"
+
+
+def test_remove_excluded_folders_ignores_case():
+    excluded_folders = [os.path.join(os.sep, "STUFF", "tv shows")]
+    file_path = os.path.join(os.sep, "Stuff", "TV Shows", "Andor", "Andor.S01E01.mkv")
+
+    assert remove_excluded_folders_from_file_path(file_path, excluded_folders) == "Andor/Andor.S01E01.mkv"
+
+
+def test_remove_excluded_folders_strips_longest_prefix_including_parent_folders():
+    excluded_folders = [os.path.join(os.sep, "Stuff", "Movies"), os.path.join(os.sep, "Stuff", "TV", "Anime")]
+
+    assert remove_excluded_folders_from_file_path(
+        os.path.join(os.sep, "Stuff", "TV", "Anime", "Chainsaw Man", "E01.mkv"), excluded_folders) \
+        == "Chainsaw Man/E01.mkv"
+    # Parent folders of an excluded folder are also excluded.
+    assert remove_excluded_folders_from_file_path(
+        os.path.join(os.sep, "Stuff", "TV", "Andor", "E01.mkv"), excluded_folders) == "Andor/E01.mkv"
+
+
+def test_remove_excluded_folders_only_matches_whole_folder_names():
+    excluded_folders = [os.path.join(os.sep, "Media", "Stuff")]
+    file_path = os.path.join(os.sep, "Media", "Stuff Ultra", "Iron Man (2008).mkv")
+
+    assert remove_excluded_folders_from_file_path(file_path, excluded_folders) == "Stuff Ultra/Iron Man (2008).mkv"
+
+
+def test_remove_excluded_folders_without_excluded_folders_returns_original_path():
+    assert remove_excluded_folders_from_file_path("C:/Stuff/Iron Man (2008).mkv", []) == "C:/Stuff/Iron Man (2008).mkv"
+
+
+def test_media_record_only_keeps_compact_metadata():
+    media_record = MediaRecord("X:/TV Shows/The.Wire.S01E01.The.Target.BluRay.1080p.DD.5.1.x264-MyGroup.mkv")
+
+    assert media_record.metadata == {"type": "episode", "title": "The Wire", "season": 1, "episode": 1,
+                                     "episode_title": "The Target"}
+    assert not hasattr(media_record, "__dict__")
+
+
+def test_retrieve_full_metadata_returns_all_guessit_fields():
+    media_record = MediaRecord("X:/TV Shows/The.Wire.S01E01.BluRay.1080p.DD.5.1.x264-MyGroup.mkv")
+
+    full_metadata = media_record.retrieve_full_metadata()
+
+    assert full_metadata["screen_size"] == "1080p"
+    assert full_metadata["release_group"] == "MyGroup"
+    assert full_metadata["season"] == media_record.metadata["season"]
+
+
+def _count_guessit_calls(monkeypatch: MonkeyPatch) -> list[str]:
+    """Returns a list that collects every string passed to guessit."""
+    guessit_inputs = []
+    real_guessit = media_record_module.guessit
+
+    def _counting_guessit(string: str):
+        guessit_inputs.append(string)
+        return real_guessit(string)
+    monkeypatch.setattr(media_record_module, "guessit", _counting_guessit)
+
+    return guessit_inputs
+
+
+def test_episode_with_season_and_episode_is_parsed_once(monkeypatch: MonkeyPatch):
+    guessit_inputs = _count_guessit_calls(monkeypatch)
+
+    metadata = guess_metadata("D:/TV Shows/The Wire/The.Wire.S01E01.mkv", SettingsSnapshot(), allow_fast_path=False)
+    guess_metadata("D:/TV Shows/The.Wire.S01E02.mkv", SettingsSnapshot(use_only_filename_for_analysis=True),
+                   allow_fast_path=False)
+
+    assert (metadata["season"], metadata["episode"]) == (1, 1)
+    assert guessit_inputs == ["D:/TV Shows/The Wire/The.Wire.S01E01.mkv", "The.Wire.S01E02.mkv"]
+
+
+def test_file_name_parse_is_reused_for_the_same_file_name(monkeypatch: MonkeyPatch):
+    media_record_module._guess_file_name_metadata.cache_clear()  # pylint: disable=protected-access
+    guessit_inputs = _count_guessit_calls(monkeypatch)
+
+    # The folder name hides the episode number, so the file name needs to be parsed on its own.
+    first_metadata = guess_metadata("D:/Chainsaw.Man.2022.S01.TrueHD.5.1/Chainsaw Man - 01 - Dog & Chainsaw.mkv",
+                                    SettingsSnapshot())
+    second_metadata = guess_metadata("E:/Chainsaw.Man.2022.S01.TrueHD.5.1/Chainsaw Man - 01 - Dog & Chainsaw.mkv",
+                                     SettingsSnapshot())
+
+    assert first_metadata["episode"] == second_metadata["episode"] == 1
+    assert guessit_inputs.count("Chainsaw Man - 01 - Dog & Chainsaw.mkv") == 1
+
+
+FAST_PATH_ACCEPTED_CORPUS = [
+    "Show.Name.S01E02.1080p.WEB-DL.x264-GROUP.mkv",
+    "The.Wire.S01E01.1080p.BluRay.DD5.1.x264-MyGroup.mkv",
+    "Show.Name.S01E02.1080p.AMZN.WEB-DL.DDP5.1.H.264-NTb.mkv",
+    "Show.Name.S01E02.720p.HDTV.x264-LOL.mkv",
+    "Breaking.Bad.S05E16.mkv",
+    "Doctor Who S01E02.mp4",
+    "Show_Name_S1E2.avi",
+    "Mr.Robot.s01e02.mkv",
+    "Band.of.Brothers.S01E10.2160p.UHD.BluRay.x265.10bit.HDR.TrueHD.Atmos-GRP.mkv",
+    "Show.S00E01.mkv",
+    "Show.S01E123.mkv",
+    "Show Name - 1x02.mkv",
+    "Show Name - 01x02.mkv",
+    "Show Name 1x02.mkv",
+    "Movie.Name.2014.mkv",
+    "Movie Name 1999.mp4",
+    "Iron Man (2008).mkv",
+    "Movie.Name.(1999).mkv",
+    "Movie.Name.2014.1080p.BluRay.x264-GRP.mkv",
+    "Movie.Name.2014.2160p.UHD.BluRay.x265-GRP.mkv",
+    "a.quiet.place.2018.mkv",
+    "The Dark Knight Rises (2012).mkv",
+    "D:/TV Shows/The Wire/Season 1/The.Wire.S01E01.mkv",
+    "Show Name/Season 01/Show.Name.S01E02.mkv",
+    "/mnt/Media/Movies/Iron.Man.2008.mkv",
+    "C:\\Movies\\Iron Man (2008).mkv",
+]
+
+FAST_PATH_REJECTED_CORPUS = [
+    # Country code, language, and edition words.
+    "The.Office.US.S01E01.mkv",
+    "Movie.Name.2014.FRENCH.1080p.mkv",
+    "Movie.Name.Extended.2014.mkv",
+    # Episode titles and release tags that don't start with the screen size.
+    "Show Name - 1x02 - Pilot.mkv",
+    "Show.Name.S01E02.Episode.Title.mkv",
+    "Show.Name.S01E02-GRP.mkv",
+    "Show.Name.S01E02.AMZN.WEB-DL.mkv",
+    "Show.Name.S01E02.1080p.720p.mkv",
+    # Digits in titles, years guessit doesn't accept, and multi-episode files.
+    "Cars 2 (2011).mkv",
+    "Iron.Man.1919.mkv",
+    "Iron.Man.2030.mkv",
+    "Show.Name.S01E02E03.mkv",
+    "X - 4x55.mkv",
+    # Folder names with more than plain words, a mismatched season folder, and unknown containers.
+    "TV Shows/The Wire (2002)/The.Wire.S01E01.mkv",
+    "Show Name/Season 2/Show.Name.S01E02.mkv",
+    "Show.Name.S01E02.srt",
+    # Words guessit reads as an edition, a source, or an episode marker.
+    "Se.S01E02.mkv",
+    "Bluray.2014.mkv",
+    "Episodes.2014.mkv",
+    "Se S01E02 1080p WEB-DL x264-GRP.mkv",
+]
+
+# Words guessit reads as something other than a title, depending on where they are. Either the fast path leaves
+# names with them to guessit, or it agrees with it.
+GUESSIT_VOCABULARY_WORDS = ["Se", "Bluray", "Episodes", "Alternative", "Remastered", "Vostfr", "Truefrench", "Korsub",
+                            "Czech", "Hungarian", "Australia", "Life", "Part", "Www"]
+
+
+@pytest.mark.parametrize("string", FAST_PATH_ACCEPTED_CORPUS)
+def test_fast_path_agrees_with_guessit(string: str):
+    fast_path_metadata = fast_guess_metadata(string)
+
+    assert fast_path_metadata is not None
+    assert fast_path_metadata == compact_metadata(dict(guessit(string)))
+
+
+@pytest.mark.parametrize("string", FAST_PATH_REJECTED_CORPUS)
+def test_fast_path_leaves_ambiguous_names_to_guessit(string: str):
+    assert fast_guess_metadata(string) is None
+
+
+@pytest.mark.parametrize("word", GUESSIT_VOCABULARY_WORDS)
+def test_fast_path_agrees_with_guessit_around_its_vocabulary(word: str):
+    for string in (f"{word}.S01E02.mkv", f"Show.{word}.S01E02.1080p.WEB-DL.x264-GRP.mkv", f"{word}.2014.mkv",
+                   f"Movie {word} (2014).mkv"):
+        fast_path_metadata = fast_guess_metadata(string)
+
+        assert fast_path_metadata is None or fast_path_metadata == compact_metadata(dict(guessit(string)))
+
+
+def test_guess_metadata_uses_fast_path_unless_disallowed(monkeypatch: MonkeyPatch):
+    guessit_inputs = _count_guessit_calls(monkeypatch)
+
+    fast_path_metadata = guess_metadata("D:/TV Shows/The.Wire.S01E01.mkv", SettingsSnapshot())
+    full_metadata = guess_metadata("D:/TV Shows/The.Wire.S01E01.mkv", SettingsSnapshot(), allow_fast_path=False)
+
+    assert guessit_inputs == ["D:/TV Shows/The.Wire.S01E01.mkv"]
+    assert fast_path_metadata == compact_metadata(full_metadata)
+    assert full_metadata["container"] == "mkv"
+
+
+DIRECTORY_CONTEXT_CORPUS = [
+    "D:/TV Shows/The Wire (2002)/Season 1/The Wire - S01E01 - The Target.mkv",
+    "D:/TV Shows/The Wire (2002)/Season 1/The Wire - S01E02 - The Detail.mkv",
+    "D:/TV Shows/Breaking Bad/Season 2/Breaking.Bad.S02E10.Over.720p.mkv",
+    "/media/tv/andor/season 01/Andor - 01.mkv",
+    "D:/Movies/Iron Man (2008)/Iron Man (2008) CD1.avi",
+    "Us Season 3/Us - S03E01 - Pilot.mkv",
+    "D:/TV/The 100/The 100 - E09 - Pilot.mkv",
+    "D:/TV/Pilot/Pilot (2010).mkv",
+]
+
+
+@pytest.mark.parametrize("file_path", DIRECTORY_CONTEXT_CORPUS)
+def test_directory_context_agrees_with_full_path_parse(file_path: str):
+    metadata = compact_metadata(guess_metadata(file_path, SettingsSnapshot()))
+
+    assert metadata == compact_metadata(guess_metadata(file_path, SettingsSnapshot(), allow_fast_path=False))
+
+
+def test_sibling_files_share_one_directory_parse(monkeypatch: MonkeyPatch):
+    media_record_module._retrieve_directory_context.cache_clear()  # pylint: disable=protected-access
+    guessit_inputs = _count_guessit_calls(monkeypatch)
+
+    first_metadata = guess_metadata("C:/Excluded/The West Wing/Season 2/The West Wing - S02E01 - In the Shadow.mkv",
+                                    SettingsSnapshot(excluded_folders=("C:/Excluded",)))
+    second_metadata = guess_metadata("C:/Excluded/The West Wing/Season 2/The West Wing - S02E02 - Manchester.mkv",
+                                     SettingsSnapshot(excluded_folders=("C:/Excluded",)))
+
+    # The excluded folder is stripped before the folders are parsed.
+    assert guessit_inputs.count("The West Wing/Season 2/") == 1
+    assert len(guessit_inputs) == 3
+    assert (first_metadata["title"], first_metadata["season"], first_metadata["episode"]) == ("The West Wing", 2, 1)
+    assert (second_metadata["title"], second_metadata["season"], second_metadata["episode"]) == ("The West Wing", 2, 2)
+
+
+def test_conflicting_directory_context_falls_back_to_full_path_parse():
+    media_record_module._retrieve_directory_context.cache_clear()  # pylint: disable=protected-access
+
+    # On its own, the file name's title is 'Some Name'. guessit on the full path uses the folder's title instead.
+    metadata = guess_metadata("D:/TV Shows/The West Wing/Season 2/S02E02 - Some Name.mkv", SettingsSnapshot())
+
+    assert metadata["title"] == "The West Wing"
+    assert metadata["episode_title"] == "Some Name"
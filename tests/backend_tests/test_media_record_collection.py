@@ -0,0 +1,91 @@
+from backend.media_record import MediaRecord
+from backend.media_record_collection import MediaRecordCollection
+
+
+def test_aggregates_match_media_record_helpers():
+    media_records = [MediaRecord("The.West.Wing.S01E01.mkv"), MediaRecord("the west wing S02E01.mkv"),
+                     MediaRecord("Iron Man (2008).mkv"), MediaRecord("The.Wire.S03E05.mkv")]
+    media_record_collection = MediaRecordCollection(media_records)
+
+    assert len(media_record_collection) == 4
+    assert media_record_collection.has_movies() == MediaRecord.has_movies(media_records)
+    assert media_record_collection.has_episodes() == MediaRecord.has_episodes(media_records)
+    assert media_record_collection.is_tv_series() == MediaRecord.is_tv_series(media_records)
+    assert media_record_collection.get_unique_titles() == MediaRecord.get_unique_titles(media_records)
+    assert media_record_collection.get_all_season_numbers() == MediaRecord.get_all_season_numbers(media_records)
+
+
+def test_aggregates_are_updated_when_records_are_removed():
+    media_record_collection = MediaRecordCollection([MediaRecord("Iron Man (2008).mkv"),
+                                                     MediaRecord("The.West.Wing.S01E01.mkv"),
+                                                     MediaRecord("The.West.Wing.S02E01.mkv")])
+    assert not media_record_collection.is_tv_series()
+
+    removed_media_record = media_record_collection.pop(0)
+
+    assert removed_media_record.title == "Iron Man"
+    assert media_record_collection.is_tv_series()
+    assert media_record_collection.get_unique_titles() == {"The West Wing"}
+
+    media_record_collection.pop()
+
+    assert media_record_collection.get_all_season_numbers() == {1}
+    assert [media_record.file_name for media_record in media_record_collection] == ["The.West.Wing.S01E01.mkv"]
+
+
+def test_unique_titles_follow_the_remaining_records():
+    media_record_collection = MediaRecordCollection([MediaRecord("the west wing S01E01.mkv"),
+                                                     MediaRecord("The.West.Wing.S02E01.mkv")])
+    assert media_record_collection.get_unique_titles() == {"the west wing"}
+
+    media_record_collection.pop(0)
+
+    assert media_record_collection.get_unique_titles() == {"The West Wing"}
+
+
+def test_empty_collection_defaults():
+    media_record_collection = MediaRecordCollection()
+
+    assert not media_record_collection.has_movies()
+    assert not media_record_collection.has_episodes()
+    assert media_record_collection.get_unique_titles() == set()
+    assert media_record_collection.get_all_season_numbers() == {1}
+
+
+def test_update_title_and_year_for_all_records():
+    media_record_collection = MediaRecordCollection([MediaRecord("Andor.S01E01.mkv"),
+                                                     MediaRecord("The.West.Wing.S01E02.mkv")])
+
+    media_record_collection.update_title_for_all_records("The West Wing")
+    media_record_collection.update_year_for_all_records("1999")
+    # Invalid years leave the records untouched.
+    media_record_collection.update_year_for_all_records("Not a year")
+
+    assert media_record_collection.get_unique_titles() == {"The West Wing"}
+    assert all(media_record.title == "The West Wing" for media_record in media_record_collection)
+    assert all(media_record.year == 1999 for media_record in media_record_collection)
+
+
+def test_clear_resets_aggregates():
+    media_record_collection = MediaRecordCollection([MediaRecord("Iron Man (2008).mkv")])
+    media_record_collection.clear()
+
+    assert len(media_record_collection) == 0
+    assert not media_record_collection.has_movies()
+    assert media_record_collection.get_unique_titles() == set()
+
+
+def _aggregates(media_record_collection: MediaRecordCollection) -> dict:
+    return {name: value for name, value in vars(media_record_collection).items() if name != "_media_records"}
+
+
+def test_extend_matches_append():
+    media_records = [MediaRecord("The.West.Wing.S01E01.mkv"), MediaRecord("Show.S01-S02.mkv"),
+                     MediaRecord("Iron Man (2008).mkv")]
+    appended_collection = MediaRecordCollection()
+    for media_record in media_records:
+        appended_collection.append(media_record)
+    extended_collection = MediaRecordCollection()
+    extended_collection.extend(media_records)
+
+    assert _aggregates(extended_collection) == _aggregates(appended_collection)
@@ -0,0 +1,57 @@
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+from _pytest.monkeypatch import MonkeyPatch
+
+from backend.media_record import guess_metadata, compact_metadata
+from backend.parallel_ingestion import parse_file_paths_in_parallel
+from backend.settings_backend import SettingsSnapshot
+
+
+def test_parallel_parsing_matches_sequential_parsing_in_order(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.parallel_ingestion.CHUNK_SIZE", 2)
+    file_paths = ["The.West.Wing.S01E01.Pilot.mkv", "Iron Man (2008).mkv", "D:/Andor/Season 2/Andor.S02E09.mkv",
+                  "Oppenheimer.2023.mp4", "The.Wire.S03E04.mkv"]
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        chunks = list(parse_file_paths_in_parallel(file_paths, SettingsSnapshot(), executor))
+
+    # 5 files in chunks of 2 files.
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [metadata for chunk in chunks for metadata in chunk] == \
+           [compact_metadata(guess_metadata(file_path, SettingsSnapshot())) for file_path in file_paths]
+
+
+def test_parallel_parsing_of_no_files_yields_nothing():
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        assert not list(parse_file_paths_in_parallel([], SettingsSnapshot(), executor))
+
+
+class PendingExecutor(Executor):
+    """Only the first chunk is parsed. The rest stay pending, like chunks waiting for a busy worker."""
+
+    def __init__(self):
+        self.futures: list[Future] = []
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        if not self.futures:
+            future.set_result(fn(*args, **kwargs))
+        self.futures.append(future)
+
+        return future
+
+
+def test_parallel_parsing_submits_a_bounded_window_and_cancels_the_rest(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.parallel_ingestion.CHUNK_SIZE", 1)
+    executor = PendingExecutor()
+    chunks = parse_file_paths_in_parallel([f"Show.S01E0{i}.mkv" for i in range(1, 10)], SettingsSnapshot(), executor,
+                                          max_chunks_in_flight=3)
+
+    assert len(next(chunks)) == 1
+    assert len(executor.futures) == 3
+
+    # E.g., the drop was cancelled.
+    chunks.close()
+
+    assert [future.cancelled() for future in executor.futures] == [False, True, True]
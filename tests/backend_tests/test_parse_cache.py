@@ -0,0 +1,150 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from backend import media_record as media_record_module
+from backend.media_record import MediaRecord
+from backend.parse_cache import ParseCache
+from backend.settings_backend import SettingsSnapshot
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def parse_cache(tmp_path: Path) -> ParseCache:
+    return ParseCache(tmp_path / "parse_cache.sqlite3")
+
+
+def _create_file(tmp_path: Path, file_name: str) -> str:
+    file_path = tmp_path / file_name
+    file_path.write_text("Hello World!", encoding="utf-8")
+    return str(file_path)
+
+
+def test_cached_metadata_is_retrieved(parse_cache: ParseCache, tmp_path: Path):
+    file_path = _create_file(tmp_path, "The.Wire.S01E01.mkv")
+    key = ParseCache.create_key(file_path, SettingsSnapshot())
+
+    parse_cache.put(key, {"title": "The Wire", "season": 1, "episode": 1})
+
+    assert parse_cache.get(key) == {"title": "The Wire", "season": 1, "episode": 1}
+    assert parse_cache.hits == 1
+    assert parse_cache.misses == 0
+
+
+def test_missing_file_is_never_cached(parse_cache: ParseCache):
+    key = ParseCache.create_key("C:/Does Not Exist/Iron Man (2008).mkv", SettingsSnapshot())
+    parse_cache.put(key, {"title": "Iron Man"})
+
+    assert key is None
+    assert parse_cache.get(key) is None
+    assert len(parse_cache) == 0
+
+
+def test_modified_file_is_a_miss(parse_cache: ParseCache, tmp_path: Path):
+    file_path = _create_file(tmp_path, "Iron Man (2008).mkv")
+    parse_cache.put(ParseCache.create_key(file_path, SettingsSnapshot()), {"title": "Iron Man"})
+
+    # Change both the size and the modification time of the file.
+    with open(file_path, "a", encoding="utf-8") as file:
+        file.write("More data!")
+    os.utime(file_path, ns=(0, 0))
+
+    assert parse_cache.get(ParseCache.create_key(file_path, SettingsSnapshot())) is None
+    assert parse_cache.misses == 1
+
+
+def test_changed_settings_are_a_miss(parse_cache: ParseCache, tmp_path: Path):
+    file_path = _create_file(tmp_path, "Iron Man (2008).mkv")
+    parse_cache.put(ParseCache.create_key(file_path, SettingsSnapshot()), {"title": "Iron Man"})
+
+    filename_only_settings = SettingsSnapshot(use_only_filename_for_analysis=True)
+    excluded_folder_settings = SettingsSnapshot(excluded_folders=(str(tmp_path),))
+
+    assert parse_cache.get(ParseCache.create_key(file_path, filename_only_settings)) is None
+    assert parse_cache.get(ParseCache.create_key(file_path, excluded_folder_settings)) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.parse_cache.EVICTION_CHECK_INTERVAL", 1)
+    parse_cache = ParseCache(tmp_path / "parse_cache.sqlite3", max_entries=2)
+
+    keys = [ParseCache.create_key(_create_file(tmp_path, f"File {i}.mkv"), SettingsSnapshot()) for i in range(3)]
+    for key in keys:
+        parse_cache.put(key, {"title": key[0]})
+
+    assert len(parse_cache) == 2
+    assert parse_cache.get(keys[0]) is None
+    assert parse_cache.get(keys[2]) is not None
+
+
+def _read_last_used(cache_path: Path, file_path: str) -> float:
+    with sqlite3.connect(cache_path) as connection:
+        return connection.execute("SELECT last_used FROM parse_cache WHERE path = ?", (file_path,)).fetchone()[0]
+
+
+def test_hits_are_marked_as_used_in_one_commit(tmp_path: Path):
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    parse_cache = ParseCache(cache_path)
+    keys = [ParseCache.create_key(_create_file(tmp_path, f"File {i}.mkv"), SettingsSnapshot()) for i in range(2)]
+    parse_cache.put(keys[0], {"title": "File 0"})
+    last_used = _read_last_used(cache_path, keys[0][0])
+
+    assert parse_cache.get(keys[0]) is not None
+    # Not written by the hit itself...
+    assert _read_last_used(cache_path, keys[0][0]) == last_used
+
+    # ...but along with the next write, or once the batch of files is done.
+    parse_cache.put(keys[1], {"title": "File 1"})
+    assert _read_last_used(cache_path, keys[0][0]) > last_used
+
+    last_used = _read_last_used(cache_path, keys[0][0])
+    assert parse_cache.get(keys[0]) is not None
+    parse_cache.flush_last_used()
+    assert _read_last_used(cache_path, keys[0][0]) > last_used
+
+
+def test_corrupted_cache_file_is_recreated(tmp_path: Path):
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    cache_path.write_text("This is not a database!", encoding="utf-8")
+
+    parse_cache = ParseCache(cache_path)
+
+    assert len(parse_cache) == 0
+
+
+def test_unchanged_file_skips_guessit(parse_cache: ParseCache, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(media_record_module, "retrieve_parse_cache", lambda: parse_cache)
+    file_path = _create_file(tmp_path, "The.West.Wing.S01E01.Pilot.mkv")
+
+    first_media_record = MediaRecord(file_path)
+
+    def _fail(_):
+        raise AssertionError("guessit should not be called for a cached file.")
+    monkeypatch.setattr(media_record_module, "guessit", _fail)
+
+    second_media_record = MediaRecord(file_path)
+
+    assert second_media_record.title == first_media_record.title == "The West Wing"
+    assert second_media_record.metadata == dict(first_media_record.metadata)
+    assert parse_cache.hits == 1
+
+
+def test_cache_with_old_schema_is_recreated(tmp_path: Path):
+    cache_path = tmp_path / "parse_cache.sqlite3"
+    connection = sqlite3.connect(cache_path)
+    connection.execute("CREATE TABLE parse_cache (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                       "analysis_only INTEGER, excluded_folders TEXT, parser_version TEXT, metadata BLOB, "
+                       "last_used REAL)")
+    connection.execute("INSERT INTO parse_cache VALUES ('Iron Man (2008).mkv', 0, 0, 0, '', '', NULL, 0)")
+    connection.commit()
+    connection.close()
+
+    parse_cache = ParseCache(cache_path)
+    file_path = _create_file(tmp_path, "Iron Man (2008).mkv")
+    parse_cache.put(ParseCache.create_key(file_path, SettingsSnapshot()), {"title": "Iron Man"})
+
+    assert len(parse_cache) == 1
+    assert parse_cache.get(ParseCache.create_key(file_path, SettingsSnapshot())) == {"title": "Iron Man"}
@@ -0,0 +1,25 @@
+import time
+
+from backend.rate_limiter import TokenBucket, retrieve_rate_limiter
+
+
+def test_burst_goes_out_at_once_then_requests_are_spread_out():
+    token_bucket = TokenBucket(rate_per_second=50, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        token_bucket.acquire()
+    burst_seconds = time.monotonic() - start
+
+    for _ in range(5):
+        token_bucket.acquire()
+    total_seconds = time.monotonic() - start
+
+    assert burst_seconds < 0.02
+    # 5 more requests at 50 per second.
+    assert 0.08 <= total_seconds < 0.5
+
+
+def test_only_database_hosts_are_limited():
+    assert retrieve_rate_limiter("API.THEMOVIEDB.ORG") is retrieve_rate_limiter("api.themoviedb.org") is not None
+    assert retrieve_rate_limiter("example.com") is None
@@ -0,0 +1,118 @@
+import io
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+from requests.adapters import HTTPAdapter
+from omdb import OMDBClient
+from urllib3 import HTTPResponse
+
+from backend.response_cache import ResponseCache, CachingHTTPAdapter, create_key, retrieve_ttl_seconds, \
+    SEARCH_TTL_SECONDS, EPISODE_LIST_TTL_SECONDS
+
+SEASON_URL = "https://api.themoviedb.org/3/tv/1399/season/1?api_key=SECRET"
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def response_cache(tmp_path: Path) -> ResponseCache:
+    return ResponseCache(tmp_path / "response_cache.sqlite3")
+
+
+def _fake_network(monkeypatch: MonkeyPatch, status: int = 200) -> list[str]:
+    """Answers every request that gets past the cache with a small JSON body. Returns the URLs that were sent."""
+    sent_urls = []
+
+    def _send(adapter: HTTPAdapter, request: requests.PreparedRequest, *_args, **_kwargs) -> requests.Response:
+        sent_urls.append(request.url)
+        return adapter.build_response(request, HTTPResponse(body=io.BytesIO(b'{"name": "Winter Is Coming"}'),
+                                                            status=status, headers={"Content-Type": "application/json"},
+                                                            preload_content=False))
+    monkeypatch.setattr(HTTPAdapter, "send", _send)
+
+    return sent_urls
+
+
+def _create_session(response_cache: ResponseCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", CachingHTTPAdapter(response_cache))
+    session.mount("http://", CachingHTTPAdapter(response_cache))
+    return session
+
+
+def test_key_ignores_api_keys_and_parameter_order():
+    assert create_key("HTTP://WWW.omdbapi.com/?t=Heat&apikey=SECRET&y=1995") == "http://www.omdbapi.com/?t=Heat&y=1995"
+    assert create_key("http://www.omdbapi.com?y=1995&t=Heat&apikey=OTHER") == "http://www.omdbapi.com/?t=Heat&y=1995"
+
+
+def test_episode_lists_are_cached_longer_than_searches(monkeypatch: MonkeyPatch):
+    # The OMDB URLs are the ones the omdb client actually sends.
+    sent_urls = _fake_network(monkeypatch)
+    omdb_client = OMDBClient(apikey="SECRET")
+    omdb_client.get(title="Lost", season=2)
+    omdb_client.get(title="Heat")
+    omdb_season_url, omdb_title_url = sent_urls[0], sent_urls[1]
+
+    assert retrieve_ttl_seconds(SEASON_URL) == EPISODE_LIST_TTL_SECONDS
+    assert retrieve_ttl_seconds("https://api.themoviedb.org/3/search/tv?query=Heat") == SEARCH_TTL_SECONDS
+    assert retrieve_ttl_seconds(omdb_season_url) == EPISODE_LIST_TTL_SECONDS
+    assert retrieve_ttl_seconds(omdb_title_url) == SEARCH_TTL_SECONDS
+    assert retrieve_ttl_seconds("http://api.tvmaze.com/shows/82/episodes") == EPISODE_LIST_TTL_SECONDS
+    assert retrieve_ttl_seconds("http://api.tvmaze.com/search/shows?q=Heat") == SEARCH_TTL_SECONDS
+    # Not a database request.
+    assert retrieve_ttl_seconds("https://example.com/search/tv") is None
+
+
+def test_repeated_request_is_answered_from_the_cache(response_cache: ResponseCache, monkeypatch: MonkeyPatch):
+    sent_urls = _fake_network(monkeypatch)
+    session = _create_session(response_cache)
+
+    first_response = session.get(SEASON_URL)
+    second_response = session.get(SEASON_URL.replace("SECRET", "ANOTHER_KEY"))
+
+    assert first_response.json() == second_response.json() == {"name": "Winter Is Coming"}
+    assert len(sent_urls) == 1
+    assert (response_cache.hits, response_cache.misses, response_cache.hit_ratio) == (1, 1, 0.5)
+    # API keys aren't written to disk.
+    assert all(b"SECRET" not in database_file.read_bytes()
+               for database_file in response_cache.path.parent.glob(f"{response_cache.path.name}*"))
+
+
+def test_failed_and_uncacheable_requests_always_go_to_the_network(response_cache: ResponseCache,
+                                                                  monkeypatch: MonkeyPatch):
+    sent_urls = _fake_network(monkeypatch, status=401)
+    session = _create_session(response_cache)
+
+    session.get(SEASON_URL)
+    session.get(SEASON_URL)
+    session.get("https://example.com/")
+    session.get("https://example.com/")
+
+    assert len(sent_urls) == 4
+    assert len(response_cache) == 0
+
+
+def test_expired_response_is_a_miss(response_cache: ResponseCache):
+    response_cache.put("http://www.omdbapi.com/?t=Heat", "application/json", b"{}", ttl_seconds=-1)
+
+    assert response_cache.get("http://www.omdbapi.com/?t=Heat") is None
+    assert response_cache.misses == 1
+
+
+def test_least_recently_used_responses_are_evicted_past_max_bytes(tmp_path: Path):
+    response_cache = ResponseCache(tmp_path / "response_cache.sqlite3", max_bytes=250)
+
+    response_cache.put("first", "application/json", b"1" * 100, SEARCH_TTL_SECONDS)
+    time.sleep(0.01)
+    response_cache.put("second", "application/json", b"2" * 100, SEARCH_TTL_SECONDS)
+    time.sleep(0.01)
+    # Used, so 'second' is now the least recently used.
+    assert response_cache.get("first") is not None
+    response_cache.put("third", "application/json", b"3" * 100, SEARCH_TTL_SECONDS)
+
+    assert response_cache.get("second") is None
+    assert response_cache.get("first") is not None
+    assert response_cache.get("third") is not None
+    assert response_cache.size_bytes() == 200
@@ -0,0 +1,125 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.directory_scanner import DirectoryScannerWorker, ScannedFile
+from backend.parse_cache import ParseCache
+from backend.scan_index import DirectoryScanIndex, ScanReport
+from backend.settings_backend import SettingsSnapshot
+
+
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def parse_cache(tmp_path: Path) -> ParseCache:
+    return ParseCache(tmp_path / "parse_cache.sqlite3")
+
+
+def _scan(parse_cache: ParseCache, directory: Path) -> tuple[list[ScannedFile], ScanReport]:
+    """Scan a folder like a FolderScan does and store the files that needed parsing."""
+    directory_scanner_worker = DirectoryScannerWorker(str(directory), scan_index=DirectoryScanIndex(
+        str(directory), SettingsSnapshot(), parse_cache))
+    batches = []
+    scan_reports = []
+    directory_scanner_worker.batch_ready.connect(batches.append)
+    directory_scanner_worker.scan_report_ready.connect(scan_reports.append)
+    directory_scanner_worker.run()
+
+    scanned_files = [scanned_file for batch in batches for scanned_file in batch]
+    for scanned_file in scanned_files:
+        if scanned_file.metadata is None:
+            parse_cache.put(ParseCache.create_key(scanned_file.path, SettingsSnapshot()),
+                            {"title": Path(scanned_file.path).stem})
+
+    return scanned_files, scan_reports[0]
+
+
+def _make_library(tmp_path: Path) -> Path:
+    library = tmp_path / "Library"
+    (library / "Season 1").mkdir(parents=True)
+    for i in range(3):
+        (library / "Season 1" / f"Episode {i}.mkv").write_text("Hello World!", encoding="utf-8")
+
+    return library
+
+
+def test_first_scan_parses_every_file(parse_cache: ParseCache, tmp_path: Path):
+    scanned_files, scan_report = _scan(parse_cache, _make_library(tmp_path))
+
+    assert all(scanned_file.metadata is None for scanned_file in scanned_files)
+    assert scan_report == ScanReport(reused_file_count=0, parsed_file_count=3, removed_file_count=0)
+
+
+def test_unchanged_files_are_reused(parse_cache: ParseCache, tmp_path: Path):
+    library = _make_library(tmp_path)
+    _scan(parse_cache, library)
+
+    scanned_files, scan_report = _scan(parse_cache, library)
+
+    assert sorted(scanned_file.metadata["title"] for scanned_file in scanned_files) == \
+           ["Episode 0", "Episode 1", "Episode 2"]
+    assert scan_report == ScanReport(reused_file_count=3, parsed_file_count=0, removed_file_count=0)
+
+
+def test_changed_new_and_vanished_files_are_detected(parse_cache: ParseCache, tmp_path: Path):
+    library = _make_library(tmp_path)
+    _scan(parse_cache, library)
+
+    with open(library / "Season 1" / "Episode 0.mkv", "a", encoding="utf-8") as file:
+        file.write("More data!")
+    (library / "Season 1" / "Episode 1.mkv").unlink()
+    (library / "Season 1" / "Episode 3.mkv").touch()
+
+    scanned_files, scan_report = _scan(parse_cache, library)
+
+    assert sorted(Path(scanned_file.path).name for scanned_file in scanned_files if scanned_file.metadata is None) \
+           == ["Episode 0.mkv", "Episode 3.mkv"]
+    assert scan_report == ScanReport(reused_file_count=1, parsed_file_count=2, removed_file_count=1)
+    assert len(parse_cache) == 3
+
+
+def test_replaced_file_with_same_size_and_mtime_is_parsed_again(parse_cache: ParseCache, tmp_path: Path):
+    library = _make_library(tmp_path)
+    _scan(parse_cache, library)
+
+    # Swap a file for a different one (New inode) that has the same size and modification time.
+    episode_path = library / "Season 1" / "Episode 0.mkv"
+    episode_stat = episode_path.stat()
+    replacement_path = tmp_path / "Replacement.mkv"
+    replacement_path.write_text("Hello World!", encoding="utf-8")
+    os.replace(replacement_path, episode_path)
+    os.utime(episode_path, ns=(episode_stat.st_atime_ns, episode_stat.st_mtime_ns))
+
+    _, scan_report = _scan(parse_cache, library)
+
+    assert scan_report.parsed_file_count == 1
+
+
+def test_files_outside_the_scanned_folder_are_kept(parse_cache: ParseCache, tmp_path: Path):
+    library = _make_library(tmp_path)
+    # Shares 'Library' as a prefix, but isn't inside the folder.
+    other_file_path = tmp_path / "Library 2.mkv"
+    other_file_path.touch()
+    parse_cache.put(ParseCache.create_key(str(other_file_path), SettingsSnapshot()), {"title": "Library 2"})
+
+    _scan(parse_cache, library)
+    for file_path in (library / "Season 1").iterdir():
+        file_path.unlink()
+    _, scan_report = _scan(parse_cache, library)
+
+    assert scan_report.removed_file_count == 3
+    assert len(parse_cache) == 1
+
+
+def test_cancelled_scan_removes_nothing(parse_cache: ParseCache, tmp_path: Path):
+    library = _make_library(tmp_path)
+    _scan(parse_cache, library)
+    for file_path in (library / "Season 1").iterdir():
+        file_path.unlink()
+
+    directory_scanner_worker = DirectoryScannerWorker(str(library), scan_index=DirectoryScanIndex(
+        str(library), SettingsSnapshot(), parse_cache))
+    directory_scanner_worker.cancel()
+    directory_scanner_worker.run()
+
+    assert len(parse_cache) == 3
@@ -5,7 +5,9 @@ from backend import settings_backend
 from backend.json_config import JSONConfig
 from backend.settings_backend import (retrieve_theme_from_settings, save_new_theme_to_settings,
                                       retrieve_excluded_folders, add_excluded_folder, remove_excluded_folder,
-                                      retrieve_filename_analysis_only_flag, set_filename_analysis_only_flag)
+                                      retrieve_filename_analysis_only_flag, set_filename_analysis_only_flag,
+                                      retrieve_settings_snapshot, SettingsSnapshot, set_ignore_patterns,
+                                      set_media_extensions, set_minimum_file_size, DEFAULT_MEDIA_EXTENSIONS)
 
 
 # pylint: disable=unused-argument, redefined-outer-name
@@ -25,6 +27,7 @@ def redirect_settings_file_path_to_temp_file(tmp_path, monkeypatch):
     test_settings_config.delete_and_recreate_file()
 
     monkeypatch.setattr(settings_backend, "_settings_json_config", test_settings_config)
+    monkeypatch.setattr(settings_backend, "_settings_snapshot", None)
 
     yield fake_path
 
@@ -76,3 +79,54 @@ def test_remove_excluded_folder_deletes_successfully(redirect_settings_file_path
     remove_excluded_folder(test_folder)
 
     assert len(retrieve_excluded_folders()) == 0
+
+
+def test_retrieve_settings_snapshot_default_values(redirect_settings_file_path_to_temp_file):
+    assert retrieve_settings_snapshot() == SettingsSnapshot(use_only_filename_for_analysis=False, excluded_folders=())
+
+
+def test_settings_snapshot_is_reused_while_settings_are_unchanged(redirect_settings_file_path_to_temp_file):
+    assert retrieve_settings_snapshot() is retrieve_settings_snapshot()
+
+
+def test_settings_snapshot_is_invalidated_by_saved_settings(redirect_settings_file_path_to_temp_file):
+    test_folder = "C:/Exclude This Folder/"
+    old_snapshot = retrieve_settings_snapshot()
+
+    set_filename_analysis_only_flag(True)
+    add_excluded_folder(test_folder)
+    new_snapshot = retrieve_settings_snapshot()
+
+    assert not old_snapshot.use_only_filename_for_analysis
+    assert new_snapshot.use_only_filename_for_analysis
+    assert new_snapshot.excluded_folders == (test_folder,)
+
+
+def test_settings_snapshot_is_invalidated_by_hand_edited_settings_file(redirect_settings_file_path_to_temp_file):
+    retrieve_settings_snapshot()
+
+    redirect_settings_file_path_to_temp_file.write_text('{"theme": "Dark", "excluded_folders": ["C:/Hand Edited/"]}',
+                                                         encoding="utf-8")
+
+    assert retrieve_settings_snapshot().excluded_folders == ("C:/Hand Edited/",)
+
+
+def test_prefilter_settings_default_to_media_files_only(redirect_settings_file_path_to_temp_file):
+    settings = retrieve_settings_snapshot()
+
+    assert settings.media_extensions == DEFAULT_MEDIA_EXTENSIONS
+    assert "*sample*" in settings.ignore_patterns
+    assert settings.minimum_file_size == 0
+
+
+def test_settings_snapshot_is_invalidated_by_saved_prefilter_settings(redirect_settings_file_path_to_temp_file):
+    retrieve_settings_snapshot()
+
+    set_media_extensions(["mkv"])
+    set_ignore_patterns(["Trailers/"])
+    set_minimum_file_size(50_000_000)
+    new_snapshot = retrieve_settings_snapshot()
+
+    assert new_snapshot.media_extensions == ("mkv",)
+    assert new_snapshot.ignore_patterns == ("Trailers/",)
+    assert new_snapshot.minimum_file_size == 50_000_000
@@ -0,0 +1,18 @@
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from _pytest.tmpdir import TempPathFactory
+
+
+@pytest.fixture(autouse=True)
+def application_caches_in_a_temporary_folder(tmp_path_factory: TempPathFactory, monkeypatch: MonkeyPatch):
+    """
+    The application-wide parse and response caches are created in a folder of the test's own, instead of the user's
+    data folder, e.g., when a test creates a MediaRecord without a parse cache of its own. Not in tmp_path, which
+    tests drop as a folder.
+    """
+    cache_directory = str(tmp_path_factory.mktemp("application_caches"))
+    monkeypatch.setattr("backend.parse_cache.user_data_dir", lambda **_: cache_directory)
+    monkeypatch.setattr("backend.parse_cache._parse_cache", None)
+    monkeypatch.setattr("backend.response_cache.user_data_dir", lambda **_: cache_directory)
+    monkeypatch.setattr("backend.response_cache._response_cache", None)
+    monkeypatch.setattr("backend.response_cache._cached_session", None)
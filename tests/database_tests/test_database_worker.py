@@ -2,34 +2,67 @@ from PySide6.QtCore import QThreadPool
 from _pytest.monkeypatch import MonkeyPatch
 from pytestqt.qtbot import QtBot
 
+from backend.core_backend import MatchedFileNames
 from backend.database_worker import DatabaseWorker
-from databases.database import Database
+from backend.media_record import MediaRecord
+from databases.database import Database, DatabaseMatch
 
 
 # pylint: disable=missing-class-docstring
 class TestDB(Database):
-    def retrieve_media_titles_from_db(self) -> list[str | None]:
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
         pass
 
-    def retrieve_media_years_from_db(self) -> list[int | None]:
-        pass
 
+class MovieTestDB(Database):
+    """Looks up each movie by itself, like an online database. Cancels itself when it looks up 'Cancel'."""
+    looks_up_movies_one_at_a_time = True
 
-def test_finished_signal_emits_successfully(qtbot: QtBot, monkeypatch: MonkeyPatch):
-    monkeypatch.setattr("backend.database_worker.match_titles_using_db_and_format",
-                        lambda db: ["Iron Man (2008).mkv", "Doctor Strange (2016).mkv"])
+    def retrieve_matches_from_db(self) -> list[DatabaseMatch]:
+        self.raise_if_cancelled()
+        if self.media_records[0].title == "Cancel":
+            self.cancel()
 
-    database_worker = DatabaseWorker(TestDB([]))
-    with qtbot.waitSignal(database_worker.finished) as payload:
+        return [DatabaseMatch(title=media_record.title, year=media_record.year) for media_record in self.media_records]
+
+
+def test_chunks_and_progress_emit_in_order_successfully(qtbot: QtBot, monkeypatch: MonkeyPatch):
+    chunks = [MatchedFileNames(["Iron Man (2008).mkv"], [False]),
+              MatchedFileNames(["Doctor Strange (2016).mkv", "Thunderbolts ().mkv"], [False, True])]
+    monkeypatch.setattr("backend.database_worker.iterate_matched_file_names", lambda db: iter(chunks))
+
+    database_worker = DatabaseWorker(TestDB([MediaRecord("Iron Man (2008).mkv"), MediaRecord("Doctor Strange.mkv"),
+                                             MediaRecord("Thunderbolts.mkv")]))
+    emitted_chunks = []
+    emitted_progress = []
+    database_worker.chunk_ready.connect(emitted_chunks.append)
+    database_worker.progress.connect(lambda done, total: emitted_progress.append((done, total)))
+    with qtbot.waitSignal(database_worker.finished):
         QThreadPool.globalInstance().start(database_worker)
 
-    assert payload.args == [["Iron Man (2008).mkv", "Doctor Strange (2016).mkv"]]
+    assert emitted_chunks == chunks
+    assert emitted_progress == [(0, 3), (1, 3), (3, 3)]
+
+
+def test_cancel_stops_before_the_next_movie(qtbot: QtBot):
+    database_worker = DatabaseWorker(MovieTestDB([MediaRecord("Iron Man (2008).mkv"), MediaRecord("Cancel.mkv"),
+                                                  MediaRecord("Thunderbolts.mkv")]))
+    emitted_chunks = []
+    database_worker.chunk_ready.connect(emitted_chunks.append)
+
+    # Cancelling still emits finished, but no chunk after the cancel.
+    with qtbot.assertNotEmitted(database_worker.error):
+        with qtbot.waitSignal(database_worker.finished):
+            QThreadPool.globalInstance().start(database_worker)
+
+    assert database_worker.is_cancelled()
+    assert [chunk.file_names for chunk in emitted_chunks] == [["Iron Man (2008).mkv"]]
 
 
 def test_error_signal_emits_on_exception(qtbot: QtBot, monkeypatch: MonkeyPatch):
     def _boom(_):
         raise RuntimeError("")
-    monkeypatch.setattr("backend.database_worker.match_titles_using_db_and_format",
+    monkeypatch.setattr("backend.database_worker.iterate_matched_file_names",
                         _boom)
     database_worker = DatabaseWorker(TestDB([]))
 
@@ -1,6 +1,8 @@
+import time
 from unittest.mock import patch
 
 from backend.media_record import MediaRecord
+from databases.database import DatabaseMatch
 from databases.omdb_python_db import OMDBPythonDB
 
 
@@ -8,10 +10,11 @@ from databases.omdb_python_db import OMDBPythonDB
 @patch("databases.omdb_python_db.OMDBClient")
 def test_movie_title_happy_path(mock_client_cls, _fake_key):
     mock_client = mock_client_cls.return_value
-    mock_client.get.side_effect = [
-        {"title": "Iron Man"},
-        {"title": "Thunderbolts*"},
-    ]
+    # Movies are looked up concurrently, so the results are keyed by title instead of call order.
+    mock_client.get.side_effect = lambda title, year: {
+        "Iron Man": {"title": "Iron Man"},
+        "Thunderbolts": {"title": "Thunderbolts*"},
+    }[title]
 
     database = OMDBPythonDB([MediaRecord("Iron Man (2008).mkv"), MediaRecord("Thunderbolts* (2025).mkv")], False)
 
@@ -55,3 +58,47 @@ def test_series_year_lookup_successful(mock_client_cls, _fake_key):
     database = OMDBPythonDB([MediaRecord("The.West.Wing.S01E01.mkv")], True)
 
     assert database.retrieve_media_years_from_db() == [1999]
+
+
+@patch("databases.omdb_python_db.retrieve_omdb_key", return_value="DUMMY_KEY")
+@patch("databases.omdb_python_db.OMDBClient")
+def test_movie_without_a_year_is_looked_up_once(mock_client_cls, _fake_key):
+    mock_client = mock_client_cls.return_value
+    mock_client.get.return_value = {"imdb_id": "tt0371746", "title": "Iron Man", "year": "2008"}
+
+    database = OMDBPythonDB([MediaRecord("Iron Man.mkv")], False)
+
+    assert database.retrieve_matches_from_db() == [DatabaseMatch(provider_id="tt0371746", title="Iron Man",
+                                                                 year=2008)]
+    assert mock_client.get.call_count == 1
+
+
+@patch("databases.omdb_python_db.retrieve_omdb_key", return_value="DUMMY_KEY")
+@patch("databases.omdb_python_db.OMDBClient")
+def test_series_with_a_year_only_looks_up_its_seasons(mock_client_cls, _fake_key):
+    mock_client = mock_client_cls.return_value
+    mock_client.get.return_value = {"episodes": [{"episode": 1, "title": "Pilot"}]}
+
+    database = OMDBPythonDB([MediaRecord("The.West.Wing.1999.S01E01.mkv")], True)
+
+    assert database.retrieve_matches_from_db() == [DatabaseMatch(year=1999, episode_title="Pilot")]
+    mock_client.get.assert_called_once_with(title="The West Wing", year=1999, season=1)
+
+
+@patch("databases.omdb_python_db.retrieve_omdb_key", return_value="DUMMY_KEY")
+@patch("databases.omdb_python_db.OMDBClient")
+def test_absolute_order_seasons_are_merged_in_order(mock_client_cls, _fake_key):
+    def _get(title, season=None, **_):
+        if season is None:
+            return {"title": title, "year": "2009–2010", "total_seasons": "2"}
+
+        # The second season is fetched faster, so it's done first.
+        time.sleep(0.03 * (3 - season))
+        return {"episodes": [{"episode": 1, "title": f"{season}x01"}, {"episode": 2, "title": f"{season}x02"}]}
+    mock_client_cls.return_value.get.side_effect = _get
+
+    media_records = [MediaRecord("Fullmetal.Alchemist.Brotherhood.E03.mkv")]
+    media_records[0].is_absolute_order = True
+    database = OMDBPythonDB(media_records, True)
+
+    assert database.retrieve_matches_from_db()[0].episode_title == "2x01"
@@ -1,7 +1,19 @@
-from unittest.mock import patch
+import io
+import json
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
 
 from backend.media_record import MediaRecord
-from databases.themoviedb_python_db import TheMovieDBPythonDB
+from backend.response_cache import ResponseCache, CachingHTTPAdapter
+from databases.database import MatchCancelled, DatabaseMatch
+from databases.themoviedb_python_db import TheMovieDBPythonDB, _create_episode_lookup
 
 
 def _simple_hit(title, date):
@@ -16,11 +28,12 @@ def _fake_season_payload(title, episode_number):
 @patch("tmdbsimple.Search")
 def test_movie_title_happy_path(mock_search_cls, _fake_key):
     # Mock Search.movie() → { "results": [...] }.
+    # Movies are looked up concurrently, so the results are keyed by query instead of call order.
     mock_search = mock_search_cls.return_value
-    mock_search.movie.side_effect = [
-        {"results": [_simple_hit("Oppenheimer", "2023-07-21")]},
-        {"results": [_simple_hit("Interstellar", "2014-10-26")]},
-    ]
+    mock_search.movie.side_effect = lambda query: {
+        "Oppenheimer": {"results": [_simple_hit("Oppenheimer", "2023-07-21")]},
+        "Interstellar": {"results": [_simple_hit("Interstellar", "2014-10-26")]},
+    }[query]
 
     recs = [MediaRecord("Oppenheimer.2023.mkv"), MediaRecord("Interstellar.mkv")]
     db = TheMovieDBPythonDB(recs, is_tv_series=False)
@@ -29,19 +42,129 @@ def test_movie_title_happy_path(mock_search_cls, _fake_key):
 
 
 @patch("databases.themoviedb_python_db.retrieve_the_movie_db_key", return_value="DUMMY_KEY")
-@patch("tmdbsimple.TV_Seasons")
+@patch("tmdbsimple.TV")
 @patch("tmdbsimple.Search")
-def test_tv_episode_lookup_successful(mock_search_cls, mock_tv_episodes_cls, _fake_key):
+def test_tv_episode_lookup_successful(mock_search_cls, mock_tv_cls, _fake_key):
     # Mock Search.tv() to give a single series hit.
     mock_search = mock_search_cls.return_value
     mock_search.tv.return_value = {
         "results": [{"id": 42, "first_air_date": "2010-04-17"}]
     }
 
-    # Mock TV_Episodes(...).info() → {"name": ...}
-    mock_tv_episodes_cls.return_value.info.return_value = _fake_season_payload("Winter Is Coming", 1)
+    # Mock TV(...).info() → {"season/1": {"episodes": [...]}}
+    mock_tv_cls.return_value.info.return_value = {"season/1": _fake_season_payload("Winter Is Coming", 1)}
 
     rec = MediaRecord("Game.of.Thrones.2011.S01E01.mkv")
     db = TheMovieDBPythonDB([rec], is_tv_series=True)
 
     assert db.retrieve_media_titles_from_db() == ["Winter Is Coming"]
+
+
+@patch("databases.themoviedb_python_db.retrieve_the_movie_db_key", return_value="DUMMY_KEY")
+@patch("tmdbsimple.TV")
+@patch("tmdbsimple.TV_Seasons")
+@patch("tmdbsimple.Search")
+def test_cancelled_match_makes_no_more_requests(mock_search_cls, mock_tv_seasons_cls, mock_tv_cls, _fake_key):
+    db = TheMovieDBPythonDB([MediaRecord("Game.of.Thrones.S01E01.mkv"), MediaRecord("Game.of.Thrones.S02E01.mkv")],
+                            is_tv_series=True)
+
+    # Cancelled while the series is being searched for, before its seasons are looked up.
+    def _search_tv_then_cancel(**_):
+        db.cancel()
+        return {"results": [{"id": 42, "first_air_date": "2011-04-17"}]}
+    mock_search_cls.return_value.tv.side_effect = _search_tv_then_cancel
+
+    with pytest.raises(MatchCancelled):
+        db.retrieve_media_titles_from_db()
+
+    mock_tv_cls.assert_not_called()
+    mock_tv_seasons_cls.assert_not_called()
+
+
+@patch("databases.themoviedb_python_db.retrieve_the_movie_db_key", return_value="DUMMY_KEY")
+def test_rematching_a_series_makes_no_network_calls(_fake_key, tmp_path: Path, monkeypatch: MonkeyPatch):
+    payloads = {"/3/search/tv": {"results": [{"id": 1399, "first_air_date": "2011-04-17"}]},
+                "/3/tv/1399": {"season/1": _fake_season_payload("Winter Is Coming", 1)}}
+    sent_urls = []
+
+    def _send(adapter: HTTPAdapter, request: requests.PreparedRequest, *_args, **_kwargs) -> requests.Response:
+        sent_urls.append(request.url)
+        body = json.dumps(payloads[request.path_url.split("?")[0]]).encode()
+        return adapter.build_response(request, HTTPResponse(body=io.BytesIO(body), status=200,
+                                                            headers={"Content-Type": "application/json"},
+                                                            preload_content=False))
+    monkeypatch.setattr(HTTPAdapter, "send", _send)
+
+    response_cache = ResponseCache(tmp_path / "response_cache.sqlite3")
+    session = requests.Session()
+    session.mount("https://", CachingHTTPAdapter(response_cache))
+    monkeypatch.setattr("databases.themoviedb_python_db.retrieve_cached_session", lambda: session)
+    monkeypatch.setattr("tmdbsimple.API_KEY", None)
+
+    for _ in range(2):
+        db = TheMovieDBPythonDB([MediaRecord("Game.of.Thrones.S01E01.mkv")], is_tv_series=True)
+        assert db.retrieve_matches_from_db() == [DatabaseMatch(provider_id=1399, year=2011,
+                                                               episode_title="Winter Is Coming")]
+
+    # The first match searches once and gets one season. The second one is all cached.
+    assert len(sent_urls) == 2
+    assert response_cache.hits == 2
+
+
+@patch("databases.themoviedb_python_db.retrieve_the_movie_db_key", return_value="DUMMY_KEY")
+@patch("tmdbsimple.Search")
+def test_movie_without_a_year_is_searched_once(mock_search_cls, _fake_key):
+    mock_search = mock_search_cls.return_value
+    mock_search.movie.return_value = {"results": [{"id": 157336, "title": "Interstellar",
+                                                   "release_date": "2014-10-26"}]}
+
+    db = TheMovieDBPythonDB([MediaRecord("Interstellar.mkv")], is_tv_series=False)
+
+    # The title and the year come from the same search.
+    assert db.retrieve_matches_from_db() == [DatabaseMatch(provider_id=157336, title="Interstellar", year=2014)]
+    assert mock_search.movie.call_count == 1
+
+
+@patch("tmdbsimple.TV")
+@patch("tmdbsimple.TV_Seasons")
+def test_every_season_is_loaded_twenty_at_a_time(mock_tv_seasons_cls, mock_tv_cls):
+    def _info(append_to_response: str) -> dict:
+        season_numbers = [int(season.split("/")[1]) for season in append_to_response.split(",")]
+        return {"number_of_seasons": 45} | {f"season/{season_number}": _fake_season_payload(f"{season_number}x01", 1)
+                                            for season_number in season_numbers if season_number <= 45}
+    mock_tv_cls.return_value.info.side_effect = _info
+
+    episode_lookup = _create_episode_lookup(1, set(), is_absolute_order=True, max_workers=2)
+
+    # ceil(45 / 20) requests, with the series' info and up to 20 seasons each.
+    assert sorted(len(call.kwargs["append_to_response"].split(","))
+                  for call in mock_tv_cls.return_value.info.call_args_list) == [5, 20, 20]
+    mock_tv_seasons_cls.assert_not_called()
+    assert list(episode_lookup.values()) == [f"{season_number}x01" for season_number in range(1, 46)]
+    assert list(episode_lookup) == [(1, episode_number) for episode_number in range(1, 46)]
+
+
+@patch("tmdbsimple.TV")
+@patch("tmdbsimple.TV_Seasons")
+def test_seasons_missing_from_a_partial_response_are_fetched_concurrently_in_order(mock_tv_seasons_cls, mock_tv_cls):
+    # Only the first season is appended to the response.
+    mock_tv_cls.return_value.info.return_value = {"number_of_seasons": 4, "season/1": {
+        "episodes": [{"episode_number": 1, "name": "1x01"}, {"episode_number": 2, "name": "1x02"}]}}
+
+    def _create_season(_series_id, season_number):
+        # Later seasons are fetched faster, so they're done first.
+        season = MagicMock()
+        season.info.side_effect = lambda: time.sleep(0.03 * (5 - season_number)) or {
+            "episodes": [{"episode_number": 1, "name": f"{season_number}x01"},
+                         {"episode_number": 2, "name": f"{season_number}x02"}]}
+        return season
+    mock_tv_seasons_cls.side_effect = _create_season
+
+    start = time.perf_counter()
+    episode_lookup = _create_episode_lookup(1, set(), is_absolute_order=True, max_workers=3)
+
+    assert sorted(call.args[1] for call in mock_tv_seasons_cls.call_args_list) == [2, 3, 4]
+    assert episode_lookup == {(1, 1): "1x01", (1, 2): "1x02", (1, 3): "2x01", (1, 4): "2x02", (1, 5): "3x01",
+                              (1, 6): "3x02", (1, 7): "4x01", (1, 8): "4x02"}
+    # About as long as the slowest season, instead of all three one after another.
+    assert time.perf_counter() - start < 0.15
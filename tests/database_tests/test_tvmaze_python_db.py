@@ -1,9 +1,12 @@
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
+import requests
+
 from backend.media_record import MediaRecord
+from databases.database import DatabaseMatch
 from databases.tvmaze_python_db import get_premiere_year_of_listing, filter_listings_within_one_year_of_target, \
-    TVMazePythonDB
+    TVMazePythonDB, TVMazeClient
 
 
 def test_get_premiere_year_of_listing_successful():
@@ -31,10 +34,10 @@ def test_filter_listings_within_one_year_of_target_successful():
     assert len(filtered) <= len(listings)
 
 
-@patch("databases.tvmaze_python_db.Api")
-def test_retrieve_media_years_for_series_from_db_successful(mock_api_cls):
-    mock_api = mock_api_cls.return_value
-    mock_api.search.shows.return_value = [SimpleNamespace(premiered="1999-09-22")]
+@patch("databases.tvmaze_python_db.TVMazeClient")
+def test_retrieve_media_years_for_series_from_db_successful(mock_client_cls):
+    mock_client = mock_client_cls.return_value
+    mock_client.search_shows.return_value = [SimpleNamespace(id=42, premiered="1999-09-22")]
 
     db = TVMazePythonDB(
         [
@@ -47,13 +50,12 @@ def test_retrieve_media_years_for_series_from_db_successful(mock_api_cls):
     assert db.retrieve_media_years_from_db() == [1999, 1999]
 
 
-@patch("databases.tvmaze_python_db.Api")
-def test_retrieve_media_titles_from_db_successful(mock_api_cls):
-    mock_api = mock_api_cls.return_value
-    mock_api.search.shows.return_value = [SimpleNamespace(id=42, premiered="1999-09-22")]
+@patch("databases.tvmaze_python_db.TVMazeClient")
+def test_retrieve_media_titles_from_db_successful(mock_client_cls):
+    mock_client = mock_client_cls.return_value
+    mock_client.search_shows.return_value = [SimpleNamespace(id=42, premiered="1999-09-22")]
 
-    mock_api.show = MagicMock()
-    mock_api.show.episodes.return_value = [
+    mock_client.show_episodes.return_value = [
         SimpleNamespace(season=2, number=22, name="Two Cathedrals"),
         SimpleNamespace(season=4, number=23, name="Twenty Five"),
     ]
@@ -67,3 +69,46 @@ def test_retrieve_media_titles_from_db_successful(mock_api_cls):
     )
 
     assert db.retrieve_media_titles_from_db() == ["Two Cathedrals", "Twenty Five"]
+
+
+@patch("databases.tvmaze_python_db.TVMazeClient")
+def test_series_without_a_year_is_searched_once(mock_client_cls):
+    mock_client = mock_client_cls.return_value
+    mock_client.search_shows.return_value = [SimpleNamespace(id=42, name="The West Wing", premiered="1999-09-22")]
+    mock_client.show_episodes.return_value = [SimpleNamespace(season=2, number=22, name="Two Cathedrals")]
+
+    db = TVMazePythonDB([MediaRecord("The.West.Wing.S02E22.mkv")], True)
+
+    assert db.retrieve_matches_from_db() == [DatabaseMatch(provider_id=42, title="The West Wing", year=1999,
+                                                           episode_title="Two Cathedrals")]
+    assert mock_client.search_shows.call_count == 1
+
+
+
+def _create_session(status_code: int, json) -> MagicMock:
+    """A requests.Session that answers every request with status_code and a JSON body."""
+    session = MagicMock(spec=requests.Session)
+    session.get.return_value.status_code = status_code
+    session.get.return_value.json.return_value = json
+    return session
+
+
+def test_client_sends_requests_through_its_session():
+    session = _create_session(200, [{"score": 0.9, "show": {"id": 42, "name": "The West Wing",
+                                                            "premiered": "1999-09-22"}}])
+
+    listings = TVMazeClient(session).search_shows("The West Wing")
+
+    session.get.assert_called_once_with("http://api.tvmaze.com/search/shows", params={"q": "The West Wing"})
+    assert [(listing.id, listing.name, get_premiere_year_of_listing(listing)) for listing in listings] == \
+           [(42, "The West Wing", 1999)]
+
+
+def test_client_parses_episodes_and_missing_shows():
+    session = _create_session(200, [{"season": 2, "number": 22, "name": "Two Cathedrals"}])
+    episodes = TVMazeClient(session).show_episodes(42)
+
+    session.get.assert_called_once_with("http://api.tvmaze.com/shows/42/episodes", params=None)
+    assert [(episode.season, episode.number, episode.name) for episode in episodes] == [(2, 22, "Two Cathedrals")]
+    # Like python-tvmaze, a 4xx response means there's nothing to match.
+    assert len(TVMazeClient(_create_session(404, {"message": "Not Found"})).search_shows("Nothing")) == 0
@@ -1,11 +1,19 @@
+import os
 from pathlib import Path
+from types import SimpleNamespace
 
 from PySide6.QtCore import QMimeData, QUrl, QPoint
 from PySide6.QtGui import QDropEvent, Qt
+from _pytest.monkeypatch import MonkeyPatch
 from pytestqt.qtbot import QtBot
 
+from backend.directory_scanner import ScannedFile
+from backend.guessit_warm_up import GuessitWarmUp
 from backend.media_record import MediaRecord
-from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
+from backend.parse_cache import ParseCache
+from backend.scan_index import ScanReport
+from backend.settings_backend import SettingsSnapshot
+from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget, FolderScan
 
 
 def _make_folder_with_files_and_subfolders(tmp_path: Path):
@@ -32,10 +40,17 @@ def _make_folder_with_files_and_subfolders(tmp_path: Path):
     return file1.name, file2.name, file3.name, file4.name
 
 
-def test_drop_directory_adds_all_files_recursively(qtbot: QtBot, tmp_path: Path):
+def _touch(file_path: Path) -> str:
+    file_path.touch()
+    return str(file_path)
+
+
+def test_drop_directory_adds_all_files_recursively(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    # Use the default settings, where only media files are added from folders.
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.retrieve_settings_snapshot", SettingsSnapshot)
     drag_and_drop_widget = DragAndDropFilesWidget()
     qtbot.addWidget(drag_and_drop_widget)
-    files = _make_folder_with_files_and_subfolders(tmp_path)
+    _, *files = _make_folder_with_files_and_subfolders(tmp_path)
 
     # Tests the DragAndDropFilesWidget with folders and files in tmp_path.
     test_payload = QMimeData()
@@ -50,7 +65,9 @@ def test_drop_directory_adds_all_files_recursively(qtbot: QtBot, tmp_path: Path)
 
     drag_and_drop_widget.dropEvent(drop_event)
 
-    file_names_in_widget = sorted(drag_and_drop_widget.item(i).text() for i in range(drag_and_drop_widget.count()))
+    # Folders are scanned in the background, so wait until every file shows up in the widget.
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+    file_names_in_widget = sorted(drag_and_drop_widget.file_names())
     file_names_from_tmp_folder = sorted(file_name for file_name in files)
     assert file_names_in_widget == file_names_from_tmp_folder
 
@@ -76,7 +93,7 @@ def test_drag_and_drop_event_stores_file_name(qtbot: QtBot, tmp_path: Path):
     drag_and_drop_widget.dropEvent(drop_event)
 
     assert drag_and_drop_widget.count() == 1
-    assert drag_and_drop_widget.item(0).text() == "The.West.Wing.S01E01.mkv"
+    assert drag_and_drop_widget.file_names() == ["The.West.Wing.S01E01.mkv"]
 
 
 def test_add_file_to_list_stores_media_record(qtbot: QtBot, tmp_path: Path):
@@ -86,8 +103,301 @@ def test_add_file_to_list_stores_media_record(qtbot: QtBot, tmp_path: Path):
 
     drag_and_drop_widget.add_file_to_list(str(temp_file_path))
 
-    list_item = drag_and_drop_widget.item(0)
-    data = list_item.data(Qt.ItemDataRole.UserRole)
-    assert list_item.text() == "Andor.S02E09.mkv"
+    index = drag_and_drop_widget.model().index(0, 0)
+    data = index.data(Qt.ItemDataRole.UserRole)
+    assert index.data() == "Andor.S02E09.mkv"
     assert isinstance(data, MediaRecord)
     assert data.full_file_path == str(temp_file_path)
+
+
+def test_drop_large_directory_adds_all_files_in_parallel(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    # Treat every folder as a 'large' folder so the parallel ingestion path is used.
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.PARALLEL_INGESTION_THRESHOLD", 1)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    files = _make_folder_with_files_and_subfolders(tmp_path)
+
+    # Allow every file, so the .txt file is added too.
+    drag_and_drop_widget.add_path(str(tmp_path), SettingsSnapshot(media_extensions=(), ignore_patterns=()))
+
+    # Worker processes need time to start up, so wait until every file shows up in the widget.
+    qtbot.waitUntil(lambda: drag_and_drop_widget.count() == len(files), timeout=60000)
+    file_names_in_widget = sorted(drag_and_drop_widget.file_names())
+    assert file_names_in_widget == sorted(files)
+    assert all(isinstance(drag_and_drop_widget.model().index(i, 0).data(Qt.ItemDataRole.UserRole), MediaRecord)
+               for i in range(drag_and_drop_widget.count()))
+
+
+def test_media_record_collection_follows_list_items(qtbot: QtBot):
+    drag_and_drop_files_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_files_widget)
+    drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
+    drag_and_drop_files_widget.add_file_to_list("The.West.Wing.S01E01.mkv")
+
+    drag_and_drop_files_widget.remove_row(0)
+
+    assert [media_record.file_name for media_record in drag_and_drop_files_widget.media_records] == \
+           ["The.West.Wing.S01E01.mkv"]
+    assert drag_and_drop_files_widget.media_records.is_tv_series()
+
+    drag_and_drop_files_widget.clear()
+
+    assert len(drag_and_drop_files_widget.media_records) == 0
+
+
+def test_paths_added_during_warm_up_wait_for_it(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    guessit_warm_up = GuessitWarmUp()
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.retrieve_guessit_warm_up", lambda: guessit_warm_up)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    temp_file_path = tmp_path / "Andor.S02E09.mkv"
+    temp_file_path.touch()
+
+    # Pretend the warm-up is still running.
+    guessit_warm_up.is_started = True
+    drag_and_drop_widget.add_paths([str(temp_file_path)])
+
+    assert drag_and_drop_widget.count() == 0
+    assert drag_and_drop_widget.is_adding_paths()
+
+    guessit_warm_up.finish()
+
+    assert drag_and_drop_widget.count() == 1
+    assert not drag_and_drop_widget.is_adding_paths()
+    assert drag_and_drop_widget.file_names() == ["Andor.S02E09.mkv"]
+
+
+def test_clear_drops_paths_waiting_for_warm_up(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    guessit_warm_up = GuessitWarmUp()
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.retrieve_guessit_warm_up", lambda: guessit_warm_up)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    temp_file_path = tmp_path / "Andor.S02E09.mkv"
+    temp_file_path.touch()
+
+    # Pretend the warm-up is still running.
+    guessit_warm_up.is_started = True
+    drag_and_drop_widget.add_paths([str(temp_file_path)])
+    drag_and_drop_widget.clear()
+
+    assert not drag_and_drop_widget.is_adding_paths()
+
+    guessit_warm_up.finish()
+
+    # The cleared file doesn't show up again once the warm-up is done.
+    assert drag_and_drop_widget.count() == 0
+
+
+def test_clear_cancels_folder_scans(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    # Treat every folder as a 'large' folder so the files are parsed by a worker.
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.PARALLEL_INGESTION_THRESHOLD", 1)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    _make_folder_with_files_and_subfolders(tmp_path)
+
+    drag_and_drop_widget.add_path(str(tmp_path))
+    drag_and_drop_widget.clear()
+
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans, timeout=60000)
+    assert drag_and_drop_widget.count() == 0
+    assert len(drag_and_drop_widget.media_records) == 0
+
+
+def _claim_scanned_files(drag_and_drop_widget: DragAndDropFilesWidget, tmp_path: Path) -> FolderScan:
+    """A FolderScan of tmp_path whose files were found (So claimed in the FileIndex), but aren't rows yet."""
+    folder_scan = FolderScan(drag_and_drop_widget, str(tmp_path), SettingsSnapshot())
+    drag_and_drop_widget.folder_scans.append(folder_scan)
+    folder_scan.add_batch([ScannedFile(str(file_path)) for file_path in sorted(tmp_path.rglob("*.mkv"))])
+
+    assert drag_and_drop_widget.count() == 0
+    assert len(drag_and_drop_widget.file_index) == 3
+    return folder_scan
+
+
+def test_cancelled_drop_can_be_dropped_again(qtbot: QtBot, tmp_path: Path):
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    _make_folder_with_files_and_subfolders(tmp_path)
+    _claim_scanned_files(drag_and_drop_widget, tmp_path)
+
+    drag_and_drop_widget.cancel_adding_paths()
+
+    assert len(drag_and_drop_widget.file_index) == 0
+
+    drag_and_drop_widget.add_path(str(tmp_path), SettingsSnapshot())
+    qtbot.waitUntil(lambda: drag_and_drop_widget.count() == 3)
+    assert sorted(drag_and_drop_widget.file_names()) == ["Example Movie.mkv", "Iron Man (2008).mkv",
+                                                         "Thunderbolts (2025).mkv"]
+
+
+def test_files_of_a_failed_parallel_ingestion_are_released(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(DragAndDropFilesWidget, "show_parallel_ingestion_error", lambda _: None)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    _make_folder_with_files_and_subfolders(tmp_path)
+    folder_scan = _claim_scanned_files(drag_and_drop_widget, tmp_path)
+    # Pretend a worker was parsing every file, and added the first one before failing.
+    file_paths = sorted(folder_scan.claimed_file_paths)
+    folder_scan.pending_scanned_files = []
+    folder_scan.parallel_ingestion_worker = SimpleNamespace(file_paths=file_paths)
+    folder_scan.add_media_records([MediaRecord(file_paths[0], {"title": "Example Movie", "container": "mkv"})])
+
+    folder_scan.fail_parallel_ingestion()
+
+    assert drag_and_drop_widget.count() == 1
+    # Only the file that became a row is still in the FileIndex.
+    assert len(drag_and_drop_widget.file_index) == 1
+    assert file_paths[0] in drag_and_drop_widget.file_index
+
+
+def test_drop_directory_skips_files_rejected_by_prefilter(qtbot: QtBot, tmp_path: Path):
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    (tmp_path / "Iron Man (2008).mkv").touch()
+    (tmp_path / "Iron Man (2008).nfo").touch()
+    (tmp_path / "Iron Man (2008) Sample.mkv").touch()
+    (tmp_path / "Extras").mkdir()
+    (tmp_path / "Extras" / "Deleted Scenes.mkv").touch()
+
+    drag_and_drop_widget.add_path(str(tmp_path), SettingsSnapshot())
+
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+    assert drag_and_drop_widget.file_names() == \
+           ["Iron Man (2008).mkv"]
+
+
+def test_dropped_files_rejected_by_prefilter_are_skipped(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.retrieve_settings_snapshot", SettingsSnapshot)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    file_paths = [tmp_path / "Iron Man (2008).mkv", tmp_path / "Iron Man (2008).nfo",
+                  tmp_path / "Iron Man (2008).srt", tmp_path / "Iron Man (2008) Sample.mkv"]
+    for file_path in file_paths:
+        file_path.touch()
+
+    drag_and_drop_widget.add_paths([str(file_path) for file_path in file_paths])
+
+    assert drag_and_drop_widget.file_names() == \
+           ["Iron Man (2008).mkv"]
+
+
+def test_dropping_the_same_folder_again_reuses_the_scan_index(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.parse_cache._parse_cache", ParseCache(tmp_path / "parse_cache.sqlite3"))
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    library = tmp_path / "Library"
+    library.mkdir()
+    _make_folder_with_files_and_subfolders(library)
+    scan_reports = []
+    drag_and_drop_widget.scan_report_ready.connect(scan_reports.append)
+
+    drag_and_drop_widget.add_path(str(library), SettingsSnapshot())
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+    drag_and_drop_widget.clear()
+    drag_and_drop_widget.add_path(str(library), SettingsSnapshot())
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+
+    assert scan_reports == [ScanReport(reused_file_count=0, parsed_file_count=3, removed_file_count=0),
+                            ScanReport(reused_file_count=3, parsed_file_count=0, removed_file_count=0)]
+    assert drag_and_drop_widget.count() == 3
+
+
+def test_watched_folder_stays_in_sync(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("backend.folder_watcher.DEBOUNCE_MILLISECONDS", 100)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    (tmp_path / "Iron Man (2008).mkv").touch()
+
+    drag_and_drop_widget.watch_folder(str(tmp_path), SettingsSnapshot())
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+    assert drag_and_drop_widget.count() == 1
+
+    (tmp_path / "Thunderbolts (2025).mkv").touch()
+    qtbot.waitUntil(lambda: drag_and_drop_widget.count() == 2)
+    with qtbot.waitSignal(drag_and_drop_widget.watched_file_removed, timeout=5000):
+        (tmp_path / "Iron Man (2008).mkv").unlink()
+
+    assert drag_and_drop_widget.file_names() == \
+           ["Thunderbolts (2025).mkv"]
+    drag_and_drop_widget.stop_watching_folder()
+
+
+def test_watched_folder_is_only_scanned_once(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    # The watcher takes the tree from the folder's scan, instead of listing every folder again on the GUI thread.
+    monkeypatch.setattr("backend.folder_watcher.FolderWatcher._watch_tree", None)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    _make_folder_with_files_and_subfolders(tmp_path)
+
+    drag_and_drop_widget.watch_folder(str(tmp_path), SettingsSnapshot())
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+
+    assert drag_and_drop_widget.count() == 3
+    assert sorted(drag_and_drop_widget.folder_watcher.watched_directories()) == \
+           sorted([str(tmp_path), str(tmp_path / "empty"), str(tmp_path / "subfolder1"),
+                   str(tmp_path / "subfolder1" / "subfolder2")])
+    drag_and_drop_widget.stop_watching_folder()
+
+
+def test_overlapping_folders_and_hardlinks_are_only_added_once(qtbot: QtBot, tmp_path: Path):
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    _make_folder_with_files_and_subfolders(tmp_path)
+    os.link(tmp_path / "Example Movie.mkv", tmp_path / "subfolder1" / "Example Movie Link.mkv")
+    scan_reports = []
+    drag_and_drop_widget.scan_report_ready.connect(scan_reports.append)
+
+    drag_and_drop_widget.add_paths([str(tmp_path), str(tmp_path / "subfolder1"),
+                                    str(tmp_path / "subfolder1" / "Iron Man (2008).mkv")])
+    qtbot.waitUntil(lambda: not drag_and_drop_widget.folder_scans)
+
+    file_names_in_widget = sorted(drag_and_drop_widget.file_names())
+    assert file_names_in_widget == ["Example Movie.mkv", "Iron Man (2008).mkv", "Thunderbolts (2025).mkv"]
+    # The file itself is added first, then the folder scans skip it (Twice), the hardlink (Twice), and Thunderbolts.
+    assert sum(scan_report.duplicate_file_count for scan_report in scan_reports) == 5
+
+
+def test_big_drop_is_added_a_time_slice_at_a_time(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    # No time budget, so only one path is added per event loop turn.
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.PATH_QUEUE_TIME_BUDGET_SECONDS", 0)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    file_paths = [_touch(tmp_path / f"Show.S01E0{i}.mkv") for i in range(1, 4)]
+    progress = []
+    drag_and_drop_widget.path_queue_progress.connect(lambda added, total: progress.append((added, total)))
+
+    with qtbot.waitSignal(drag_and_drop_widget.path_queue_finished):
+        drag_and_drop_widget.add_paths(file_paths)
+        # The first path is added right away, and the rest once the event loop gets to run.
+        assert drag_and_drop_widget.count() == 1
+
+    assert drag_and_drop_widget.file_names() == \
+           ["Show.S01E01.mkv", "Show.S01E02.mkv", "Show.S01E03.mkv"]
+    assert progress == [(1, 3), (2, 3)]
+
+
+def test_cancelled_drop_keeps_the_files_already_added(qtbot: QtBot, tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr("pages.core.drag_and_drop_files_widget.PATH_QUEUE_TIME_BUDGET_SECONDS", 0)
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+
+    drag_and_drop_widget.add_paths([_touch(tmp_path / f"Show.S01E0{i}.mkv") for i in range(1, 4)])
+    with qtbot.waitSignal(drag_and_drop_widget.path_queue_finished, timeout=1000):
+        drag_and_drop_widget.cancel_adding_paths()
+    qtbot.wait(50)
+
+    assert drag_and_drop_widget.count() == 1
+    assert drag_and_drop_widget.file_names() == ["Show.S01E01.mkv"]
+
+
+def test_media_records_are_inserted_in_one_batch(qtbot: QtBot):
+    drag_and_drop_widget = DragAndDropFilesWidget()
+    qtbot.addWidget(drag_and_drop_widget)
+    inserted_rows = []
+    drag_and_drop_widget.model().rowsInserted.connect(lambda _, first, last: inserted_rows.append((first, last)))
+
+    drag_and_drop_widget.add_media_records_to_list([MediaRecord(f"Show.S01E0{i}.mkv", {"title": "Show"})
+                                                    for i in range(1, 4)])
+
+    assert inserted_rows == [(0, 2)]
+    assert drag_and_drop_widget.file_names() == ["Show.S01E01.mkv", "Show.S01E02.mkv", "Show.S01E03.mkv"]
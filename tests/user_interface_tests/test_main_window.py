@@ -0,0 +1,30 @@
+from pytestqt.qtbot import QtBot
+
+from main import MainWindow, FORMATS_PAGE_ROW, SETTINGS_PAGE_ROW
+from pages.core.main_page import MainPage
+from pages.formats import FormatsPage
+from pages.settings import SettingsPage
+
+
+def test_pages_are_built_when_first_selected(qtbot: QtBot):
+    main_window = MainWindow()
+    qtbot.addWidget(main_window)
+
+    assert isinstance(main_window.pages.currentWidget(), MainPage)
+    assert not main_window.findChildren(FormatsPage)
+    assert not main_window.findChildren(SettingsPage)
+
+    main_window.menu.setCurrentRow(SETTINGS_PAGE_ROW)
+    settings_page = main_window.pages.currentWidget()
+    assert isinstance(settings_page, SettingsPage)
+    assert main_window.pages.indexOf(settings_page) == SETTINGS_PAGE_ROW
+    assert not main_window.findChildren(FormatsPage)
+
+    main_window.menu.setCurrentRow(FORMATS_PAGE_ROW)
+    assert isinstance(main_window.pages.currentWidget(), FormatsPage)
+
+    # Selecting a page again shows the same page instead of building another one.
+    main_window.menu.setCurrentRow(SETTINGS_PAGE_ROW)
+    assert main_window.pages.currentWidget() is settings_page
+    assert main_window.pages.count() == 3
+    assert [type(main_window.pages.widget(row)) for row in range(3)] == [MainPage, FormatsPage, SettingsPage]
@@ -1,10 +1,13 @@
-from PySide6.QtWidgets import QListWidget, QLabel, QPushButton, QDialog
+from PySide6.QtWidgets import QLabel, QPushButton, QDialog
 from _pytest.monkeypatch import MonkeyPatch
 from pytestqt.qtbot import QtBot
 
 from backend.api_key_config import api_key_config
+from backend.core_backend import match_titles_using_db_and_format
+from databases.file_name_match_db import FileNameMatchDB
 from pages.core.drag_and_drop_files_widget import DragAndDropFilesWidget
 from pages.core.match_options_widget import MatchOptionsWidget, check_if_api_key_exists_otherwise_prompt_user
+from pages.core.output_files_widget import OutputFilesWidget
 
 
 # pylint: disable=unused-argument
@@ -13,7 +16,7 @@ def test_mixed_media_input_displays_error(qtbot: QtBot):
     drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
     drag_and_drop_files_widget.add_file_to_list("The.West.Wing.S01E01.mkv")
 
-    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, QListWidget())
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, OutputFilesWidget())
     messages = match_options_widget.findChildren(QLabel)
 
     assert any("Cannot rename both movies and tv series at the same time!" in message.text()
@@ -25,7 +28,7 @@ def test_multiple_series_input_displays_error(qtbot: QtBot):
     drag_and_drop_files_widget.add_file_to_list("Andor.S01E02.mkv")
     drag_and_drop_files_widget.add_file_to_list("The.West.Wing.S01E01.mkv")
 
-    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, QListWidget())
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, OutputFilesWidget())
     messages = match_options_widget.findChildren(QLabel)
 
     assert any("Cannot rename multiple tv series at the same time!" in message.text()
@@ -36,7 +39,7 @@ def test_movie_input_shows_correct_database_buttons(qtbot: QtBot):
     drag_and_drop_files_widget = DragAndDropFilesWidget()
     drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
 
-    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, QListWidget())
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, OutputFilesWidget())
     buttons_text = [button.text().strip() for button in match_options_widget.findChildren(QPushButton)]
 
     assert "TheMovieDB" in buttons_text
@@ -49,7 +52,7 @@ def test_series_input_shows_correct_database_buttons(qtbot: QtBot):
     drag_and_drop_files_widget = DragAndDropFilesWidget()
     drag_and_drop_files_widget.add_file_to_list("The.West.Wing.S01E01.mkv")
 
-    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, QListWidget())
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, OutputFilesWidget())
     buttons_text = [button.text().strip() for button in match_options_widget.findChildren(QPushButton)]
 
     assert "TheMovieDB" in buttons_text
@@ -84,3 +87,65 @@ def test_api_key_check_with_existing_api_key_returns_true(qtbot: QtBot, monkeypa
     monkeypatch.setattr(api_key_config, "get", lambda key: "Sample_key")
 
     assert check_if_api_key_exists_otherwise_prompt_user("tvmaze")
+
+
+def test_matched_file_names_fill_the_output_box(qtbot: QtBot):
+    drag_and_drop_files_widget = DragAndDropFilesWidget()
+    drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
+    drag_and_drop_files_widget.add_file_to_list("Thunderbolts.mkv")
+    output_files_widget = OutputFilesWidget()
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, output_files_widget)
+
+    match_options_widget.populate_output_box(
+        match_titles_using_db_and_format(FileNameMatchDB(drag_and_drop_files_widget.media_records)))
+
+    assert output_files_widget.file_names() == ["Iron Man (2008).mkv", "Thunderbolts ().mkv"]
+    assert output_files_widget.model().has_missing_fields == [False, True]
+
+
+def test_match_streams_into_the_output_box_and_accepts(qtbot: QtBot):
+    drag_and_drop_files_widget = DragAndDropFilesWidget()
+    drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
+    drag_and_drop_files_widget.add_file_to_list("Thunderbolts.mkv")
+    output_files_widget = OutputFilesWidget()
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, output_files_widget)
+    qtbot.addWidget(match_options_widget)
+
+    with qtbot.waitSignal(match_options_widget.accepted):
+        match_options_widget.start_match(FileNameMatchDB(drag_and_drop_files_widget.media_records))
+        assert match_options_widget.match_progress_bar.isVisibleTo(match_options_widget)
+        assert not match_options_widget.match_options_container.isEnabled()
+
+    assert output_files_widget.file_names() == ["Iron Man (2008).mkv", "Thunderbolts ().mkv"]
+    assert match_options_widget.match_options_container.isEnabled()
+    assert not match_options_widget.match_progress_bar.isVisibleTo(match_options_widget)
+
+
+def test_cancelled_match_clears_the_output_box_and_rejects(qtbot: QtBot):
+    drag_and_drop_files_widget = DragAndDropFilesWidget()
+    drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
+    output_files_widget = OutputFilesWidget()
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, output_files_widget)
+    qtbot.addWidget(match_options_widget)
+    database = FileNameMatchDB(drag_and_drop_files_widget.media_records)
+    # Cancelled before the worker thread starts matching, like clicking cancel during the first request.
+    database.cancel()
+
+    with qtbot.assertNotEmitted(match_options_widget.accepted):
+        with qtbot.waitSignal(match_options_widget.rejected):
+            match_options_widget.start_match(database)
+
+    assert output_files_widget.count() == 0
+    assert match_options_widget.match_options_container.isEnabled()
+
+
+def test_files_added_after_opening_are_not_matched(qtbot: QtBot):
+    drag_and_drop_files_widget = DragAndDropFilesWidget()
+    drag_and_drop_files_widget.add_file_to_list("Iron Man (2008).mkv")
+    match_options_widget = MatchOptionsWidget(drag_and_drop_files_widget, OutputFilesWidget())
+
+    # E.g., a file that showed up in a watched folder while the dialog is open.
+    drag_and_drop_files_widget.add_file_to_list("Thunderbolts (2025).mkv")
+
+    assert [media_record.file_name for media_record in match_options_widget.media_records] == \
+           ["Iron Man (2008).mkv"]
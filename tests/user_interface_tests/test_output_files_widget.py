@@ -0,0 +1,36 @@
+from PySide6.QtCore import Qt
+from pytestqt.qtbot import QtBot
+
+from pages.core.core_renamer_widget import CoreRenamerWidget
+from pages.core.file_list_models import MISSING_FIELDS_COLOR
+from pages.core.output_files_widget import OutputFilesWidget
+
+
+def test_names_missing_fields_are_highlighted(qtbot: QtBot):
+    output_files_widget = OutputFilesWidget()
+    qtbot.addWidget(output_files_widget)
+
+    output_files_widget.add_file_names(["Iron Man (2008).mkv", "Thunderbolts ().mkv"], [False, True])
+    output_files_widget.set_file_name(1, "Thunderbolts (2025).mkv")
+
+    model = output_files_widget.model()
+    assert output_files_widget.file_names() == ["Iron Man (2008).mkv", "Thunderbolts (2025).mkv"]
+    assert model.index(0, 0).data(Qt.ItemDataRole.BackgroundRole) is None
+    assert model.index(1, 0).data(Qt.ItemDataRole.BackgroundRole) == MISSING_FIELDS_COLOR
+
+
+def test_input_and_output_rows_are_selected_together(qtbot: QtBot):
+    core_renamer_widget = CoreRenamerWidget()
+    qtbot.addWidget(core_renamer_widget)
+    core_renamer_widget.left_box.add_file_to_list("Iron Man (2008).mkv")
+    core_renamer_widget.left_box.add_file_to_list("Thunderbolts (2025).mkv")
+    core_renamer_widget.right_box.add_file_names(["Iron Man (2008).mkv", "Thunderbolts (2025).mkv"])
+
+    core_renamer_widget.left_box.setCurrentRow(1)
+    assert core_renamer_widget.right_box.currentRow() == 1
+
+    core_renamer_widget.right_box.setCurrentRow(0)
+    assert core_renamer_widget.left_box.currentRow() == 0
+
+    core_renamer_widget.remove_output_row(1)
+    assert core_renamer_widget.right_box.file_names() == ["Iron Man (2008).mkv"]